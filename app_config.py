@@ -22,4 +22,77 @@ class Config:
     COLOR_PORTAL_INACTIVE = "lightgray"
     COLOR_PORTAL_LINE = (255, 100, 0) # 파란색 계열
     
-    FONT_INFO = ("Arial", 14, "bold")
\ No newline at end of file
+    FONT_INFO = ("Arial", 14, "bold")
+
+    # Rendering
+    FRAME_INTERVAL_MS = 16 # 이벤트 병합 간격 (약 60fps 상한)
+    TILE_CACHE_MB = 256    # 줌 피라미드 타일 캐시 메모리 상한
+
+    # Large images
+    IMAGE_MMAP_ENABLED = True
+    IMAGE_MMAP_MIN_PIXELS = 4096 * 4096 # 이보다 큰 이미지는 메모리 맵 사이드카로 엽니다
+    IMAGE_CACHE_DIR = None              # None이면 시스템 임시 폴더 아래 map_editor_cache
+    DETECT_BAND_ROWS = 2048             # 전체 감지 시 한 번에 처리할 행 수
+    DETECT_MAX_HEIGHT = 8               # 이 높이 이상인 윤곽은 발판이 아닌 벽/블록으로 봅니다
+    PREVIEW_DEBOUNCE_MS = 250           # 슬라이더가 멈춘 뒤 미리보기 감지를 시작할 때까지 대기
+    PREVIEW_POLL_MS = 30                # 백그라운드 감지 결과 확인 간격
+    MERGE_Y_TOL = 3                     # 감지 결과 병합: 이 높이 차 이내면 같은 발판 후보
+    MERGE_X_TOL = 4                     # 양 끝점 차가 이 이내면 중복으로 보고 건너뜀
+
+    # Routing
+    EXPORT_ROUTES = True     # 저장 시 맵 JSON 옆에 경로 표(.routes.json)도 저장 (백그라운드에서 계산)
+    ROUTE_EXPORT_MAX_PLATFORMS = 1500  # 발판이 이보다 많으면 n x n 표 대신 묶음별 형식 (이보다 큰 묶음은 경로 그래프만)
+    EXPORT_BINARY = True     # 저장 시 맵 JSON 옆에 바이너리 사본(.mapb)도 저장
+    ROUTE_PORTAL_COST = 1.0  # 포탈 이동 비용 (점프 간선은 발판 중심 간 거리)
+    ROUTE_SNAP_DROP = 60     # 포탈 입/출구에서 아래로 발판을 찾는 최대 거리
+
+    # Undo
+    UNDO_LIMIT = 500          # 되돌리기 최대 단계 수
+    UNDO_MAX_ROWS = 200000    # 기록에 보관할 최대 행 수 (넘으면 오래된 단계부터 버림)
+    UNDO_COALESCE_MS = 1000   # 같은 항목을 이 간격 안에 연속 미세조정하면 한 단계로 합침
+    UNDO_REDRAW_ALL = 32      # 되돌린 항목이 이보다 많으면 부분 갱신 대신 전체 다시 그리기
+
+    # Autosave
+    AUTOSAVE_ENABLED = True       # 편집 저널 자동 저장 + 시작 시 복구
+    AUTOSAVE_DIR = None           # None이면 시스템 임시 폴더 아래 map_editor_autosave
+    AUTOSAVE_COMPACT_OPS = 2000   # 저널이 이 동작 수만큼 쌓이면 전체 스냅샷으로 압축
+    AUTOSAVE_FSYNC = False        # 줄마다 디스크 동기화 (느리지만 전원 차단에도 안전)
+
+    # Live localization
+    LOCATE_MARKER_HSV_LO = (20, 120, 180)   # 미니맵 캐릭터 표시(노란 점) HSV 하한
+    LOCATE_MARKER_HSV_HI = (35, 255, 255)   # HSV 상한
+    LOCATE_MARKER_AREA = (2, 80)            # 표시로 인정할 픽셀 수 범위
+    LOCATE_SEARCH_RADIUS = 16               # 직전 위치 주변 이 반경만 먼저 검사 (못 찾으면 ROI 전체)
+    LOCATE_VERIFY_EVERY = 30                # 이 프레임마다 위상 상관으로 ROI 어긋남 확인
+    LOCATE_MIN_SCORE = 0.5                  # 기준 맵 정합 최소 점수 (미만이면 정합 실패)
+
+    # Stitching
+    STITCH_NEIGHBORS = 2       # 처음에는 캡처 순서에서 앞뒤 이 개수까지 정합 (전체 쌍은 --all-pairs)
+    STITCH_SEARCH_ROUNDS = 6   # 그 뒤 배치로 겹칠 쌍을 더 찾는 최대 횟수 (새 쌍이 없으면 일찍 끝냄)
+    STITCH_BRIDGE_PAIRS = 2    # 떨어진 묶음의 캡처마다 축소본 상관이 높은 다른 묶음 캡처 이만큼 정합
+    STITCH_THUMB_SIZE = 64     # 묶음 잇기 후보를 고를 축소본의 긴 변 (모든 캡처를 같은 배율로 줄임)
+    STITCH_MIN_SCORE = 0.6     # 겹친 영역 정규화 상관이 이 이상이어야 정합으로 인정
+    STITCH_MIN_OVERLAP = 0.2   # 겹친 면적이 작은 쪽 캡처의 이 비율 이상이어야 함 (작으면 우연히 맞는 위치가 생김)
+    STITCH_MIN_MARGIN = 0.1    # 가장 높은 상관 봉우리가 다음 봉우리보다 이만큼 높지 않으면 ORB로 같은 위치인지 확인
+    STITCH_FEATHER = 24        # 가장자리에서 이 픽셀 폭에 걸쳐 서서히 섞음
+    STITCH_COARSE_SIZE = 256   # 두 캡처 중 긴 변이 이보다 크면 축소본에서 먼저 정합
+    STITCH_DEDUP_TOL = 4       # 조각 맵을 합칠 때 이 거리 이내 포탈/스폰은 같은 것으로 봄
+
+    # Color detection
+    # 종류별 HSV 범위 (H 0~180, S/V 0~255, H 하한 > 상한이면 빨강처럼 0을 넘어 감싸는 범위)
+    COLOR_CLASSES = {
+        "portals": ((35, 200, 150), (50, 255, 255)),   # 초록 고리 포탈 표시
+        "spawns": ((135, 100, 200), (155, 255, 255)),  # 자홍 마름모 아이콘
+        "ropes": ((95, 160, 80), (102, 255, 160)),     # 청록 세로선 (밧줄/사다리)
+    }
+    COLOR_ICON_AREA = (6, 400)      # 포탈/스폰 아이콘으로 인정할 덩어리 픽셀 수 범위
+    COLOR_ICON_MAX_SIZE = 24        # 아이콘 덩어리의 최대 가로/세로 길이
+    ROPE_MIN_LEN = 8                # 밧줄로 인정할 최소 세로 길이
+    ROPE_MAX_WIDTH = 3              # 밧줄 최대 두께
+    COLOR_DEDUP_TOL = 6             # 이미 있는 포탈/스폰/밧줄과 이 거리 이내면 추가하지 않음
+
+    # Frame profiling
+    PROFILE_HUD = True             # HUD에 FPS/프레임 시간 백분위/단계별 시간 표시 (F3으로 전환)
+    PROFILE_WINDOW = 240           # 백분위 계산에 쓰는 최근 프레임 수
+    PROFILE_HUD_STAGES = ("redraw", "input", "crop", "resize", "cvtColor", "photo")
+    PROFILE_TRACE_MAX_EVENTS = 1_000_000   # trace 기록 상한 (넘으면 오래된 것부터 버림)
@@ -0,0 +1,160 @@
+# auto_tune.py
+"""[신규] 발판 감지 파라미터 자동 튜닝.
+
+참조 맵 JSON(예: Asteria_1.json)의 발판과 비교해 threshold / min_len(커널 길이) / max_h(두께 상한)
+조합을 병렬로 평가하고 가장 점수가 높은 설정을 찾습니다.
+
+사용 예:
+    python auto_tune.py minimap.png Asteria_1.json --workers 8
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from image_store import MappedImage
+from map_store import as_columns
+from platform_detector import binarize, open_mask, platform_chains, select_platforms, to_gray
+
+# 거친 탐색 격자
+COARSE_THRESHOLDS = range(40, 256, 16)
+COARSE_MIN_LENS = range(5, 61, 5)
+COARSE_MAX_HEIGHTS = (4, 6, 8, 10, 12, 16)
+
+
+def _as_array(platforms):
+    """dict 목록/저장소 또는 (y, x_start, x_end) 배열 → (n, 3) float 배열"""
+    if isinstance(platforms, np.ndarray): return platforms.reshape(-1, 3).astype(float)
+    return as_columns(platforms, ("y", "x_start", "x_end")).astype(float)
+
+
+def score_platforms(found, reference, y_tol=3, min_iou=0.5):
+    """감지 결과와 참조 발판을 1:1로 짝지어 (F1, 정밀도, 재현율, 평균 끝점 오차) 반환.
+    같은 높이(±y_tol)에서 x 구간 IoU가 min_iou 이상이면 같은 발판으로 봅니다."""
+    f, r = _as_array(found), _as_array(reference)
+    if not len(f) or not len(r):
+        return 0.0, 0.0, 0.0, float("inf")
+    inter = np.minimum(f[:, None, 2], r[None, :, 2]) - np.maximum(f[:, None, 1], r[None, :, 1])
+    union = np.maximum(f[:, None, 2], r[None, :, 2]) - np.minimum(f[:, None, 1], r[None, :, 1])
+    iou = np.where(union > 0, np.clip(inter, 0, None) / np.maximum(union, 1), 0.0)
+    iou[np.abs(f[:, None, 0] - r[None, :, 0]) > y_tol] = 0.0
+
+    # IoU가 큰 쌍부터 탐욕적으로 짝짓기
+    used_f, used_r, errors = set(), set(), []
+    for k in np.argsort(-iou, axis=None):
+        i, j = divmod(int(k), iou.shape[1])
+        if iou[i, j] < min_iou: break
+        if i in used_f or j in used_r: continue
+        used_f.add(i); used_r.add(j)
+        errors.append(np.abs(f[i] - r[j]).mean())
+    tp = len(errors)
+    precision, recall = tp / len(f), tp / len(r)
+    f1 = 2 * precision * recall / (precision + recall) if tp else 0.0
+    return f1, precision, recall, (float(np.mean(errors)) if errors else float("inf"))
+
+
+# --- 워커 프로세스: 그레이스케일 이미지는 공유 메모리로 한 번만 전달 ---
+_shared = {}
+
+
+def _init_worker(shm_name, shape, reference):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _shared['shm'] = shm  # 참조를 유지해야 버퍼가 살아 있습니다.
+    _shared['gray'] = np.ndarray(shape, np.uint8, buffer=shm.buf)
+    _shared['reference'] = _as_array(reference)
+
+
+def _evaluate_threshold(threshold, min_lens, max_heights):
+    """임계값 하나에 대해 min_len/max_h 조합 평가.
+    이진화는 1회, 열림과 발판 묶음 계산은 min_len마다 1회이고 max_h는 묶음 필터링만 다시 합니다."""
+    gray, reference = _shared['gray'], _shared['reference']
+    thresh = binarize(gray, threshold)
+    results = []
+    for min_len in min_lens:
+        chains = platform_chains(open_mask(thresh, min_len))
+        for max_h in max_heights:
+            found = np.column_stack(select_platforms(chains, min_len, max_h)[:3])
+            f1, precision, recall, err = score_platforms(found, reference)
+            results.append({"threshold": threshold, "min_len": min_len, "max_h": max_h, "f1": f1,
+                            "precision": precision, "recall": recall, "error": err, "count": len(found)})
+    return results
+
+
+def _rank_key(result):
+    # F1이 높을수록, 같으면 끝점 오차가 작을수록 좋음
+    return (-result["f1"], result["error"])
+
+
+def _run_grid(pool, thresholds, min_lens, max_heights):
+    jobs = [pool.submit(_evaluate_threshold, t, list(min_lens), list(max_heights)) for t in thresholds]
+    return list(itertools.chain.from_iterable(job.result() for job in jobs))
+
+
+def auto_tune(img, reference, mode="coarse-to-fine", workers=None, progress=None):
+    """이미지(BGR)와 참조 발판 목록으로 최적 파라미터 탐색. (최고 결과, 전체 결과 목록) 반환"""
+    gray = to_gray(img)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, gray.nbytes))
+    try:
+        np.ndarray(gray.shape, np.uint8, buffer=shm.buf)[:] = gray
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, gray.shape, reference)) as pool:
+            results = _run_grid(pool, COARSE_THRESHOLDS, COARSE_MIN_LENS, COARSE_MAX_HEIGHTS)
+            if progress: progress("coarse", min(results, key=_rank_key), len(results))
+            if mode == "coarse-to-fine":
+                best = min(results, key=_rank_key)
+                fine = _run_grid(pool,
+                                 range(max(0, best["threshold"] - 15), min(255, best["threshold"] + 15) + 1),
+                                 range(max(1, best["min_len"] - 4), best["min_len"] + 5),
+                                 range(max(2, best["max_h"] - 2), best["max_h"] + 3))
+                results.extend(fine)
+                if progress: progress("fine", min(fine, key=_rank_key), len(fine))
+    finally:
+        shm.close()
+        shm.unlink()
+    return min(results, key=_rank_key), results
+
+
+def load_reference(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('platforms', [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="참조 맵 JSON 기준 발판 감지 파라미터 자동 튜닝")
+    parser.add_argument("image", help="미니맵 이미지")
+    parser.add_argument("reference", help="참조 맵 JSON (platforms 포함)")
+    parser.add_argument("--mode", choices=("grid", "coarse-to-fine"), default="coarse-to-fine")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--report", help="전체 평가 결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    image = MappedImage.open(args.image)
+    if image is None:
+        print(f"오류: 이미지를 열 수 없습니다: {args.image}")
+        return 1
+    reference = load_reference(args.reference)
+    t0 = time.perf_counter()
+
+    def progress(stage, best, n):
+        print(f"[{stage}] {n}개 조합 평가, 현재 최고 F1={best['f1']:.3f} "
+              f"(threshold={best['threshold']}, min_len={best['min_len']}, max_h={best['max_h']})", flush=True)
+
+    best, results = auto_tune(image.read(), reference, args.mode, args.workers, progress)
+    print(f"최적 설정: threshold={best['threshold']}, min_len={best['min_len']}, max_h={best['max_h']} "
+          f"| F1={best['f1']:.3f} P={best['precision']:.3f} R={best['recall']:.3f} "
+          f"| 총 {len(results)}개 조합, {time.perf_counter() - t0:.2f}s")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({"image": os.path.abspath(args.image), "best": best,
+                       "results": sorted(results, key=_rank_key)}, f, indent=4, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+# batch_detect.py
+"""[신규] 헤드리스 일괄 발판 감지.
+
+사용 예:
+    python batch_detect.py captures/ --out maps/ --threshold 150 --min-len 15 --workers 8
+    python batch_detect.py "captures/*.png"
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app_config import Config
+from image_store import MappedImage
+from platform_detector import detect_image
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def collect_images(inputs):
+    """디렉터리/글롭/파일 목록을 이미지 경로 목록으로 펼침 (중복 제거, 정렬)"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in os.listdir(item):
+                if name.lower().endswith(IMAGE_EXTS):
+                    paths.append(os.path.join(item, name))
+        elif any(ch in item for ch in "*?["):
+            paths.extend(p for p in glob.glob(item, recursive=True) if p.lower().endswith(IMAGE_EXTS))
+        else:
+            paths.append(item)
+    return sorted(set(os.path.normpath(p) for p in paths))
+
+
+def output_path_for(image_path, out_dir):
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    return os.path.join(out_dir or os.path.dirname(image_path), stem + ".json")
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def output_paths(images, out_dir):
+    """[신규] 이미지별 출력 경로 {이미지: JSON}. 기본은 이름.json이고, 출력이 겹치는 이미지끼리는
+    확장자를 남기고(a.png → a.png.json) --out 폴더로 모을 때는 입력 폴더 구조를 하위 폴더로 따라갑니다.
+    그래도 겹치면 (같은 파일을 두 번 준 경우 등) 나중 결과가 앞의 것을 덮지 않도록 ValueError"""
+    outs = {p: output_path_for(p, out_dir) for p in images}
+    groups = {}
+    for p, out in outs.items(): groups.setdefault(_path_key(out), []).append(p)
+    for group in groups.values():
+        if len(group) < 2: continue
+        dirs = [os.path.dirname(os.path.abspath(p)) for p in group]
+        root = os.path.commonpath(dirs)
+        for p, d in zip(group, dirs):
+            sub = os.path.relpath(d, root) if out_dir else ""
+            outs[p] = os.path.normpath(os.path.join(out_dir or os.path.dirname(p), sub, os.path.basename(p) + ".json"))
+    seen = {}
+    for p, out in outs.items():
+        key = _path_key(out)
+        if key in seen: raise ValueError(f"출력 파일이 겹칩니다: {seen[key]}, {p} → {out}")
+        seen[key] = p
+    return outs
+
+
+def process_image(image_path, out_path, threshold, min_len, max_h):
+    """워커 프로세스: 이미지 하나 감지 후 save_data 형식 JSON 저장. (경로, 발판 수, 소요 시간, 오류) 반환"""
+    t0 = time.perf_counter()
+    try:
+        image = MappedImage.open(image_path)
+        if image is None:
+            raise ValueError("이미지 디코딩 실패")
+        platforms = detect_image(image, threshold, min_len, max_h)
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump({"platforms": platforms, "portals": [], "spawns": []}, f, indent=4, ensure_ascii=False)
+        return image_path, len(platforms), time.perf_counter() - t0, None
+    except Exception as e:
+        return image_path, 0, time.perf_counter() - t0, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="미니맵 이미지 일괄 발판 감지 (GUI 없이)")
+    parser.add_argument("inputs", nargs="+", help="이미지 파일, 디렉터리 또는 글롭 패턴")
+    parser.add_argument("--out", help="JSON 출력 폴더 (기본: 이미지와 같은 폴더)")
+    parser.add_argument("--threshold", type=int, default=150, help="밝기 임계값 (기본 150)")
+    parser.add_argument("--min-len", type=int, default=15, help="최소 발판 길이 (기본 15)")
+    parser.add_argument("--max-height", type=int, default=Config.DETECT_MAX_HEIGHT, help="최대 발판 두께")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    images = collect_images(args.inputs)
+    if not images:
+        print("처리할 이미지가 없습니다.")
+        return 1
+    try:
+        outs = output_paths(images, args.out)
+    except ValueError as e:
+        print(f"오류: {e}")
+        return 1
+    for out in outs.values():
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+
+    print(f"이미지 {len(images)}개 처리 시작 (threshold={args.threshold}, min_len={args.min_len})", flush=True)
+    t0 = time.perf_counter()
+    done = errors = total_platforms = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(process_image, path, outs[path],
+                               args.threshold, args.min_len, args.max_height) for path in images]
+        for future in as_completed(futures):
+            path, count, elapsed, error = future.result()
+            done += 1
+            name = os.path.basename(path)
+            if error:
+                errors += 1
+                print(f"[{done}/{len(images)}] {name}: 오류 - {error} ({elapsed:.3f}s)", flush=True)
+            else:
+                total_platforms += count
+                print(f"[{done}/{len(images)}] {name}: 발판 {count}개 ({elapsed:.3f}s)", flush=True)
+
+    print(f"완료: 성공 {done - errors}개, 실패 {errors}개, 발판 {total_platforms}개, "
+          f"총 {time.perf_counter() - t0:.2f}s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
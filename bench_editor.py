@@ -0,0 +1,303 @@
+# bench_editor.py
+"""[신규] 에디터 핫 패스 마이크로 벤치마크 (창 없이 실행).
+
+합성 이미지(가로 200 ~ 20000px)와 합성 맵(발판 100 ~ 100k개, 포탈/스폰/밧줄은 그 1/10)을 만들어
+ImprovedMapEditor를 Tk 없이 띄운 뒤 redraw, get_disp_img, win_to_real, auto_detect_platforms,
+MapLogic.check_jump, MapLogic.find_clicked_*를 측정합니다. 결과는 JSON으로 저장하며 키 순서가 고정이라
+두 실행의 결과 파일을 diff 하거나 --compare로 비교해 느려진 항목을 찾을 수 있습니다.
+
+사용 예:
+    python bench_editor.py --out bench.json
+    python bench_editor.py --counts 100,1000 --sizes 200,2000 --out quick.json
+    python bench_editor.py --compare base.json bench.json      # 중앙값이 20% 넘게 느려진 항목이 있으면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from app_config import Config
+from image_store import MappedImage
+from main import ImprovedMapEditor
+from map_logic import MapLogic
+from map_renderer import LAYER_ORDER
+
+COUNTS = (100, 1000, 10000, 100000)
+SIZES = (200, 2000, 20000)
+MAX_DENSITY = 5          # 이미지 1000px²당 발판이 이보다 많은 조합은 건너뜀 (200px 이미지에 100k개 같은 비현실적 경우)
+BUDGET_SEC = 10.0        # 항목 하나의 측정이 이 시간을 넘으면 남은 반복을 생략 (최소 1회)
+CANVAS = (1280, 720)
+FIND_FUNCS = (("platforms", MapLogic.find_clicked_platform), ("portals", MapLogic.find_clicked_portal),
+              ("spawns", MapLogic.find_clicked_spawn), ("ropes", MapLogic.find_clicked_rope))
+
+
+# --- 창 없는 에디터 ---
+class _Var:
+    """tk 변수 대체 (get/set만)"""
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+class _VarTypes:
+    BooleanVar = IntVar = StringVar = _Var
+
+
+class _Canvas:
+    def __init__(self, width, height):
+        self.size = (width, height)
+
+    def winfo_width(self):
+        return self.size[0]
+
+    def winfo_height(self):
+        return self.size[1]
+
+
+class _Root:
+    """프레임 예약(after)은 무시합니다. 화면 출력(_present_frame)은 측정 대상이 아님"""
+    def after(self, ms, func):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+    def config(self, **kw):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+
+class _Widget:
+    def config(self, **kw):
+        pass
+
+
+def headless_editor(image, canvas=CANVAS):
+    """Tk 창 없이 에디터 상태만 만든 뒤 이미지를 붙임 (자동 저장 끔)"""
+    editor = ImprovedMapEditor.__new__(ImprovedMapEditor)
+    editor.root, editor.canvas = _Root(), _Canvas(*canvas)
+    editor._init_state(autosave=False)
+    editor._init_vars(_VarTypes)
+    editor.btn_accept = _Widget()
+    editor._set_image(image)
+    return editor
+
+
+# --- 합성 데이터 ---
+def synthetic_image(width, height, seed=0, tmp_dir=None):
+    """어두운 배경 + 밝은 가로 발판 줄무늬 + 세로 벽. 큰 이미지는 에디터처럼 메모리 맵으로 엽니다."""
+    rng = np.random.default_rng(seed)
+    mapped = width * height >= Config.IMAGE_MMAP_MIN_PIXELS
+    if mapped:
+        path = os.path.join(tmp_dir or tempfile.gettempdir(), f"bench_{width}x{height}_{seed}.npy")
+        img = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(height, width, 3))
+    else:
+        img = np.empty((height, width, 3), np.uint8)
+    for start in range(0, height, Config.DETECT_BAND_ROWS):
+        img[start:start + Config.DETECT_BAND_ROWS] = 25
+    n = max(4, width * height // 20000)
+    ys = rng.integers(0, height - 2, n)
+    xs = rng.integers(0, width - 10, n)
+    lens = rng.integers(10, max(11, min(300, width // 4)), n)
+    for y, x, length in zip(ys.tolist(), xs.tolist(), lens.tolist()):
+        img[y:y + 2, x:x + length] = 220
+        if length % 7 == 0: img[max(0, y - 30):y, x:x + 3] = 220   # 벽
+    if mapped:
+        img.flush()
+        return MappedImage(np.load(path, mmap_mode="r"), path, mapped=True)
+    return MappedImage(img)
+
+
+def synthetic_map(count, width, height, seed=0):
+    """발판 count개, 포탈/스폰/밧줄 각 count // 10개 (최소 1개)인 save_data 형식 맵"""
+    rng = np.random.default_rng(seed)
+    k = max(1, count // 10)
+    y = rng.integers(0, height, count)
+    xs = rng.integers(0, width, count)
+    xe = np.minimum(width - 1, xs + rng.integers(5, max(6, min(200, width // 4)), count))
+    pts = rng.integers(0, (width, height), (3 * k, 2))
+    rope_len = rng.integers(5, max(6, height // 8), k)
+    return {"platforms": [{'y': a, 'x_start': b, 'x_end': c} for a, b, c in zip(y.tolist(), xs.tolist(), xe.tolist())],
+            "portals": [{'in_x': a, 'in_y': b, 'out_x': b % width, 'out_y': a % height} for a, b in pts[:k].tolist()],
+            "spawns": [{'x': a, 'y': b} for a, b in pts[k:2 * k].tolist()],
+            "ropes": [{'x': a, 'y_top': b, 'y_bottom': min(height - 1, b + n)}
+                      for (a, b), n in zip(pts[2 * k:].tolist(), rope_len.tolist())]}
+
+
+def load_map(editor, data):
+    for kind, store in editor.stores.items():
+        store.replace(data.get(kind) or [])
+    editor.history.clear()
+    editor.redraw()
+
+
+def query_points(editor, n, rng):
+    """절반은 항목 위(적중), 절반은 무작위 위치"""
+    pts = rng.integers(0, (editor.img_w, editor.img_h), (n, 2)).tolist()
+    recs = editor.platforms.to_records()
+    for i in range(0, n, 2):
+        if recs:
+            p = recs[int(rng.integers(len(recs)))]
+            pts[i] = [(p['x_start'] + p['x_end']) // 2, p['y']]
+    return pts
+
+
+# --- 측정 ---
+def measure(func, repeat, number=1, setup=None, budget=BUDGET_SEC):
+    """repeat번 (setup → func를 number번) 실행해 호출당 시간 통계(ms) 반환 (setup은 측정하지 않음).
+    측정 시간 합이 budget초를 넘으면 남은 반복은 생략합니다."""
+    samples = []
+    for _ in range(repeat):
+        if setup: setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - t0) * 1000 / number)
+        if sum(samples) * number > budget * 1000: break
+    return {"calls": len(samples) * number, "min_ms": round(min(samples), 6),
+            "median_ms": round(statistics.median(samples), 6), "mean_ms": round(statistics.fmean(samples), 6)}
+
+
+def bench_case(width, height, count, repeat=5, seed=0, tmp_dir=None, progress=None, budget=BUDGET_SEC):
+    """이미지 크기 하나 × 객체 수 하나에 대한 측정 결과 목록"""
+    rng = np.random.default_rng(seed)
+    image = synthetic_image(width, height, seed, tmp_dir)
+    editor = headless_editor(image)
+    data = synthetic_map(count, width, height, seed)
+    results = []
+
+    def run(name, func, repeat=repeat, number=1, setup=None):
+        if progress: progress(name)
+        stats = measure(func, repeat, number, setup, budget)
+        results.append({"name": name, "image": [width, height], "objects": count, **stats})
+
+    def clear_layers():
+        for name in LAYER_ORDER: editor.renderer.set_items(name, [])
+        editor.renderer.render()
+
+    load_map(editor, data)
+    run("redraw.cold", editor.redraw, repeat=max(1, repeat // 2), setup=clear_layers)
+    run("redraw.steady", editor.redraw)
+
+    views = rng.random((repeat * 8, 2))
+    for zoom in (1.0, 4.0):
+        pos = iter(views.tolist() * 2)
+
+        def pan(zoom=zoom):
+            editor.zoom_scale = zoom
+            fx, fy = next(pos)
+            editor.pan_x, editor.pan_y = fx * editor.img_w, fy * editor.img_h
+        pan()
+        editor.get_disp_img()   # 타일 캐시 예열
+        run(f"get_disp_img.zoom{zoom:g}", editor.get_disp_img, repeat=repeat * 4, setup=pan)
+    editor.zoom_scale = 2.0
+    clicks = iter(rng.integers(0, CANVAS, (1000, 2)).tolist() * 1000)
+    run("win_to_real", lambda: editor.win_to_real(*next(clicks)), number=1000)
+
+    recs = editor.platforms.to_records()
+    pairs = iter([(recs[a], recs[b]) for a, b in rng.integers(0, len(recs), (2000, 2)).tolist()] * 1000)
+    run("check_jump", lambda: MapLogic.check_jump(*next(pairs)), number=2000)
+
+    pts = query_points(editor, 2000, rng)
+    for kind, find in FIND_FUNCS:
+        store, index = editor.stores[kind], editor.indexes[kind]
+        it = iter(pts * 1000)
+        run(f"{find.__name__}.index", lambda: find(store, *next(it), index=index), number=500)
+        # 선형 검색은 항목 수에 비례하므로 한 번 측정에 항목 수 x 호출 수가 대략 일정하도록
+        it = iter(pts * 1000)
+        run(f"{find.__name__}.linear", lambda: find(store, *next(it)), number=max(1, min(200, 20000 // max(1, len(store)))))
+
+    # 감지는 발판을 바꾸므로 마지막에 (매번 감지 전 상태의 맵으로 되돌림)
+    def reset_map(cold):
+        editor.platforms.replace(data["platforms"])
+        editor.history.clear()
+        editor.redraw()
+        if cold: editor.detect_cache.set_image(None); editor.detect_cache.set_image(image)
+    detect = lambda: editor.auto_detect_platforms(notify=False)
+    run("auto_detect_platforms.cold", detect, repeat=max(1, repeat // 2), setup=lambda: reset_map(True))
+    run("auto_detect_platforms.cached", detect, repeat=max(1, repeat // 2), setup=lambda: reset_map(False))
+    editor.detect_worker.cancel()
+    return results
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__,
+            "platform": platform.platform(), "machine": platform.machine(), "cpu_count": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(base_path, new_path, threshold=1.2):
+    """두 결과 파일의 중앙값 비교 출력. 느려진 항목 수 반환"""
+    def load(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return {(r["name"], tuple(r["image"]), r["objects"]): r for r in json.load(f)["results"]}
+    base, new = load(base_path), load(new_path)
+    slower = 0
+    for key in sorted(base.keys() & new.keys(), key=lambda k: (k[1], k[2], k[0])):
+        a, b = base[key]["median_ms"], new[key]["median_ms"]
+        ratio = b / a if a > 0 else float("inf")
+        mark = "  ▲ 느려짐" if ratio > threshold else "  ▼ 빨라짐" if ratio < 1 / threshold else ""
+        slower += ratio > threshold
+        name, (w, h), n = key
+        print(f"{name:40s} {w:>6}x{h:<6} {n:>7}  {a:10.4f} → {b:10.4f} ms  x{ratio:5.2f}{mark}")
+    for key in sorted(base.keys() ^ new.keys()):
+        print(f"{key[0]:40s} {key[1][0]:>6}x{key[1][1]:<6} {key[2]:>7}  한쪽에만 있음")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="에디터 핫 패스 마이크로 벤치마크 (창 없이)")
+    parser.add_argument("--counts", default=",".join(map(str, COUNTS)), help="발판 수 목록 (쉼표 구분)")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="이미지 가로 크기 목록 (세로는 절반)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=BUDGET_SEC, help="항목별 최대 측정 시간(초)")
+    parser.add_argument("--max-density", type=float, default=MAX_DENSITY, help="1000px²당 최대 발판 수 (넘는 조합은 건너뜀)")
+    parser.add_argument("--out", default="bench_editor.json", help="결과 JSON 경로")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="두 결과 파일 비교만 수행")
+    parser.add_argument("--threshold", type=float, default=1.2, help="--compare에서 느려짐으로 볼 배율")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+
+    counts = [int(v) for v in args.counts.split(",") if v]
+    sizes = [int(v) for v in args.sizes.split(",") if v]
+    results = []
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=Config.IMAGE_CACHE_DIR, ignore_cleanup_errors=True) as tmp_dir:
+        for width in sizes:
+            height = max(100, width // 2)
+            for count in counts:
+                if count > args.max_density * width * height / 1000:
+                    print(f"[{width}x{height}, 발판 {count}개] 건너뜀 (밀도 초과)")
+                    continue
+                print(f"[{width}x{height}, 발판 {count}개]", flush=True)
+                results.extend(bench_case(width, height, count, args.repeat, args.seed, tmp_dir,
+                                          progress=lambda name: print(f"  {name}", flush=True), budget=args.budget))
+    report = {"environment": environment(),
+              "args": {"counts": counts, "sizes": sizes, "repeat": args.repeat, "seed": args.seed,
+                       "budget": args.budget, "max_density": args.max_density},
+              "results": results}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"{len(results)}개 측정, {time.perf_counter() - t0:.1f}s → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# capture_source.py
+"""[신규] 화면 캡처 소스 추상화.
+
+모든 소스는 같은 인터페이스를 가집니다.
+    size            (너비, 높이)
+    origin          화면 기준 좌상단 (left, top) - ROI 저장 시 화면 좌표로 바꿀 때 사용
+    grab(rect=None) rect=(x, y, w, h) 영역만 BGR 배열로 (None이면 전체)
+    advance()       다음 프레임으로 (재생 소스만 의미 있음, 실제 창은 매 grab이 최신)
+    close()
+
+소스 지정 문자열 (open_source):
+    window:MapleStory       게임 창 (win32gui + mss, Windows 전용)
+    image:capture.png       이미지 한 장 / 폴더면 안의 이미지들을 순서대로 반복
+    video:record.mp4        동영상 반복 재생
+    synthetic:800x600       움직이는 가짜 미니맵 (CI/벤치마크용)
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+from image_store import decode_image
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def _clip(rect, w, h):
+    """(x, y, w, h)를 소스 크기 안으로 자름"""
+    if rect is None: return 0, 0, w, h
+    x, y, rw, rh = rect
+    x1, y1 = max(0, min(x, w)), max(0, min(y, h))
+    x2, y2 = max(x1, min(x + rw, w)), max(y1, min(y + rh, h))
+    return x1, y1, x2 - x1, y2 - y1
+
+
+class CaptureSource:
+    origin = (0, 0)
+
+    @property
+    def size(self):
+        raise NotImplementedError
+
+    def grab(self, rect=None):
+        raise NotImplementedError
+
+    def advance(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WindowCapture(CaptureSource):
+    """게임 창 캡처. rect를 주면 그 영역만 mss로 가져옵니다 (전체 창을 매번 가져오지 않음)."""
+    def __init__(self, title):
+        import mss
+        import win32con
+        import win32gui
+        hwnd = win32gui.FindWindow(None, title)
+        if not hwnd: raise RuntimeError(f"'{title}' 창을 찾을 수 없습니다. 게임이 실행 중인지 확인하세요.")
+        if win32gui.IsIconic(hwnd): raise RuntimeError(f"'{title}' 창이 최소화되어 있습니다. 창을 활성화한 후 다시 실행해 주세요.")
+        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(hwnd)
+        left, top, right, bot = win32gui.GetWindowRect(hwnd)
+        if right - left <= 0 or bot - top <= 0: raise RuntimeError(f"'{title}' 창의 크기를 가져올 수 없습니다. (너비/높이 0 이하)")
+        self.origin = (left, top)
+        self._size = (right - left, bot - top)
+        self._sct = mss.mss()
+
+    @property
+    def size(self):
+        return self._size
+
+    def grab(self, rect=None):
+        x, y, w, h = _clip(rect, *self._size)
+        shot = self._sct.grab({'left': self.origin[0] + x, 'top': self.origin[1] + y, 'width': max(1, w), 'height': max(1, h)})
+        return cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2BGR)
+
+    def close(self):
+        self._sct.close()
+
+
+class _FrameSource(CaptureSource):
+    """현재 프레임 배열에서 잘라 주는 재생 소스의 공통부"""
+    frame = None
+
+    @property
+    def size(self):
+        return self.frame.shape[1], self.frame.shape[0]
+
+    def grab(self, rect=None):
+        x, y, w, h = _clip(rect, *self.size)
+        return self.frame[y:y + h, x:x + w].copy()
+
+
+class ImageCapture(_FrameSource):
+    """이미지 한 장 또는 폴더 안 이미지들을 advance()마다 순서대로 (끝나면 처음부터)"""
+    def __init__(self, path):
+        if os.path.isdir(path):
+            self.paths = sorted(os.path.join(path, n) for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTS))
+        else:
+            self.paths = [path]
+        if not self.paths: raise RuntimeError(f"이미지가 없습니다: {path}")
+        self._frames = {}
+        self._k = 0
+        self.frame = self._load(0)
+
+    def _load(self, k):
+        if k not in self._frames:
+            img = decode_image(self.paths[k])
+            if img is None: raise RuntimeError(f"이미지를 열 수 없습니다: {self.paths[k]}")
+            self._frames[k] = img
+        return self._frames[k]
+
+    def advance(self):
+        if len(self.paths) > 1:
+            self._k = (self._k + 1) % len(self.paths)
+            self.frame = self._load(self._k)
+
+
+class VideoCapture(_FrameSource):
+    """동영상 파일 반복 재생"""
+    def __init__(self, path):
+        self._cap = cv2.VideoCapture(path)
+        ok, self.frame = self._cap.read()
+        if not ok: raise RuntimeError(f"동영상을 열 수 없습니다: {path}")
+
+    def advance(self):
+        ok, frame = self._cap.read()
+        if not ok:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read()
+        if ok: self.frame = frame
+
+    def close(self):
+        self._cap.release()
+
+
+class SyntheticCapture(_FrameSource):
+    """가짜 게임 화면: 고정된 배경 + 발판 줄무늬 미니맵 + 그 안을 움직이는 점 (결정적)"""
+    def __init__(self, width=800, height=600, seed=0):
+        rng = np.random.default_rng(seed)
+        self.base = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+        self.minimap = (10, 50, min(200, width - 10), min(150, height - 50))
+        x, y, w, h = self.minimap
+        self.base[y:y + h, x:x + w] = 30
+        for _ in range(12):
+            py, px = rng.integers(y + 5, y + h - 5), rng.integers(x, x + w - 20)
+            self.base[py:py + 2, px:px + rng.integers(15, 60)] = 220
+        self.frame = self.base.copy()
+        self._t = 0
+
+    def advance(self):
+        x, y, w, h = self.minimap
+        self._t += 1
+        self.frame[y:y + h, x:x + w] = self.base[y:y + h, x:x + w]
+        cx, cy = x + self._t * 3 % w, y + h // 2 + int(h / 3 * np.sin(self._t / 10))
+        cv2.circle(self.frame, (int(cx), int(cy)), 3, (0, 255, 255), -1)
+
+
+def open_source(spec):
+    """소스 지정 문자열 → CaptureSource (접두어가 없으면 파일 확장자/폴더로 추정)"""
+    kind, _, arg = spec.partition(":")
+    if kind not in ("window", "image", "video", "synthetic"):  # 접두어 없는 경로 ('C:\\...' 포함)
+        kind, arg = ("video" if os.path.splitext(spec)[1].lower() in (".mp4", ".avi", ".mkv") else "image"), spec
+    if kind == "window": return WindowCapture(arg)
+    if kind == "image": return ImageCapture(arg)
+    if kind == "video": return VideoCapture(arg)
+    if kind == "synthetic":
+        w, _, h = arg.partition("x")
+        return SyntheticCapture(int(w or 800), int(h or 600))
+    raise ValueError(f"알 수 없는 캡처 소스: {spec}")
+
+
+class FpsMeter:
+    """프레임 수/경과 시간으로 초당 프레임 측정"""
+    def __init__(self):
+        self.frames = 0
+        self.t0 = time.perf_counter()
+
+    def tick(self):
+        self.frames += 1
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.t0
+
+    @property
+    def fps(self):
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
@@ -0,0 +1,134 @@
+# color_detector.py
+"""[신규] HSV 색 범위로 포탈 표시/스폰 아이콘/밧줄·사다리 감지.
+
+색 종류(Config.COLOR_CLASSES)마다 비트 하나를 배정해 H/S/V 채널별 LUT(256칸)를 만들어 두면,
+    클래스 비트 = LUT_H[h] & LUT_S[s] & LUT_V[v]
+로 모든 종류를 픽셀당 한 번에 분류할 수 있습니다 (종류마다 inRange를 반복하지 않음).
+분류 결과(단일 채널 비트 평면)는 띠 단위로 채운 뒤, 종류별 비트만 떼어 연결 요소로 묶습니다.
+    portals / spawns  크기가 아이콘 범위인 덩어리의 중심
+    ropes             세로 커널로 열어 가로 성분을 지운 뒤 가늘고 긴 덩어리의 세로 구간
+감지 결과는 save_data 형식 dict 목록이며, 사람이 검토할 수 있도록 에디터에 그대로 추가됩니다.
+"""
+import cv2
+import numpy as np
+
+from app_config import Config
+from map_store import as_columns
+
+ICON_KINDS = ("portals", "spawns")
+
+
+def build_luts(classes):
+    """{종류: ((h, s, v) 하한, (h, s, v) 상한)} → (종류 목록, H/S/V LUT 3개).
+    H 하한이 상한보다 크면 0을 넘어 감싸는 범위(예: 빨강 170~10)로 봅니다."""
+    names = list(classes)
+    if len(names) > 8: raise ValueError("색 종류는 8개까지 지원합니다.")
+    luts = [np.zeros(256, np.uint8) for _ in range(3)]
+    values = np.arange(256)
+    for bit, name in enumerate(names):
+        lo, hi = classes[name]
+        for c in range(3):
+            if c == 0 and lo[0] > hi[0]: inside = (values >= lo[0]) | (values <= hi[0])
+            else: inside = (values >= lo[c]) & (values <= hi[c])
+            luts[c][inside] |= 1 << bit
+    return names, luts
+
+
+def classify(img, luts):
+    """BGR 이미지 → 픽셀별 색 종류 비트 평면 (uint8)"""
+    h, s, v = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+    out = cv2.LUT(h, luts[0])
+    cv2.bitwise_and(out, cv2.LUT(s, luts[1]), out)
+    return cv2.bitwise_and(out, cv2.LUT(v, luts[2]), out)
+
+
+def class_plane(image, luts, rect=None):
+    """이미지 백엔드(MappedImage)를 띠 단위로 읽어 비트 평면을 채움 (rect 는 (x1, y1, x2, y2))"""
+    x1, y1, x2, y2 = rect or (0, 0, image.w, image.h)
+    plane = image.alloc_plane() if rect is None else np.empty((y2 - y1, x2 - x1), np.uint8)
+    for band, _, by, _, _ in image.iter_bands(Config.DETECT_BAND_ROWS, 0, rect):
+        plane[by - y1:by - y1 + band.shape[0]] = classify(band, luts)
+    return plane
+
+
+def _class_mask(plane, bit):
+    return cv2.compare(cv2.bitwise_and(plane, 1 << bit), 0, cv2.CMP_GT)
+
+
+def find_icons(mask, area=None, max_size=None):
+    """마스크에서 아이콘 크기 덩어리의 중심 (n, 2) int 배열.
+    겹고리처럼 한 칸 띄워 그린 아이콘이 한 덩어리가 되도록 3x3으로 닫은 뒤 묶습니다."""
+    lo, hi = area or Config.COLOR_ICON_AREA
+    max_size = max_size or Config.COLOR_ICON_MAX_SIZE
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+    n, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    s = stats[1:]
+    ok = ((s[:, cv2.CC_STAT_AREA] >= lo) & (s[:, cv2.CC_STAT_AREA] <= hi)
+          & (s[:, cv2.CC_STAT_WIDTH] <= max_size) & (s[:, cv2.CC_STAT_HEIGHT] <= max_size))
+    return np.rint(centroids[1:][ok]).astype(np.int64)
+
+
+def find_ropes(mask, min_len=None, max_width=None):
+    """마스크에서 가늘고 긴 세로 덩어리 → (x, y_top, y_bottom) (n, 3) int 배열"""
+    min_len = min_len or Config.ROPE_MIN_LEN
+    max_width = max_width or Config.ROPE_MAX_WIDTH
+    # 짝수 길이 커널은 열림 결과가 한 줄 밀리므로 min_len 이하의 홀수로 (길이는 아래에서 다시 거름)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(1, (min_len - 1) | 1)))
+    opened = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(opened, connectivity=8)
+    s = stats[1:].astype(np.int64)
+    ok = (s[:, cv2.CC_STAT_WIDTH] <= max_width) & (s[:, cv2.CC_STAT_HEIGHT] >= min_len)
+    s = s[ok]
+    x = s[:, cv2.CC_STAT_LEFT] + s[:, cv2.CC_STAT_WIDTH] // 2
+    top = s[:, cv2.CC_STAT_TOP]
+    return np.column_stack((x, top, top + s[:, cv2.CC_STAT_HEIGHT] - 1))
+
+
+def to_items(kind, cols):
+    """감지 배열 → save_data 형식 dict 목록 (포탈 출구는 입구와 같게 두어 사람이 지정)"""
+    cols = cols.tolist()
+    if kind == "portals": return [{'in_x': x, 'in_y': y, 'out_x': x, 'out_y': y} for x, y in cols]
+    if kind == "spawns": return [{'x': x, 'y': y, 'desc': 'Color Detect'} for x, y in cols]
+    return [{'x': x, 'y_top': top, 'y_bottom': bottom} for x, top, bottom in cols]
+
+
+def detect_colors(image, classes=None, rect=None):
+    """이미지 한 번 분류로 색 종류별 감지 → {종류: dict 목록}.
+    portals/spawns/ropes 외의 종류는 분류만 하고 감지하지 않습니다."""
+    names, luts = build_luts(classes or Config.COLOR_CLASSES)
+    plane = class_plane(image, luts, rect)
+    dx, dy = (rect or (0, 0))[:2]
+    found = {}
+    for bit, kind in enumerate(names):
+        if kind not in ICON_KINDS and kind != "ropes": continue
+        mask = _class_mask(plane, bit)
+        cols = find_icons(mask) if kind in ICON_KINDS else find_ropes(mask)
+        cols[:, 0] += dx
+        cols[:, 1:] += dy
+        found[kind] = dedupe(kind, to_items(kind, cols))
+    return found
+
+
+def drop_existing(kind, found, existing, tol=None):
+    """이미 있는 항목과 tol 이내로 겹치는 감지 결과를 뺀 목록.
+    점(포탈 입구/스폰)은 두 좌표 모두 tol 이내, 밧줄은 x가 tol 이내이고 세로 구간이 겹치면 중복입니다."""
+    tol = Config.COLOR_DEDUP_TOL if tol is None else tol
+    if not found or not len(existing): return list(found)
+    if kind == "ropes":
+        fields = ("x", "y_top", "y_bottom")
+        new, old = as_columns(found, fields), as_columns(existing, fields)
+        dup = ((np.abs(new[:, None, 0] - old[None, :, 0]) <= tol)
+               & (new[:, None, 1] <= old[None, :, 2] + tol) & (new[:, None, 2] >= old[None, :, 1] - tol)).any(1)
+    else:
+        fields = ("in_x", "in_y") if kind == "portals" else ("x", "y")
+        new, old = as_columns(found, fields), as_columns(existing, fields)
+        dup = (np.abs(new[:, None, :] - old[None, :, :]) <= tol).all(2).any(1)
+    return [item for item, d in zip(found, dup.tolist()) if not d]
+
+
+def dedupe(kind, items, tol=None):
+    """감지 결과끼리 tol 이내로 겹치면 앞의 것만 남김 (drop_existing과 같은 판정)"""
+    kept = []
+    for item in items:
+        if drop_existing(kind, [item], kept, tol): kept.append(item)
+    return kept
@@ -0,0 +1,113 @@
+# detect_worker.py
+import threading
+import traceback
+
+from platform_detector import DetectionCancelled
+
+
+class DetectionWorker:
+    """[신규] 백그라운드 감지 스레드.
+    가장 마지막 요청만 처리하며, 새 요청이 들어오면 진행 중인 감지는 띠 사이에서 중단됩니다.
+    Tk는 다른 스레드에서 만질 수 없으므로 결과는 메인 스레드가 poll()로 가져갑니다."""
+    def __init__(self, cache):
+        self.cache = cache
+        self.lock = threading.Lock()   # 캐시 접근 직렬화 (메인 스레드에서 직접 감지할 때도 사용)
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._request = None           # (세대, 파라미터)
+        self._result = None            # (세대, 파라미터, 발판 목록)
+        self._running = False
+        self._thread = None
+
+    def submit(self, threshold, min_len, max_h, rect=None):
+        """감지 요청 (이전 요청/진행 중인 감지는 취소)"""
+        with self._cond:
+            self._generation += 1
+            self._request = (self._generation, (threshold, min_len, max_h, rect))
+            self._result = None
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="detect-worker", daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        """대기/진행 중인 요청 취소 (이미 나온 결과도 버림)"""
+        with self._cond:
+            self._generation += 1
+            self._request = self._result = None
+
+    @property
+    def busy(self):
+        return self._request is not None or self._running
+
+    def poll(self):
+        """최신 요청의 결과가 나왔으면 (파라미터, 발판 목록) 반환 후 비움, 아니면 None"""
+        with self._cond:
+            result, self._result = self._result, None
+        return None if result is None else result[1:]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                (gen, params), self._request = self._request, None
+                self._running = True
+            found = None
+            try:
+                with self.lock:
+                    found = self.cache.detect(*params, cancel=lambda: gen != self._generation)
+            except DetectionCancelled:
+                pass
+            except Exception:
+                traceback.print_exc()
+            finally:
+                # 결과 저장과 실행 종료 표시를 한 번에 해야 poll 쪽이 결과를 놓치지 않습니다.
+                with self._cond:
+                    self._running = False
+                    if found is not None and gen == self._generation: self._result = (gen, params, found)
+
+
+class JobWorker:
+    """[신규] 오래 걸리는 작업 하나를 백그라운드에서 실행 (경로 표 저장 등).
+    실행 중에 다시 요청하면 마지막 요청만 남겨 두었다가 이어서 실행합니다.
+    결과는 메인 스레드가 poll()로 (반환값, 예외) 형태로 가져갑니다."""
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._pending = None           # (함수, 인자)
+        self._result = None            # (반환값, 예외)
+        self._running = False
+
+    def submit(self, func, *args):
+        with self._lock:
+            self._pending = (func, args)
+            if self._running: return
+            self._running = True
+        threading.Thread(target=self._run, name=self.name, daemon=True).start()
+
+    @property
+    def busy(self):
+        with self._lock:
+            return self._running
+
+    def poll(self):
+        """끝난 작업이 있으면 (반환값, 예외) 반환 후 비움, 아니면 None"""
+        with self._lock:
+            result, self._result = self._result, None
+        return result
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._running = False   # 결과를 먼저 저장하므로 busy가 False면 poll에 결과가 있음
+                    return
+                (func, args), self._pending = self._pending, None
+            try:
+                result = (func(*args), None)
+            except Exception as e:
+                traceback.print_exc()
+                result = (None, e)
+            with self._lock:
+                self._result = result
@@ -0,0 +1,166 @@
+# edit_history.py
+"""[신규] 명령(델타) 기반 되돌리기/다시 실행 기록.
+
+각 편집은 바뀐 행만 담은 작은 명령으로 기록합니다 (전체 목록 스냅샷 없음).
+명령은 저장소 묶음 stores = {"platforms": PlatformStore, ...}에 적용/취소되며,
+화면 갱신을 위해 바뀐 위치 목록 [(동작, 종류, 인덱스), ...]을 돌려줍니다.
+동작은 "insert"(그 위치에 끼워 넣음), "remove"(그 위치에서 뺌), "set"(값만 바뀜) 중 하나입니다.
+"""
+import time
+from collections import deque
+
+from app_config import Config
+
+
+class InsertRows:
+    """kind 저장소의 i 위치에 행들을 추가한 편집"""
+    __slots__ = ("kind", "i", "data", "extras")
+
+    def __init__(self, kind, i, data, extras):
+        self.kind, self.i, self.data, self.extras = kind, i, data, extras
+
+    @classmethod
+    def capture(cls, stores, kind, i, n=1):
+        """i..i+n 행을 기록 (추가는 추가한 직후, 삭제는 삭제하기 직전에 호출)"""
+        data, extras = stores[kind].rows_at(range(i, i + n))
+        return cls(kind, i, data, extras)
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def _insert(self, stores):
+        stores[self.kind].restore(self.i, self.data, self.extras)
+        return [("insert", self.kind, self.i + k) for k in range(len(self.data))]
+
+    def _remove(self, stores):
+        stores[self.kind].delete(self.i, len(self.data))
+        return [("remove", self.kind, self.i + k) for k in reversed(range(len(self.data)))]
+
+    apply, revert = _insert, _remove
+
+    def absorb(self, other):
+        return False
+
+
+class DeleteRows(InsertRows):
+    """kind 저장소의 i 위치에서 행들을 뺀 편집 (InsertRows의 역)"""
+    __slots__ = ()
+
+    apply, revert = InsertRows._remove, InsertRows._insert
+
+
+class UpdateRows:
+    """kind 저장소의 행 값만 바꾼 편집 (이전/이후 행 값을 함께 보관)"""
+    __slots__ = ("kind", "rows", "old", "new")
+
+    def __init__(self, kind, rows, old, new):
+        self.kind, self.rows, self.old, self.new = kind, list(rows), old, new
+
+    @property
+    def size(self):
+        return len(self.rows)
+
+    def _write(self, stores, state):
+        stores[self.kind].put_rows(self.rows, *state)
+        return [("set", self.kind, r) for r in self.rows]
+
+    def apply(self, stores):
+        return self._write(stores, self.new)
+
+    def revert(self, stores):
+        return self._write(stores, self.old)
+
+    def absorb(self, other):
+        """같은 행들을 이어서 바꾼 편집을 합침 (이전 값은 처음 것, 이후 값은 마지막 것)"""
+        if not isinstance(other, UpdateRows) or (other.kind, other.rows) != (self.kind, self.rows): return False
+        self.new = other.new
+        return True
+
+
+class EditGroup:
+    """여러 명령을 한 단계로 묶음 (예: 자동 감지 병합 = 기존 발판 확장 + 새 발판 추가)"""
+    __slots__ = ("commands",)
+
+    def __init__(self, commands):
+        self.commands = [c for c in commands if c.size]
+
+    @property
+    def size(self):
+        return sum(c.size for c in self.commands)
+
+    def apply(self, stores):
+        return [ch for c in self.commands for ch in c.apply(stores)]
+
+    def revert(self, stores):
+        return [ch for c in reversed(self.commands) for ch in c.revert(stores)]
+
+    def absorb(self, other):
+        return False
+
+
+class EditHistory:
+    """되돌리기/다시 실행 스택.
+    단계 수(Config.UNDO_LIMIT)와 기록된 행 수(Config.UNDO_MAX_ROWS)를 넘으면 가장 오래된 단계부터 버립니다.
+    같은 merge_key로 Config.UNDO_COALESCE_MS 안에 이어진 편집(방향키 미세조정, 편집창 입력)은 한 단계로 합칩니다."""
+    def __init__(self, stores, limit=None, max_rows=None, coalesce_ms=None):
+        self.stores = stores
+        self.limit = Config.UNDO_LIMIT if limit is None else limit
+        self.max_rows = Config.UNDO_MAX_ROWS if max_rows is None else max_rows
+        self.coalesce_ms = Config.UNDO_COALESCE_MS if coalesce_ms is None else coalesce_ms
+        self.listeners = []   # 편집 효과 콜백 f(명령, forward) (자동 저장 저널 등)
+        self.clear()
+
+    def clear(self):
+        self._undo = deque()
+        self._redo = []
+        self._rows = 0
+        self._last_key = None
+        self._last_time = 0.0
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def push(self, command, merge_key=None):
+        """이미 적용된 편집을 기록 (다시 실행 목록은 버림)"""
+        if not command.size: return
+        self._notify(command, True)
+        self._redo.clear()
+        now = time.monotonic()
+        if (merge_key is not None and merge_key == self._last_key and self._undo
+                and (now - self._last_time) * 1000 < self.coalesce_ms and self._undo[-1].absorb(command)):
+            self._last_time = now
+            return
+        self._undo.append(command)
+        self._rows += command.size
+        self._last_key, self._last_time = merge_key, now
+        while self._undo and (len(self._undo) > self.limit or self._rows > self.max_rows):
+            self._rows -= self._undo.popleft().size
+
+    def undo(self):
+        """마지막 단계를 취소하고 바뀐 위치 목록 반환 (없으면 None)"""
+        if not self._undo: return None
+        command = self._undo.pop()
+        self._rows -= command.size
+        self._redo.append(command)
+        self._last_key = None
+        changes = command.revert(self.stores)
+        self._notify(command, False)
+        return changes
+
+    def redo(self):
+        """취소한 단계를 다시 적용하고 바뀐 위치 목록 반환 (없으면 None)"""
+        if not self._redo: return None
+        command = self._redo.pop()
+        self._undo.append(command)
+        self._rows += command.size
+        self._last_key = None
+        changes = command.apply(self.stores)
+        self._notify(command, True)
+        return changes
+
+    def _notify(self, command, forward):
+        for listener in self.listeners: listener(command, forward)
@@ -1,64 +1,251 @@
+# fix_json.py
+"""[수정] 맵 JSON 스키마 마이그레이션 (GUI 없이, 병렬 처리).
+
+버전이 매겨진 마이그레이션을 순서대로 적용합니다. save_data 형식({"platforms": [...], ...})과
+지역 키 형식({"지역": [발판...]} 또는 {"지역": {"platforms": ...}}) 모두 처리하며,
+파일은 임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 교체합니다.
+
+사용 예:
+    python fix_json.py maps/ --workers 8
+    python fix_json.py "maps/**/*.json" --dry-run --diff
+    python fix_json.py --gui                     # 예전처럼 파일 선택 창으로 고르기
+"""
+import argparse
+import difflib
+import glob
 import json
 import os
-import tkinter as tk
-from tkinter import filedialog, messagebox
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+MAP_KINDS = ("platforms", "portals", "spawns")
+SKIP_SUFFIXES = (".routes.json",)   # 경로 표 등 맵이 아닌 JSON
+
+
+# --- 마이그레이션: (버전, 이름, 함수). 함수는 맵 dict 하나를 제자리에서 고치고 바뀐 항목 수를 반환 ---
+def _to_int(value):
+    return int(round(float(value)))
+
+
+def migrate_platform_ids(m, name):
+    """id가 없는 발판에 id 부여 (가능하면 리스트 위치, 이미 쓰인 번호면 빈 번호)"""
+    platforms = m.get("platforms") or []
+    used = {p["id"] for p in platforms if "id" in p}
+    changed, free = 0, 0
+    for i, p in enumerate(platforms):
+        if "id" in p: continue
+        if i in used:
+            while free in used: free += 1
+            i = free
+        p["id"] = i
+        used.add(i)
+        changed += 1
+    return changed
+
+
+def migrate_metadata(m, name):
+    """metadata(name) 보장"""
+    meta = m.setdefault("metadata", {})
+    if "name" in meta: return 0
+    meta["name"] = name
+    return 1
+
+
+def migrate_normalize_items(m, name):
+    """좌표를 정수로, 발판 x_start <= x_end, 포탈/스폰 목록과 스폰 desc 보장"""
+    changed = 0
+    for kind in MAP_KINDS:
+        if not isinstance(m.get(kind), list):
+            m[kind] = []
+            changed += 1
+    keys = {"platforms": ("y", "x_start", "x_end"), "portals": ("in_x", "in_y", "out_x", "out_y"), "spawns": ("x", "y")}
+    for kind, fields in keys.items():
+        for item in m[kind]:
+            for f in fields:
+                if not isinstance(item[f], int) or isinstance(item[f], bool):
+                    item[f] = _to_int(item[f])
+                    changed += 1
+    for p in m["platforms"]:
+        if p["x_start"] > p["x_end"]:
+            p["x_start"], p["x_end"] = p["x_end"], p["x_start"]
+            changed += 1
+    for s in m["spawns"]:
+        if "desc" not in s:
+            s["desc"] = s.pop("description", "Spawn Point")
+            changed += 1
+    return changed
+
+
+MIGRATIONS = (
+    (1, "platform_ids", migrate_platform_ids),
+    (2, "metadata", migrate_metadata),
+    (3, "normalize_items", migrate_normalize_items),
+)
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def map_entries(data, stem):
+    """파일 데이터 → [(맵 이름, 맵 dict, 버전 기록 가능 여부)] (맵 파일이 아니면 None).
+    지역 키 형식에서 값이 발판 리스트면 {"platforms": 리스트}로 감싸 처리하되 파일 형식은 그대로 둡니다."""
+    if not isinstance(data, dict): return None
+    if any(kind in data for kind in MAP_KINDS): return [(stem, data, True)]
+    if not data or not all(isinstance(v, (list, dict)) for v in data.values()): return None
+    entries = []
+    for region, value in data.items():
+        if isinstance(value, list): entries.append((region, {"platforms": value}, False))
+        elif any(kind in value for kind in MAP_KINDS): entries.append((region, value, True))
+        else: return None
+    return entries
+
+
+def migrate_data(data, stem, target=LATEST_VERSION):
+    """데이터를 제자리에서 마이그레이션. {마이그레이션 이름: 바뀐 항목 수} 반환 (맵 파일이 아니면 None).
+    버전을 기록할 수 있는 맵은 metadata.schema_version 이후 단계만, 리스트 형식 지역은 멱등 단계만 적용합니다."""
+    entries = map_entries(data, stem)
+    if entries is None: return None
+    counts = {}
+    for name, m, versioned in entries:
+        current = m.get("metadata", {}).get("schema_version", 0) if versioned else 0
+        for version, label, func in MIGRATIONS:
+            if version <= current or version > target: continue
+            if not versioned and label in ("metadata", "normalize_items"): continue  # 리스트 형식을 바꾸지 않음
+            n = func(m, name)
+            if n: counts[label] = counts.get(label, 0) + n
+        if versioned and current < target:
+            m.setdefault("metadata", {})["schema_version"] = target
+            counts["schema_version"] = counts.get("schema_version", 0) + 1
+    return counts
+
+
+def _dumps(data):
+    return json.dumps(data, indent=4, ensure_ascii=False)
+
+
+def write_atomic(path, text):
+    """같은 폴더의 임시 파일에 쓴 뒤 이름 바꾸기 (중간에 실패해도 원본 유지)"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+
+
+def process_file(path, dry_run=False, diff=False, target=LATEST_VERSION):
+    """워커: 파일 하나 마이그레이션. (경로, 상태, {단계: 개수}, diff 문자열, 오류) 반환.
+    상태: migrated / unchanged / skipped(맵 파일 아님) / error"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        before = _dumps(data) if diff else None
+        counts = migrate_data(data, os.path.splitext(os.path.basename(path))[0], target)
+        if counts is None: return path, "skipped", {}, "", None
+        if not counts: return path, "unchanged", {}, "", None
+        after = _dumps(data)
+        text = ""
+        if diff:
+            text = "".join(difflib.unified_diff(before.splitlines(True), after.splitlines(True), path, path + " (migrated)"))
+        if not dry_run: write_atomic(path, after)
+        return path, "migrated", counts, text, None
+    except Exception as e:
+        return path, "error", {}, "", f"{type(e).__name__}: {e}"
+
+
+def collect_files(inputs):
+    """디렉터리(하위 포함)/글롭/파일 목록 → 맵 JSON 경로 목록 (중복 제거, 정렬)"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                paths.extend(os.path.join(root, n) for n in names if n.lower().endswith(".json"))
+        elif any(ch in item for ch in "*?["):
+            paths.extend(p for p in glob.glob(item, recursive=True) if p.lower().endswith(".json"))
+        else:
+            paths.append(item)
+    return sorted(p for p in set(paths) if not p.lower().endswith(SKIP_SUFFIXES))
+
+
+def run_migrations(paths, dry_run=False, diff=False, workers=None, target=LATEST_VERSION, progress=None):
+    """파일 목록을 워커 풀에서 마이그레이션하고 요약 dict 반환"""
+    summary = {"files": len(paths), "migrated": 0, "unchanged": 0, "skipped": 0, "error": 0,
+               "changes": {}, "errors": {}, "dry_run": dry_run, "target_version": target}
+    t0 = time.perf_counter()
+    if len(paths) == 1 or workers == 1:
+        results = (process_file(p, dry_run, diff, target) for p in paths)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        n = len(paths)
+        results = pool.map(process_file, paths, [dry_run] * n, [diff] * n, [target] * n,
+                           chunksize=max(1, n // (4 * (workers or os.cpu_count() or 1))))
+    try:
+        for path, status, counts, text, error in results:
+            summary[status] += 1
+            for label, k in counts.items():
+                summary["changes"][label] = summary["changes"].get(label, 0) + k
+            if error: summary["errors"][path] = error
+            if progress: progress(path, status, counts, text, error)
+    finally:
+        if pool is not None: pool.shutdown()
+    summary["seconds"] = round(time.perf_counter() - t0, 3)
+    return summary
+
 
 def batch_fix_map_ids():
-    # 1. GUI 창 설정 (화면에는 띄우지 않음)
+    """예전 방식: 파일 선택 창으로 고른 파일들을 마이그레이션하고 결과를 메시지 창으로 표시"""
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
     root = tk.Tk()
-    root.withdraw() 
+    root.withdraw()
     root.attributes("-topmost", True) # 창을 최상단으로
-
-    # 2. 여러 파일 선택 창 열기
-    files = filedialog.askopenfilenames(
-        title="수정할 맵 데이터(JSON) 파일들을 선택하세요",
-        filetypes=[("JSON files", "*.json")],
-        initialdir=os.getcwd()
-    )
-
+    files = filedialog.askopenfilenames(title="수정할 맵 데이터(JSON) 파일들을 선택하세요",
+                                        filetypes=[("JSON files", "*.json")], initialdir=os.getcwd())
     if not files:
         print("선택된 파일이 없습니다.")
+        root.destroy()
         return
-
-    success_count = 0
-    error_count = 0
-
-    # 3. 선택한 각 파일에 대해 처리
-    for file_path in files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # 발판(platforms) 데이터가 있는지 확인
-            if 'platforms' in data:
-                platforms = data['platforms']
-                modified = False
-                
-                for i, platform in enumerate(platforms):
-                    # id가 없거나 데이터 구조를 보정해야 할 때
-                    if 'id' not in platform:
-                        platform['id'] = i
-                        modified = True
-                
-                if modified:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=4, ensure_ascii=False)
-                    success_count += 1
-                else:
-                    # 이미 id가 다 있는 경우
-                    success_count += 1 
-            else:
-                print(f"스키마 오류: {os.path.basename(file_path)} 파일에 'platforms' 키가 없습니다.")
-                error_count += 1
-
-        except Exception as e:
-            print(f"파일 처리 중 에러 발생 ({os.path.basename(file_path)}): {e}")
-            error_count += 1
-
-    # 4. 결과 보고
-    result_msg = f"총 {len(files)}개의 파일 중:\n- 성공: {success_count}개\n- 실패: {error_count}개"
-    messagebox.showinfo("처리 완료", result_msg)
+    s = run_migrations(list(files))
+    messagebox.showinfo("처리 완료", f"총 {len(files)}개의 파일 중:\n- 변경: {s['migrated']}개\n- 변경 없음: {s['unchanged']}개\n"
+                                 f"- 맵 아님: {s['skipped']}개\n- 실패: {s['error']}개")
     root.destroy()
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="맵 JSON 스키마 마이그레이션 (id/메타데이터/포탈·스폰 정규화)")
+    parser.add_argument("inputs", nargs="*", help="JSON 파일, 디렉터리 또는 글롭 패턴")
+    parser.add_argument("--dry-run", action="store_true", help="파일을 쓰지 않고 결과만 표시")
+    parser.add_argument("--diff", action="store_true", help="바뀌는 내용을 unified diff로 출력")
+    parser.add_argument("--to", type=int, default=LATEST_VERSION, help=f"목표 스키마 버전 (기본 {LATEST_VERSION})")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--report", help="요약 보고서를 저장할 JSON 경로")
+    parser.add_argument("--quiet", action="store_true", help="파일별 출력 생략")
+    parser.add_argument("--gui", action="store_true", help="파일 선택 창으로 고르기")
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        batch_fix_map_ids()
+        return 0
+    paths = collect_files(args.inputs)
+    if not paths:
+        print("처리할 JSON 파일이 없습니다.")
+        return 1
+
+    def progress(path, status, counts, text, error):
+        if text: print(text, end="" if text.endswith("\n") else "\n")
+        if args.quiet and status != "error": return
+        detail = error or ", ".join(f"{k} {v}" for k, v in counts.items())
+        print(f"{status:9} {path}" + (f" ({detail})" if detail else ""), flush=True)
+
+    summary = run_migrations(paths, args.dry_run, args.diff, args.workers, args.to, progress)
+    print(f"{'[dry-run] ' if args.dry_run else ''}완료: 변경 {summary['migrated']}개, 변경 없음 {summary['unchanged']}개, "
+          f"맵 아님 {summary['skipped']}개, 실패 {summary['error']}개 / 총 {summary['files']}개, {summary['seconds']:.2f}s")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False)
+    return 1 if summary["error"] else 0
+
+
 if __name__ == "__main__":
-    batch_fix_map_ids()
\ No newline at end of file
+    sys.exit(main())
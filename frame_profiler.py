@@ -0,0 +1,110 @@
+# frame_profiler.py
+"""[신규] 화면 갱신 단계별 시간 측정.
+
+    stage(name)   with 블록 하나의 시간을 현재 프레임의 해당 단계에 더함 (프레임 사이의 redraw 등은 다음 프레임에 포함)
+    begin_frame() / end_frame()   프레임 하나의 시작/마감: 프레임 시간과 단계별 시간을 최근 기록에 넣음
+    summary()     최근 프레임의 FPS, p50/p95/p99 프레임 시간, 직전 프레임 단계별 시간
+    save_trace()  trace=True일 때 기록한 구간을 Chrome trace-event JSON으로 저장 (chrome://tracing, Perfetto)
+"""
+import contextlib
+import functools
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from app_config import Config
+
+
+def no_stage(name):
+    """프로파일러가 없을 때 쓰는 빈 측정 구간"""
+    return contextlib.nullcontext()
+
+
+def timed(name):
+    """메서드 전체를 self.profiler의 name 단계로 측정하는 데코레이터"""
+    def wrap(func):
+        @functools.wraps(func)
+        def inner(self, *args, **kwargs):
+            with self.profiler.stage(name):
+                return func(self, *args, **kwargs)
+        return inner
+    return wrap
+
+
+class FrameProfiler:
+    def __init__(self, window=None, trace=False):
+        window = window or Config.PROFILE_WINDOW
+        self.frame_ms = deque(maxlen=window)    # 최근 프레임별 작업 시간 (직전 프레임 이후 redraw 등 포함)
+        self.stamps = deque(maxlen=window)      # 최근 프레임 마감 시각 (FPS 계산용)
+        self.last_stages = {}                   # 직전 프레임의 단계별 시간 (ms)
+        self._stages = {}                       # 진행 중인 프레임의 단계별 누적 시간 (s)
+        self._active = set()                    # 재귀 호출된 같은 단계는 바깥 것만 셈
+        self._frame_start = None
+        self._outside = 0.0                     # 프레임 밖(이벤트 처리 중)에서 측정된 시간
+        self._t0 = time.perf_counter()
+        self.trace = deque(maxlen=Config.PROFILE_TRACE_MAX_EVENTS) if trace else None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._active.discard(name)
+            self._stages[name] = self._stages.get(name, 0.0) + end - start
+            if self._frame_start is None and len(self._active) == 0: self._outside += end - start
+            if self.trace is not None: self._event(name, start, end)
+
+    def _event(self, name, start, end, cat="stage"):
+        self.trace.append({"name": name, "cat": cat, "ph": "X", "pid": 0, "tid": 0,
+                           "ts": round((start - self._t0) * 1e6, 1), "dur": round((end - start) * 1e6, 1)})
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """프레임 마감. 직전 프레임 이후 프레임 밖에서 측정된 단계(redraw 등)도 이 프레임에 포함"""
+        end = time.perf_counter()
+        start = self._frame_start if self._frame_start is not None else end
+        self.frame_ms.append((end - start + self._outside) * 1000)
+        self.stamps.append(end)
+        self.last_stages = {name: t * 1000 for name, t in self._stages.items()}
+        self._stages, self._outside, self._frame_start = {}, 0.0, None
+        if self.trace is not None: self._event("frame", start, end, "frame")
+
+    def discard_frame(self):
+        """[신규] 출력하지 않은 프레임 버리기: 그동안 측정한 단계 시간이 다음 프레임에 섞이지 않게 비움"""
+        self._stages, self._outside, self._frame_start = {}, 0.0, None
+
+    def fps(self):
+        """최근 1초 동안 출력한 프레임 수 (화면은 바뀔 때만 갱신하므로 가만히 있으면 0)"""
+        now = time.perf_counter()
+        return float(sum(1 for t in self.stamps if now - t <= 1.0))
+
+    def percentiles(self, qs=(50, 95, 99)):
+        if not self.frame_ms: return {q: 0.0 for q in qs}
+        return dict(zip(qs, np.percentile(np.fromiter(self.frame_ms, float), qs).tolist()))
+
+    def summary(self):
+        return {"fps": self.fps(), "frames": len(self.frame_ms), "frame_ms": self.percentiles(), "stages": dict(self.last_stages)}
+
+    def hud_text(self):
+        """HUD에 덧붙일 두 줄 (FPS/백분위, 직전 프레임 단계별 시간)"""
+        p = self.percentiles()
+        line1 = f"FPS {self.fps():.0f} | frame p50 {p[50]:.1f} p95 {p[95]:.1f} p99 {p[99]:.1f} ms"
+        line2 = " ".join(f"{name} {self.last_stages[name]:.1f}" for name in Config.PROFILE_HUD_STAGES if name in self.last_stages)
+        return f"{line1}\n{line2}" if line2 else line1
+
+    def save_trace(self, path):
+        """기록한 구간을 Chrome trace-event 형식으로 저장 (기록하지 않았으면 False)"""
+        if self.trace is None: return False
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self.trace), "displayTimeUnit": "ms"}, f)
+        return True
@@ -0,0 +1,101 @@
+# image_store.py
+import hashlib
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from app_config import Config
+
+
+def _cache_dir():
+    path = Config.IMAGE_CACHE_DIR or os.path.join(tempfile.gettempdir(), "map_editor_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _sidecar_path(path):
+    """원본 경로/크기/수정시각으로 사이드카 파일 이름 결정 (원본이 바뀌면 새로 디코딩)"""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8")
+    return os.path.join(_cache_dir(), hashlib.sha1(key).hexdigest() + ".npy")
+
+
+def decode_image(path):
+    """한글 경로를 지원하는 전체 디코딩 (np.fromfile + cv2.imdecode)"""
+    return cv2.imdecode(np.fromfile(path, np.uint8), cv2.IMREAD_COLOR)
+
+
+def encode_image(path, img):
+    """[신규] 한글 경로를 지원하는 저장 (cv2.imencode + tofile). 확장자로 형식 결정"""
+    ok, buf = cv2.imencode(os.path.splitext(path)[1] or ".png", img)
+    if not ok: raise ValueError(f"이미지를 인코딩할 수 없습니다: {path}")
+    buf.tofile(path)
+
+
+class MappedImage:
+    """[신규] 대형 미니맵 이미지 백엔드.
+    큰 이미지는 최초 1회만 디코딩해 .npy 사이드카에 저장하고 이후에는 메모리 맵으로 열어
+    실제로 읽는 영역(화면/감지 영역)만 메모리에 올라오게 합니다."""
+    def __init__(self, array, path=None, mapped=False):
+        self.array = array
+        self.path = path
+        self.mapped = mapped
+        self.h, self.w = array.shape[:2]
+
+    @classmethod
+    def open(cls, path):
+        """이미지를 열어 반환 (디코딩 실패 시 None)"""
+        if not Config.IMAGE_MMAP_ENABLED:
+            img = decode_image(path)
+            return None if img is None else cls(img, path)
+        sidecar = _sidecar_path(path)
+        if os.path.exists(sidecar):
+            try:
+                return cls(np.load(sidecar, mmap_mode="r"), path, mapped=True)
+            except (ValueError, OSError):
+                os.remove(sidecar)  # 손상된 사이드카는 다시 만듭니다.
+        img = decode_image(path)
+        if img is None: return None
+        if img.shape[0] * img.shape[1] < Config.IMAGE_MMAP_MIN_PIXELS:
+            return cls(img, path)
+        # 임시 파일에 쓴 뒤 이름을 바꿔 중간에 실패해도 깨진 사이드카가 남지 않게 합니다.
+        tmp = sidecar + f".{os.getpid()}.tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=img.shape)
+        out[:] = img
+        out.flush()
+        del out, img
+        os.replace(tmp, sidecar)
+        return cls(np.load(sidecar, mmap_mode="r"), path, mapped=True)
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    def read(self, rect=None):
+        """(x1, y1, x2, y2) 영역만 읽어 연속 메모리 배열로 반환 (None이면 전체)"""
+        if rect is None: return np.ascontiguousarray(self.array)
+        x1, y1, x2, y2 = rect
+        return np.ascontiguousarray(self.array[max(0, y1):min(self.h, y2), max(0, x1):min(self.w, x2)])
+
+    def iter_bands(self, rows, margin=0, rect=None):
+        """세로로 rows 줄씩 나눈 띠 영역을 위/아래 margin 줄과 함께 순회.
+        (band_img, 띠 원점 x, 띠 원점 y, 담당 구간 시작 y, 담당 구간 끝 y)를 반환합니다."""
+        x1, y1, x2, y2 = rect or (0, 0, self.w, self.h)
+        for start in range(y1, y2, rows):
+            end = min(y2, start + rows)
+            top, bottom = max(y1, start - margin), min(y2, end + margin)
+            yield self.read((x1, top, x2, bottom)), x1, top, start, end
+
+    def alloc_frame(self):
+        """합성 버퍼 할당: 메모리 맵 이미지는 자동 삭제되는 임시 파일 위에 만듭니다."""
+        if not self.mapped:
+            return np.empty_like(self.array)
+        return np.memmap(tempfile.TemporaryFile(dir=_cache_dir()), dtype=np.uint8, mode="w+", shape=self.array.shape)
+
+    def alloc_plane(self):
+        """[신규] 이미지와 같은 크기의 단일 채널 버퍼 (감지 마스크용, 할당 방식은 alloc_frame과 같음)"""
+        if not self.mapped:
+            return np.empty((self.h, self.w), np.uint8)
+        return np.memmap(tempfile.TemporaryFile(dir=_cache_dir()), dtype=np.uint8, mode="w+", shape=(self.h, self.w))
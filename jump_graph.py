@@ -0,0 +1,133 @@
+# jump_graph.py
+import numpy as np
+
+from map_logic import MapLogic
+from map_store import as_columns
+
+# 한 번에 검사할 후보 쌍 수 (메모리 상한)
+_PAIR_CHUNK = 1 << 20
+
+
+def jump_mask(y1, xs1, xe1, y2, xs2, xe2):
+    """MapLogic.check_jump의 벡터화 버전 (p1 → p2 점프 가능 여부 배열)"""
+    overlap = ~((xe1 < xs2) | (xs1 > xe2))
+    dy = y1 - y2
+    dx = np.minimum(np.abs(xs1 - xe2), np.abs(xe1 - xs2))
+    up = overlap & (dy > MapLogic.JUMP_MIN_DY) & (dy < MapLogic.JUMP_MAX_DY)
+    side = ~overlap & (dx < MapLogic.JUMP_MAX_DX) & (np.abs(dy) < MapLogic.JUMP_SIDE_DY)
+    return up | side
+
+
+class JumpGraph:
+    """[신규] 발판 점프 그래프.
+    점프 규칙이 닿는 세로 범위(위로 JUMP_MAX_DY, 아래로 JUMP_SIDE_DY)만 후보로 보므로
+    y 정렬 후 스윕으로 만들고, 발판 하나가 바뀌면 그 발판에 닿는 간선만 다시 계산합니다.
+    간선은 (src, dst) 배열로 들고 있다가 필요할 때 CSR(indptr, indices)로 묶습니다."""
+    def __init__(self, platforms=()):
+        self.rebuild(platforms)
+
+    def __len__(self):
+        return len(self._y)
+
+    # --- 구성 ---
+    def rebuild(self, platforms):
+        cols = as_columns(platforms, ("y", "x_start", "x_end"))
+        self._y, self._xs, self._xe = cols[:, 0].copy(), cols[:, 1].copy(), cols[:, 2].copy()
+        self._src, self._dst = self._sweep()
+        self._csr = None
+
+    def _sweep(self):
+        """y 정렬 스윕: 각 발판의 세로 창 안 후보만 벡터로 검사"""
+        n = len(self._y)
+        if n == 0: return np.empty(0, np.int64), np.empty(0, np.int64)
+        order = np.argsort(self._y, kind="stable")
+        ys = self._y[order]
+        lo = np.searchsorted(ys, ys - MapLogic.JUMP_MAX_DY, side="right")
+        hi = np.searchsorted(ys, ys + MapLogic.JUMP_SIDE_DY, side="left")
+        counts = hi - lo
+        csum = np.cumsum(counts)
+        srcs, dsts = [], []
+        start = 0
+        while start < n:
+            # 후보 쌍이 너무 많아지지 않게 발판 묶음 단위로 처리
+            done = csum[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(csum, done + _PAIR_CHUNK, side="right")))
+            c = counts[start:stop]
+            a = np.repeat(np.arange(start, stop), c)
+            b = np.repeat(lo[start:stop], c) + (np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c))
+            i, j = order[a], order[b]
+            ok = (i != j) & jump_mask(self._y[i], self._xs[i], self._xe[i], self._y[j], self._xs[j], self._xe[j])
+            srcs.append(i[ok]); dsts.append(j[ok])
+            start = stop
+        return np.concatenate(srcs), np.concatenate(dsts)
+
+    def _edges_of(self, k):
+        """발판 k에서 나가고 들어오는 간선을 새로 계산"""
+        y, xs, xe = self._y[k], self._xs[k], self._xe[k]
+        others = np.arange(len(self._y))
+        near = (np.abs(self._y - y) < MapLogic.JUMP_MAX_DY) & (others != k)
+        j = others[near]
+        out = j[jump_mask(y, xs, xe, self._y[j], self._xs[j], self._xe[j])]
+        inn = j[jump_mask(self._y[j], self._xs[j], self._xe[j], y, xs, xe)]
+        src = np.concatenate([np.full(len(out), k), inn])
+        dst = np.concatenate([out, np.full(len(inn), k)])
+        return src, dst
+
+    # --- 증분 갱신 (반환값: 나가는 간선이 바뀐 발판 인덱스) ---
+    def set(self, k, p):
+        """k번째 발판 갱신 (k == len 이면 추가)"""
+        if k == len(self._y):
+            self._y, self._xs, self._xe = (np.append(a, v) for a, v in
+                                           ((self._y, p['y']), (self._xs, p['x_start']), (self._xe, p['x_end'])))
+            old_src = np.empty(0, np.int64)
+        else:
+            self._y[k], self._xs[k], self._xe[k] = p['y'], p['x_start'], p['x_end']
+            touch = (self._src == k) | (self._dst == k)
+            old_src = self._src[touch]
+            self._src, self._dst = self._src[~touch], self._dst[~touch]
+        src, dst = self._edges_of(k)
+        self._src, self._dst = np.concatenate([self._src, src]), np.concatenate([self._dst, dst])
+        self._csr = None
+        return np.unique(np.concatenate([[k], old_src, src]))
+
+    def insert(self, k, p):
+        """리스트 중간 삽입: k 이상의 인덱스를 뒤로 민 뒤 간선 추가"""
+        self._src[self._src >= k] += 1
+        self._dst[self._dst >= k] += 1
+        self._y, self._xs, self._xe = (np.insert(a, k, v) for a, v in
+                                       ((self._y, p['y']), (self._xs, p['x_start']), (self._xe, p['x_end'])))
+        src, dst = self._edges_of(k)
+        self._src, self._dst = np.concatenate([self._src, src]), np.concatenate([self._dst, dst])
+        self._csr = None
+        return np.unique(np.concatenate([[k], src]))
+
+    def remove(self, k):
+        """k번째 발판과 그 간선 삭제 (삭제 후 인덱스 기준으로 영향받은 발판 반환)"""
+        touch = (self._src == k) | (self._dst == k)
+        old_src = self._src[touch & (self._src != k)]
+        self._src, self._dst = self._src[~touch], self._dst[~touch]
+        self._src[self._src > k] -= 1
+        self._dst[self._dst > k] -= 1
+        self._y, self._xs, self._xe = (np.delete(a, k) for a in (self._y, self._xs, self._xe))
+        self._csr = None
+        return np.unique(np.where(old_src > k, old_src - 1, old_src))
+
+    # --- 조회 ---
+    def csr(self):
+        """CSR 인접 행렬 (indptr, indices), 각 행의 이웃은 오름차순"""
+        if self._csr is None:
+            order = np.lexsort((self._dst, self._src))
+            indices = self._dst[order].astype(np.int32)
+            indptr = np.zeros(len(self._y) + 1, np.int64)
+            np.cumsum(np.bincount(self._src, minlength=len(self._y)), out=indptr[1:])
+            self._csr = (indptr, indices)
+        return self._csr
+
+    def neighbors(self, k):
+        indptr, indices = self.csr()
+        return indices[indptr[k]:indptr[k + 1]]
+
+    def edges(self):
+        """(src, dst) 간선 배열 (CSR 순서)"""
+        indptr, indices = self.csr()
+        return np.repeat(np.arange(len(self._y)), np.diff(indptr)), indices
@@ -1,40 +1,77 @@
 import cv2
 import json
+import os
+import sys
 import numpy as np
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
 from PIL import Image, ImageTk
 
 from app_config import Config
 from map_logic import MapLogic
-from ui_widgets import PropertyEditor, PortalEditor, SpawnEditor
+from jump_graph import JumpGraph
+from map_router import export_routes, routes_path_for
+from platform_detector import DetectionCache, merge_platforms
+from detect_worker import DetectionWorker, JobWorker
+from auto_tune import auto_tune, load_reference
+from color_detector import detect_colors, drop_existing
+from image_store import MappedImage
+from map_store import PlatformStore, PortalStore, RopeStore, SpawnStore
+from map_binary import write_bundle, bundle_path_for
+from map_bundle import MapFile
+from session_journal import SessionJournal
+from frame_profiler import FrameProfiler, timed
+from edit_history import EditHistory, InsertRows, DeleteRows, UpdateRows, EditGroup
+from map_renderer import (LayeredRenderer, PRIM_BUILDERS, platform_prims, portal_prims, spawn_prims, rope_prims, path_prims,
+                          COLOR_SELECTED, COLOR_HOVER, COLOR_CANDIDATE)
+from spatial_index import PlatformIndex, PointIndex, RopeIndex
+from view_pyramid import ViewPyramid
+from ui_widgets import PropertyEditor, PortalEditor, SpawnEditor, RopeEditor
+
+def _single_block(sets, moves):
+    """[신규] 끼움/뺌이 연속된 한 블록(끼움은 오름차순, 뺌은 내림차순)이고 값 변경 행이 모두 그 앞에 있는지"""
+    if not moves: return True
+    ops = {op for op, _ in moves}
+    if len(ops) > 1: return False
+    idx = [i for _, i in moves]
+    start = min(idx)
+    block = list(range(start, start + len(idx)))
+    if idx != (block if ops == {"insert"} else block[::-1]): return False
+    return all(i < start for i in sets)
+
 
 class ImprovedMapEditor:
-    def __init__(self):
+    def __init__(self, trace_path=None):
         self.root = tk.Tk()
         self.root.title(Config.TITLE)
         self.root.geometry(Config.WINDOW_SIZE)
+        self._init_state(trace_path=trace_path)
+        # [중요] 지형 인식 설정값 변수를 UI 생성 전에 먼저 선언해야 합니다.
+        self._init_vars()
+        self._setup_layout()
+        if self.load_initial_image():
+            self.run_main_loop()
 
+    def _init_state(self, autosave=Config.AUTOSAVE_ENABLED, trace_path=None):
+        """[수정] Tk와 무관한 편집기 상태 (창 없이 만드는 벤치마크도 이것을 그대로 씀).
+        trace_path가 있으면 종료할 때 단계별 구간을 Chrome trace-event JSON으로 저장"""
         # 상태 및 데이터 변수
         self.mode = "PAN"
-        self.platforms = []
-        self.portals = [] 
-        self.spawns = []  # [신규] 스폰 포인트 리스트
+        self.platforms = PlatformStore()  # [수정] 열 기반 저장소 (리스트처럼 사용, 인덱싱 시 dict 호환 뷰)
+        self.portals = PortalStore()
+        self.spawns = SpawnStore()  # [신규] 스폰 포인트 리스트
+        self.ropes = RopeStore()    # [신규] 밧줄/사다리 (세로 구간)
+        self.stores = {"platforms": self.platforms, "portals": self.portals, "spawns": self.spawns, "ropes": self.ropes}
+        self.history = EditHistory(self.stores) # [신규] 되돌리기/다시 실행 (바뀐 행만 기록)
+        self.map_file = None   # [신규] 불러온 맵 파일 색인 (지역 번들이면 고른 맵만 읽음)
+        self.map_name = None   # [신규] 편집 중인 맵 이름
+        self.map_meta = {}     # [신규] 맵 metadata (저장 시 그대로 기록)
+        self.journal = SessionJournal() if autosave else None # [신규] 편집 저널 자동 저장
+        if self.journal: self.history.listeners.extend((self.journal.record, self._schedule_compact))
         self.selected_platform_idx = None # [추가] 현재 선택된 발판 인덱스
         self.selected_portal_idx = None   # [추가] 현재 선택된 포탈 인덱스
         self.selected_spawn_idx = None # [신규] 선택된 스폰 인덱스
-
-        # [신규] 시각화 토글 변수 (체크박스용)
-        self.show_platforms = tk.BooleanVar(value=True)
-        self.show_portals = tk.BooleanVar(value=True)
-        self.show_spawns = tk.BooleanVar(value=True)
-        self.show_paths = tk.BooleanVar(value=False)
-
-        # 2. [중요] 지형 인식 설정값 변수를 UI 생성 전에 먼저 선언해야 합니다.
-        self.thresh_val = tk.IntVar(value=150)
-        self.min_len_val = tk.IntVar(value=15)
-        self.hsv_lower = [tk.IntVar(value=0), tk.IntVar(value=0), tk.IntVar(value=0)]
-        self.hsv_upper = [tk.IntVar(value=180), tk.IntVar(value=255), tk.IntVar(value=255)]
+        self.selected_rope_idx = None  # [신규] 선택된 밧줄 인덱스
         
         self.zoom_scale = 1.0
         self.drawing = False
@@ -43,14 +80,61 @@ class ImprovedMapEditor:
         self.portal_in_temp = (-1, -1)
         self.start_p_real = (-1, -1)
         self.last_mouse_pos = (-1, -1)
+        self._pending_motion = None   # [신규] 병합 대기 중인 드래그 위치
+        self._pending_hover = None    # [신규] 병합 대기 중인 호버 위치
+        self.hover = None             # [신규] 마우스 아래 항목 (kind, idx)
+        self._frame_pending = False   # [신규] 프레임 예약 여부
+        self.tk_img, self.canvas_img_id, self.hud_text_id = None, None, None
         
-        self.orig_img, self.curr_img, self.temp_preview_img = None, None, None
+        self.image = None   # [신규] 이미지 백엔드 (MappedImage)
+        self.orig_img = None
+        self.renderer = LayeredRenderer() # [신규] 레이어 합성 렌더러
+        self.pyramid = ViewPyramid(self.renderer) # [신규] 줌 피라미드 + 타일 캐시
+        self.profiler = FrameProfiler(trace=trace_path is not None) # [신규] 프레임 단계별 시간 측정
+        self.pyramid.profiler = self.profiler
+        self.trace_path = trace_path
+        self.show_profile = Config.PROFILE_HUD # [신규] HUD에 프레임 시간 표시 (F3)
+        # [신규] 클릭/호버 검사용 공간 인덱스 (추가·수정·삭제 시 증분 갱신)
+        self.indexes = {"platforms": PlatformIndex(), "portals": PointIndex("in_x", "in_y"), "spawns": PointIndex("x", "y"),
+                        "ropes": RopeIndex()}
+        self.jump_graph = JumpGraph() # [신규] 점프 그래프 (발판 편집 시 해당 발판 간선만 갱신)
+        self._paths_dirty = set()   # [신규] 경로 레이어가 숨겨진 동안 밀린 행 (None이면 전부)
+        self.detect_cache = DetectionCache() # [신규] 감지 중간 결과 캐시 (파라미터별 단계 무효화)
+        self.detect_worker = DetectionWorker(self.detect_cache) # [신규] 미리보기용 백그라운드 감지
+        self.candidates = []        # [신규] 미리보기 감지 후보 (적용 전까지 platforms에 넣지 않음)
+        self._preview_after = None  # [신규] 디바운스 타이머 id
+        self._preview_polling = False
+        self.route_worker = JobWorker("route-export") # [신규] 저장 시 경로 표는 백그라운드로
+        self._routes_polling = False
+        self.tune_worker = JobWorker("auto-tune") # [신규] 자동 튜닝도 백그라운드로 (UI가 멈추지 않음)
+        self._tune_image = None   # 튜닝을 시작한 이미지 (도중에 이미지가 바뀌면 결과를 버림)
+        self._tune_progress = ""  # 워커가 단계마다 덮어쓰는 진행 상황 (HUD 표시용)
+        self.status_msg = ""        # [신규] HUD에 덧붙일 최근 작업 결과
+        self.roi_selecting = False
         self.img_h, self.img_w = 0, 0
         self.pan_x, self.pan_y = 0, 0
 
-        self._setup_layout()
-        if self.load_initial_image():
-            self.run_main_loop()
+    def _init_vars(self, var_types=tk):
+        """[수정] 사이드바와 연결되는 설정 변수. var_types는 BooleanVar/IntVar/StringVar를 제공하는 모듈
+        (헤드리스 벤치마크는 Tk 없이 get/set만 되는 대체 클래스를 넘김)"""
+        # [신규] 시각화 토글 변수 (체크박스용)
+        self.show_platforms = var_types.BooleanVar(value=True)
+        self.show_portals = var_types.BooleanVar(value=True)
+        self.show_spawns = var_types.BooleanVar(value=True)
+        self.show_ropes = var_types.BooleanVar(value=True)
+        self.show_paths = var_types.BooleanVar(value=False)
+
+        # 지형 인식 설정값
+        self.thresh_val = var_types.IntVar(value=150)
+        self.min_len_val = var_types.IntVar(value=15)
+        self.max_h_val = var_types.IntVar(value=Config.DETECT_MAX_HEIGHT) # [신규] 최대 발판 두께
+        self.live_preview = var_types.BooleanVar(value=True) # [신규] 슬라이더 조정 시 감지 후보 미리보기
+        # [수정] 색상 감지: 고른 색 종류의 HSV 범위를 슬라이더(hsv_lower/hsv_upper)로 조정
+        self.color_classes = {k: (tuple(lo), tuple(hi)) for k, (lo, hi) in Config.COLOR_CLASSES.items()}
+        self.color_class = var_types.StringVar(value=next(iter(self.color_classes)))
+        lo, hi = self.color_classes[self.color_class.get()]
+        self.hsv_lower = [var_types.IntVar(value=v) for v in lo]
+        self.hsv_upper = [var_types.IntVar(value=v) for v in hi]
 
     def _setup_layout(self):
         self.sidebar = tk.Frame(self.root, width=Config.SIDEBAR_WIDTH, relief="raised", borderwidth=1)
@@ -75,25 +159,46 @@ class ImprovedMapEditor:
         detect_frame.pack(fill="x", padx=10, pady=5)
         
         tk.Label(detect_frame, text="Threshold (밝기 임계값)").pack(anchor="w", padx=5)
-        tk.Scale(detect_frame, from_=0, to=255, orient="horizontal", variable=self.thresh_val).pack(fill="x", padx=5)
+        tk.Scale(detect_frame, from_=0, to=255, orient="horizontal", variable=self.thresh_val,
+                 command=self.on_detect_param_change).pack(fill="x", padx=5)
         
         tk.Label(detect_frame, text="Min Length (최소 길이)").pack(anchor="w", padx=5)
-        tk.Scale(detect_frame, from_=0, to=100, orient="horizontal", variable=self.min_len_val).pack(fill="x", padx=5)
+        tk.Scale(detect_frame, from_=0, to=100, orient="horizontal", variable=self.min_len_val,
+                 command=self.on_detect_param_change).pack(fill="x", padx=5)
+
+        tk.Label(detect_frame, text="Max Height (최대 두께)").pack(anchor="w", padx=5) # [신규]
+        tk.Scale(detect_frame, from_=2, to=30, orient="horizontal", variable=self.max_h_val,
+                 command=self.on_detect_param_change).pack(fill="x", padx=5)
+        tk.Checkbutton(detect_frame, text="실시간 미리보기", variable=self.live_preview, command=self.on_detect_param_change).pack(anchor="w", padx=5) # [신규]
 
         # 2. [신규] 시각화 설정 섹션
         vis_frame = tk.LabelFrame(self.sidebar, text="👁 시각화 설정")
         vis_frame.pack(fill="x", padx=10, pady=5)
 
-        tk.Checkbutton(vis_frame, text="발판 보기", variable=self.show_platforms, command=self.redraw).pack(anchor="w", padx=5)
-        tk.Checkbutton(vis_frame, text="포탈 보기", variable=self.show_portals, command=self.redraw).pack(anchor="w", padx=5)
-        tk.Checkbutton(vis_frame, text="스폰 보기", variable=self.show_spawns, command=self.redraw).pack(anchor="w", padx=5)
-        tk.Checkbutton(vis_frame, text="점프 경로 보기", variable=self.show_paths, command=self.redraw).pack(anchor="w", padx=5)
+        tk.Checkbutton(vis_frame, text="발판 보기", variable=self.show_platforms, command=self.refresh_view).pack(anchor="w", padx=5)
+        tk.Checkbutton(vis_frame, text="포탈 보기", variable=self.show_portals, command=self.refresh_view).pack(anchor="w", padx=5)
+        tk.Checkbutton(vis_frame, text="스폰 보기", variable=self.show_spawns, command=self.refresh_view).pack(anchor="w", padx=5)
+        tk.Checkbutton(vis_frame, text="밧줄 보기", variable=self.show_ropes, command=self.refresh_view).pack(anchor="w", padx=5)
+        tk.Checkbutton(vis_frame, text="점프 경로 보기", variable=self.show_paths, command=self.refresh_view).pack(anchor="w", padx=5)
 
 
         # 자동 인식 버튼
         tk.Button(detect_frame, text="⚡ 전체 자동 감지", bg="#e1f5fe", command=self.auto_detect_platforms).pack(fill="x", padx=5, pady=2)
         self.btn_roi_detect = tk.Button(detect_frame, text="🎯 영역 지정 감지 (드래그)", bg="white", command=lambda: self.set_mode("ROI_DETECT"))
         self.btn_roi_detect.pack(fill="x", padx=5, pady=2)
+        self.btn_accept = tk.Button(detect_frame, text="✅ 후보 적용 (0)", bg="white", command=self.accept_candidates) # [신규]
+        self.btn_accept.pack(fill="x", padx=5, pady=2)
+        tk.Button(detect_frame, text="🎛 자동 튜닝 (참조 JSON)", bg="white", command=self.auto_tune_params).pack(fill="x", padx=5, pady=2) # [신규]
+
+        # [신규] 색상 감지 섹션 (포탈/스폰/밧줄)
+        color_frame = tk.LabelFrame(self.sidebar, text="🎨 색상 감지 (HSV)")
+        color_frame.pack(fill="x", padx=10, pady=5)
+        tk.OptionMenu(color_frame, self.color_class, *self.color_classes, command=self.on_color_class_change).pack(fill="x", padx=5)
+        for label, var, top in zip(("H 하한", "S 하한", "V 하한", "H 상한", "S 상한", "V 상한"),
+                                   self.hsv_lower + self.hsv_upper, (180, 255, 255) * 2):
+            tk.Scale(color_frame, label=label, from_=0, to=top, orient="horizontal", variable=var,
+                     command=self.on_hsv_change).pack(fill="x", padx=5)
+        tk.Button(color_frame, text="🎨 색상 감지 실행", bg="#f3e5f5", command=self.detect_color_items).pack(fill="x", padx=5, pady=2)
 
         # 작업 모드 섹션
         mode_frame = tk.LabelFrame(self.sidebar, text="작업 모드")
@@ -112,39 +217,156 @@ class ImprovedMapEditor:
         edit_frame = tk.LabelFrame(self.sidebar, text="편집 도구")
         edit_frame.pack(fill="x", padx=10, pady=5)
         tk.Button(edit_frame, text="↩ 되돌리기 (Undo)", command=self.undo_last).pack(fill="x", padx=5, pady=2)
+        tk.Button(edit_frame, text="↪ 다시 실행 (Redo)", command=self.redo_last).pack(fill="x", padx=5, pady=2)
         tk.Button(edit_frame, text="💾 데이터 저장", bg=Config.COLOR_SAVE, font=Config.FONT_BOLD, command=self.save_data).pack(fill="x", padx=5, pady=5)
         
-    def auto_detect_platforms(self, roi_rect=None):
-        """지정된 영역(roi_rect) 또는 전체 이미지에서 발판 감지"""
+    def auto_detect_platforms(self, roi_rect=None, notify=True):
+        """지정된 영역(roi_rect) 또는 전체 이미지에서 발판 감지 (notify=False면 완료 알림 창 생략)"""
         if self.orig_img is None: return
         
-        threshold = self.thresh_val.get()
-        min_len = self.min_len_val.get()
-        
-        # 영역 설정 (ROI)
-        if roi_rect:
-            x1, y1, x2, y2 = roi_rect
-            target_img = self.orig_img[y1:y2, x1:x2]
-        else:
-            target_img = self.orig_img
-            x1, y1 = 0, 0
-
-        gray = cv2.cvtColor(target_img, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-        
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (min_len, 1))
-        detected = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=1)
-        contours, _ = cv2.findContours(detected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        count = 0
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            if w >= min_len and h < 8:
-                self.platforms.append({'y': y + y1 + 1, 'x_start': x + x1, 'x_end': x + x1 + w})
-                count += 1
-        
-        self.redraw()
-        if not roi_rect: messagebox.showinfo("완료", f"{count}개의 발판을 감지했습니다.")
+        # [수정] 캐시된 그레이/이진화/열림 마스크를 재사용 (바뀐 파라미터 단계부터만 다시 계산)
+        self.detect_worker.cancel()
+        with self.detect_worker.lock:
+            found = self.detect_cache.detect(self.thresh_val.get(), self.min_len_val.get(), self.max_h_val.get(), roi_rect)
+        summary = self._merge_detected(found)
+        if not roi_rect: self._set_candidates([]) # 전체 감지 결과와 겹치므로 후보는 비움
+        self.request_frame()
+        if not roi_rect and notify: messagebox.showinfo("완료", f"{len(found)}개의 발판을 감지했습니다.\n{summary}")
+
+    def _merge_detected(self, found):
+        """[신규] 감지 결과를 기존 발판과 중복 없이 병합하고 결과 요약 문자열 반환.
+        [수정] 화면은 늘어난/추가된 행만 증분 반영 (_apply_changes)"""
+        n0 = len(self.platforms)
+        report = merge_platforms(self.platforms, found, self.indexes["platforms"])
+        # 되돌리기: 늘어난 기존 발판의 이전 끝점 + 새로 붙은 행 블록만 기록
+        commands = []
+        if report['updated']:
+            new = self.platforms.rows_at(report['updated'])
+            old = new[0].copy()
+            old['x_start'], old['x_end'] = zip(*(report['before'][i] for i in report['updated']))
+            commands.append(UpdateRows("platforms", report['updated'], (old, new[1]), new))
+        commands.append(InsertRows.capture(self.stores, "platforms", n0, len(report['added'])))
+        self.history.push(EditGroup(commands))
+        self.status_msg = f"추가 {len(report['added'])}개 · 병합 {report['merged']}개 · 중복 {report['skipped']}개"
+        self._apply_changes([("insert", "platforms", i) for i in report['added']]
+                            + [("set", "platforms", i) for i in report['updated']])
+        return self.status_msg
+
+    def on_detect_param_change(self, _value=None):
+        """[신규] 슬라이더가 움직일 때마다 디바운스 타이머를 다시 걸어, 멈춘 뒤에만 미리보기 감지"""
+        if self._preview_after is not None:
+            self.root.after_cancel(self._preview_after)
+            self._preview_after = None
+        if self.orig_img is None: return
+        if not self.live_preview.get():
+            self.detect_worker.cancel()
+            self._set_candidates([])
+            return
+        self._preview_after = self.root.after(Config.PREVIEW_DEBOUNCE_MS, self._start_preview)
+
+    def _start_preview(self):
+        self._preview_after = None
+        self.detect_worker.submit(self.thresh_val.get(), self.min_len_val.get(), self.max_h_val.get())
+        if not self._preview_polling:
+            self._preview_polling = True
+            self.root.after(Config.PREVIEW_POLL_MS, self._poll_preview)
+
+    def _poll_preview(self):
+        """[신규] 워커 결과 확인 (Tk 갱신은 메인 스레드에서만)"""
+        busy = self.detect_worker.busy
+        result = self.detect_worker.poll()
+        if result is not None: self._set_candidates(result[1])
+        if busy: self.root.after(Config.PREVIEW_POLL_MS, self._poll_preview)
+        else: self._preview_polling = False
+
+    def _set_candidates(self, found):
+        """[신규] 감지 후보를 임시 레이어에 표시"""
+        self.candidates = found
+        self.btn_accept.config(text=f"✅ 후보 적용 ({len(found)})", bg="#c8e6c9" if found else "white")
+        if self.orig_img is None: return
+        self.renderer.set_items("candidates", [platform_prims(p, COLOR_CANDIDATE, 1) for p in found])
+        self._render()
+
+    def accept_candidates(self):
+        """[신규] 미리보기 후보를 실제 발판으로 추가"""
+        if not self.candidates: return
+        self._merge_detected(self.candidates)
+        self._set_candidates([])
+
+    def on_color_class_change(self, _value=None):
+        """[신규] 색 종류를 바꾸면 그 종류의 HSV 범위를 슬라이더에 불러옴"""
+        lo, hi = self.color_classes[self.color_class.get()]
+        for var, v in zip(self.hsv_lower + self.hsv_upper, lo + hi): var.set(v)
+
+    def on_hsv_change(self, _value=None):
+        """[신규] 슬라이더 값을 고른 색 종류의 범위에 반영"""
+        self.color_classes[self.color_class.get()] = (tuple(v.get() for v in self.hsv_lower), tuple(v.get() for v in self.hsv_upper))
+
+    def detect_color_items(self):
+        """[신규] 색상 감지: 포탈/스폰/밧줄을 한 번에 찾아 기존 항목과 겹치지 않는 것만 추가 (한 번에 되돌리기)"""
+        if self.image is None: return
+        found = detect_colors(self.image, self.color_classes)
+        commands, counts, changes = [], [], []
+        for kind, label in (("portals", "포탈"), ("spawns", "스폰"), ("ropes", "밧줄")):
+            store = self.stores[kind]
+            new = drop_existing(kind, found.get(kind, []), store)
+            counts.append(f"{label} {len(new)}개")
+            if not new: continue
+            n0 = len(store)
+            store.extend(new)
+            commands.append(InsertRows.capture(self.stores, kind, n0, len(new)))
+            changes.extend(("insert", kind, n0 + k) for k in range(len(new)))
+        if commands: self.history.push(EditGroup(commands))
+        self.status_msg = "색상 감지: " + " · ".join(counts)
+        self._apply_changes(changes)
+        self.request_frame()
+
+    def auto_tune_params(self):
+        """[신규] 참조 맵 JSON과 비교해 감지 파라미터(임계값/최소 길이/최대 두께)를 자동으로 맞춤.
+        [수정] 탐색은 백그라운드 워커에서 돌고, 끝나면 _poll_tune이 결과를 적용"""
+        if self.orig_img is None: return
+        if self.tune_worker.busy:
+            messagebox.showinfo("자동 튜닝", "자동 튜닝이 이미 진행 중입니다.")
+            return
+        path = filedialog.askopenfilename(title="참조 맵 JSON 선택", filetypes=[("JSON files", "*.json")])
+        if not path: return
+        reference = load_reference(path)
+        if not reference:
+            messagebox.showwarning("자동 튜닝", "참조 JSON에 발판이 없습니다.")
+            return
+
+        def progress(stage, best, count):
+            self._tune_progress = f"자동 튜닝: {stage} {count}개 평가, 현재 최고 F1={best['f1']:.3f}"
+
+        self._tune_image = self.image
+        self._tune_progress = "자동 튜닝 중..."
+        self.tune_worker.submit(auto_tune, self.orig_img, reference, "coarse-to-fine", None, progress)
+        self.root.after(Config.PREVIEW_POLL_MS, self._poll_tune)
+
+    def _poll_tune(self):
+        """[신규] 자동 튜닝 진행 상황 표시, 끝나면 결과 적용 (Tk 갱신은 메인 스레드에서만)"""
+        busy = self.tune_worker.busy
+        result = self.tune_worker.poll()
+        if result is None:
+            if self.status_msg != self._tune_progress:
+                self.status_msg = self._tune_progress
+                self.request_frame()
+            if busy: self.root.after(Config.PREVIEW_POLL_MS, self._poll_tune)
+            return
+        (out, err), self.status_msg = result, ""
+        self.request_frame()
+        if self.image is not self._tune_image: return  # 도중에 다른 이미지를 불러옴
+        if err is not None:
+            messagebox.showerror("자동 튜닝", f"자동 튜닝 실패: {err}")
+            return
+        best, results = out
+        self.thresh_val.set(best["threshold"])
+        self.min_len_val.set(best["min_len"])
+        self.max_h_val.set(best["max_h"])
+        self.on_detect_param_change()
+        messagebox.showinfo("자동 튜닝", f"{len(results)}개 조합 평가 완료\n"
+                            f"Threshold={best['threshold']}, Min Length={best['min_len']}, Max Height={best['max_h']}\n"
+                            f"F1={best['f1']:.3f} (정밀도 {best['precision']:.3f}, 재현율 {best['recall']:.3f})")
 
     def set_mode(self, mode):
         """작업 모드 전환 및 UI 상태 갱신"""
@@ -155,6 +377,7 @@ class ImprovedMapEditor:
         self.picking_exit = False
         self.selected_platform_idx = None
         self.selected_portal_idx = None
+        self.selected_rope_idx = None
         
         # 버튼 색상 업데이트
         self.btn_draw.config(bg=Config.COLOR_DRAW_ACTIVE if mode == "DRAW" else Config.COLOR_DRAW_INACTIVE)
@@ -168,32 +391,92 @@ class ImprovedMapEditor:
         self.btn_portal.config(bg=Config.COLOR_PORTAL_ACTIVE if mode == "PORTAL" else Config.COLOR_PORTAL_INACTIVE)
         self.btn_spawn.config(bg="#d1c4e9" if mode == "SPAWN" else "white") # [신규] 보라색
         
-        self.redraw()
+        self.refresh_view()
 
     def _bind_events(self):
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
+        self.canvas.bind("<Motion>", self.on_canvas_motion) # [신규] 호버 강조
         self.canvas.bind("<ButtonRelease-1>", self.on_canvas_release)
         self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
         self.canvas.bind("<Button-3>", self.on_right_click)
+        self.canvas.bind("<Configure>", lambda e: self.request_frame()) # [신규] 창 크기 변경 시 다시 그리기
         # [추가] 키보드 미세조정 이벤트 바인딩
         self.root.bind("<Key>", self.on_key_press)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Control-z>", lambda e: self.undo_last())
+        self.root.bind("<Control-y>", lambda e: self.redo_last())
+        self.root.bind("<Control-Z>", lambda e: self.redo_last()) # Ctrl+Shift+Z
+        self.root.bind("<F3>", lambda e: self.toggle_profile_hud()) # [신규] 프레임 시간 HUD
 
     def load_initial_image(self):
+        if self._recover_session(): return True
         path = filedialog.askopenfilename(title="미니맵 이미지 선택")
         if not path: self.root.destroy(); return False
-        img_array = np.fromfile(path, np.uint8)
-        self.orig_img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-        if self.orig_img is None: return False
-        self.img_h, self.img_w = self.orig_img.shape[:2]
-        self.pan_x, self.pan_y = self.img_w // 2, self.img_h // 2
+        image = MappedImage.open(path)
+        if image is None: return False
+        self._set_image(image)
         self.redraw()
+        self._start_session()
         return True
+
+    def _start_session(self):
+        """[신규] 현재 이미지/데이터로 자동 저장 세션을 새로 시작 (스냅샷 후 저널 비움)"""
+        if self.journal is None: return
+        self.journal.start(self.stores, {"image": os.path.abspath(self.image.path) if self.image and self.image.path else None,
+                                         "map_file": os.path.abspath(self.map_file.path) if self.map_file else None,
+                                         "map_name": self.map_name, "map_meta": self.map_meta})
+
+    def _recover_session(self):
+        """[신규] 비정상 종료로 남은 이전 세션이 있으면 스냅샷 + 저널을 재생해 복구"""
+        if self.journal is None or not self.journal.has_session(): return False
+        if not messagebox.askyesno("세션 복구", "저장하지 않은 이전 편집 세션이 남아 있습니다. 복구하시겠습니까?"): return False
+        try:
+            meta = self.journal.recover(self.stores)
+            image = MappedImage.open(meta["image"]) if meta.get("image") else None
+            if image is None: raise ValueError(f"이미지를 열 수 없습니다: {meta.get('image')}")
+            if meta.get("map_file") and os.path.exists(meta["map_file"]): self.map_file = MapFile.open(meta["map_file"])
+            self.map_name, self.map_meta = meta.get("map_name"), meta.get("map_meta") or {}
+        except Exception as e:
+            for store in self.stores.values(): store.clear()
+            messagebox.showerror("오류", f"세션 복구 실패: {e}")
+            return False
+        self._set_image(image)
+        self.redraw()
+        self._start_session()
+        self.journal.dirty = True # 복구한 내용은 아직 파일로 저장되지 않음
+        self.status_msg = f"세션 복구: 발판 {len(self.platforms)}개 (저널 {meta['replayed']}건 재생)"
+        return True
+
+    def _schedule_compact(self, command, forward):
+        """[신규] 저널 스냅샷은 편집 처리가 모두 끝난 뒤에 찍음"""
+        if self.journal.compact_due: self.root.after(0, self.journal.compact_if_due)
+
+    def on_close(self):
+        """[신규] 종료: 저장 후 편집이 없으면 자동 저장 세션을 지우고, 있으면 다음 실행 때 복구할 수 있게 남김"""
+        if self.journal is not None:
+            if self.journal.dirty and not messagebox.askyesno("종료 확인", "저장하지 않은 편집이 있습니다. 종료하시겠습니까?\n(다음 실행 때 복구할 수 있습니다)"):
+                return
+            self.journal.close(discard=not self.journal.dirty)
+        if self.trace_path: self.profiler.save_trace(self.trace_path) # [신규]
+        self.root.destroy()
+    
+    def _set_image(self, image):
+        """[신규] 이미지 백엔드 교체 및 뷰/렌더러 초기화"""
+        self.image = image
+        self.orig_img = image.array
+        self.img_h, self.img_w = image.h, image.w
+        self.pan_x, self.pan_y = self.img_w // 2, self.img_h // 2
+        self.renderer.set_base(self.orig_img, image.alloc_frame())
+        self.detect_worker.cancel()
+        with self.detect_worker.lock:
+            self.detect_cache.set_image(image)
+        self._set_candidates([])
     
     def load_new_image(self):
         """실행 중 새로운 이미지를 불러오고 데이터를 초기화합니다."""
         # 기존 데이터가 있는 경우 확인 메시지
-        if self.platforms or self.portals or self.spawns:
+        if self.platforms or self.portals or self.spawns or self.ropes:
             if not messagebox.askyesno("데이터 초기화 확인", 
                                        "이미지를 새로 불러오면 현재 작성된 발판 및 포탈 데이터가 삭제됩니다. 계속하시겠습니까?"):
                 return
@@ -203,24 +486,29 @@ class ImprovedMapEditor:
         if not path: 
             return
 
-        # 이미지 로드 (한글 경로 지원을 위해 np.fromfile 사용)
+        # 이미지 로드 (큰 이미지는 메모리 맵 사이드카 사용)
         try:
-            img_array = np.fromfile(path, np.uint8)
-            new_img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+            new_img = MappedImage.open(path)
             
             if new_img is None:
                 raise Exception("이미지 디코딩 실패")
                 
             # 데이터 및 뷰 상태 초기화
-            self.orig_img = new_img
-            self.img_h, self.img_w = self.orig_img.shape[:2]
-            self.pan_x, self.pan_y = self.img_w // 2, self.img_h // 2
             self.zoom_scale = 1.0
-            self.platforms = []
-            self.portals = []
-            self.spawns = []
+            self.platforms.clear()
+            self.portals.clear()
+            self.spawns.clear()
+            self.ropes.clear()
+            self.history.clear()
+            if self.map_file is not None: self.map_file.close()
+            self.map_file, self.map_name, self.map_meta = None, None, {}
             self.selected_platform_idx = None
             self.selected_portal_idx = None
+            self.selected_spawn_idx = None
+            self.selected_rope_idx = None
+            self.hover = self._pending_hover = None
+            self._set_image(new_img)
+            self._start_session()
             
             self.redraw()
             messagebox.showinfo("완료", "새로운 이미지를 성공적으로 불러왔습니다.")
@@ -230,46 +518,283 @@ class ImprovedMapEditor:
 
     # [신규 함수]
     def load_map_data(self):
-        """[신규] 기존 JSON 파일 불러오기"""
-        path = filedialog.askopenfilename(title="맵 데이터(JSON) 불러오기", filetypes=[("JSON files", "*.json")])
+        """[수정] 맵 파일 불러오기 (단일 맵 JSON / 지역 번들 JSON / 바이너리 맵).
+        번들이면 맵 이름 색인만 만든 뒤 고른 맵의 지형만 저장소에 채웁니다."""
+        path = filedialog.askopenfilename(title="맵 데이터 불러오기",
+                                          filetypes=[("Map files", "*.json *.mapb"), ("JSON files", "*.json"), ("Binary map", "*.mapb")])
         if not path: return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            self.platforms = data.get('platforms', [])
-            self.portals = data.get('portals', [])
-            self.spawns = data.get('spawns', []) # 스폰 데이터 로드
+            map_file = MapFile.open(path)
+            name = self._choose_map(map_file.names)
+            if name is None:
+                map_file.close()
+                return
+            self.map_meta = map_file.load_into(name, self.stores)
+            if self.map_file is not None: self.map_file.close()
+            self.map_file, self.map_name = map_file, name
+            self.history.clear()
+            self.selected_platform_idx = self.selected_portal_idx = self.selected_spawn_idx = self.selected_rope_idx = None
+            self.hover = self._pending_hover = None
+            self._start_session()
             self.redraw()
-            messagebox.showinfo("완료", f"데이터 로드 완료:\n발판 {len(self.platforms)}개\n포탈 {len(self.portals)}개\n스폰 {len(self.spawns)}개")
+            messagebox.showinfo("완료", f"데이터 로드 완료:\n발판 {len(self.platforms)}개\n포탈 {len(self.portals)}개\n스폰 {len(self.spawns)}개\n밧줄 {len(self.ropes)}개")
         except Exception as e:
             messagebox.showerror("오류", f"데이터 로드 실패: {e}")
 
+    def _choose_map(self, names):
+        """[신규] 번들에 맵이 여러 개면 이름을 입력받음 (하나면 그대로)"""
+        if len(names) <= 1: return names[0] if names else None
+        name = simpledialog.askstring("맵 선택", "불러올 맵 이름:\n" + "\n".join(names), initialvalue=names[0], parent=self.root)
+        if name is not None and name not in names:
+            messagebox.showerror("오류", f"맵을 찾을 수 없습니다: {name}")
+            return None
+        return name
+
+    @timed("redraw")
     def redraw(self):
+        """[수정] 저장소 전체가 바뀐 경우(불러오기/이미지 교체/세션 복구)에만: 인덱스·점프 그래프·레이어를 모두 다시 만듦.
+        편집은 redraw_item/_item_inserted/_item_removed(_apply_changes)로, 표시 설정은 refresh_view로 반영합니다."""
+        for kind in self.indexes: self._rebuild_kind(kind)
+        self.refresh_view()
+
+    def _rebuild_kind(self, kind):
+        """[신규] 한 종류의 인덱스(발판이면 점프 그래프/경로 포함)와 레이어를 저장소 전체로 다시 만듦 (대량 교체)"""
+        store = getattr(self, kind)
+        self.indexes[kind].rebuild(store)
+        if kind == "platforms": self.jump_graph.rebuild(store)
         if self.orig_img is None: return
-        self.curr_img = self.orig_img.copy()
-        
-        # 발판 그리기
-        if self.show_paths.get() and self.show_platforms.get():
-            for i, p in enumerate(self.platforms):
-                color = (0, 0, 255) if i == self.selected_platform_idx else (0, 255, 0) # 선택된 발판은 빨간색
-                thickness = 3 if i == self.selected_platform_idx else 2
-                cv2.line(self.curr_img, (p['x_start'], p['y']), (p['x_end'], p['y']), color, thickness)
-            
-        # 포탈 그리기
-        if self.show_portals.get():
-            for i, p in enumerate(self.portals):
-                color = (0, 0, 255) if i == self.selected_portal_idx else Config.COLOR_PORTAL_LINE
-                cv2.arrowedLine(self.curr_img, (p['in_x'], p['in_y']), (p['out_x'], p['out_y']), color, 2)
-                cv2.circle(self.curr_img, (p['in_x'], p['in_y']), 4, (255, 0, 0), -1)
+        recs = store.to_records()  # 뷰 대신 열 단위로 한 번에 변환
+        self.renderer.set_items(kind, [PRIM_BUILDERS[kind](p) for p in recs])
+        if kind != "platforms": return
+        if self._paths_shown(): self.renderer.set_items("paths", [self._path_item(i, recs) for i in range(len(recs))])
+        else: # 숨겨져 있으면 도형은 만들지 않고 다시 켤 때 한꺼번에 만듦
+            self.renderer.set_items("paths", [()] * len(recs))
+            self._paths_dirty = None
+
+    def refresh_view(self):
+        """[신규] 표시 설정/모드만 바뀐 경우: 행별로 캐시된 도형은 그대로 두고 레이어 표시 여부만 바꿔 다시 합성"""
+        if self.orig_img is None: return
+        r = self.renderer
+        r.set_visible("platforms", self.show_platforms.get())
+        if self._paths_shown(): self._flush_paths()
+        r.set_visible("paths", self._paths_shown())
+        r.set_visible("portals", self.show_portals.get())
+        r.set_visible("spawns", self.show_spawns.get())
+        r.set_visible("ropes", self.show_ropes.get())
+        self._sync_selection()
+        self._sync_hover()
+        r.render()
+        self.request_frame() # 모드/HUD 변경도 반영되도록 항상 프레임 요청
+
+    @timed("redraw")
+    def redraw_item(self, kind, idx):
+        """[신규] 항목 하나(kind: platforms/portals/spawns/ropes)가 추가·수정됐을 때 해당 영역만 다시 그리기"""
+        self._finish_rows(self._row_set(kind, idx))
+
+    def _row_set(self, kind, idx):
+        """[신규] 행 idx 값 변경을 인덱스/그래프/레이어에 반영하고 나가는 간선이 바뀐 발판 반환"""
+        item = getattr(self, kind).record(idx)
+        self.indexes[kind].set(idx, item)
+        affected = self.jump_graph.set(idx, item) if kind == "platforms" else ()
+        if self.orig_img is not None:
+            self.renderer.set_item(kind, idx, PRIM_BUILDERS[kind](item))
+            paths = self.renderer.layers["paths"]
+            if kind == "platforms" and idx == len(paths.items): paths.set_item(idx, ()) # 끝에 붙은 발판의 경로 행
+        return affected
+
+    def _finish_rows(self, affected):
+        """[신규] 행 단위 동기화 마무리: 경로 갱신 후 선택/호버 레이어와 화면 합성"""
+        if self.orig_img is None: return
+        self._sync_paths(affected)
+        self._sync_selection()
+        self._sync_hover()
+        self._render()
+
+    def add_item(self, kind, item):
+        """[신규] 항목 추가 (되돌리기 기록 포함)"""
+        store = getattr(self, kind)
+        store.append(item)
+        self.history.push(InsertRows.capture(self.stores, kind, len(store) - 1))
+        self.redraw_item(kind, len(store) - 1)
+
+    def update_item(self, kind, idx, changes, merge_key=None):
+        """[신규] 항목 값 변경 (되돌리기 기록 포함, 값이 그대로면 기록하지 않음)"""
+        store = getattr(self, kind)
+        old = store.rows_at([idx])
+        view = store[idx]
+        for key, value in changes.items():
+            if value is None: view.pop(key, None) # None이면 추가 키 삭제 (예: 포탈 대상 맵 해제)
+            else: view[key] = value
+        new = store.rows_at([idx])
+        if old[0].tobytes() == new[0].tobytes() and old[1] == new[1]: return
+        self.history.push(UpdateRows(kind, [idx], old, new), merge_key)
+        self.redraw_item(kind, idx)
+
+    def remove_item(self, kind, idx):
+        """[신규] 항목 삭제 후 해당 영역만 다시 그리기"""
+        command = DeleteRows.capture(self.stores, kind, idx)
+        getattr(self, kind).pop(idx)
+        self.history.push(command) # [수정] 다른 편집처럼 저장소를 바꾼 뒤에 기록 (저널 스냅샷과 순번이 어긋나지 않게)
+        self._item_removed(kind, idx)
+
+    @timed("redraw")
+    def _item_removed(self, kind, idx):
+        """저장소에서 idx가 빠진 뒤 인덱스/그래프/레이어 동기화"""
+        self._finish_rows(self._row_removed(kind, idx))
+
+    @timed("redraw")
+    def _item_inserted(self, kind, idx):
+        """[신규] 저장소 idx 위치에 항목이 끼워진 뒤 동기화 (삭제 되돌리기 등)"""
+        self._finish_rows(self._row_inserted(kind, idx))
+
+    def _row_removed(self, kind, idx):
+        """[신규] 행 idx 삭제를 인덱스/그래프/레이어에 반영 (경로는 아직 갱신하지 않음)"""
+        self.indexes[kind].remove(idx)
+        affected = self.jump_graph.remove(idx) if kind == "platforms" else ()
+        if self.hover and self.hover[0] == kind: self.hover = None
+        if self.orig_img is not None:
+            self.renderer.remove_item(kind, idx)
+            if kind == "platforms": self.renderer.remove_item("paths", idx)
+        if kind == "platforms" and self._paths_dirty:
+            self._paths_dirty = {i - (i > idx) for i in self._paths_dirty if i != idx}
+        return affected
 
-        # [수정] 스폰 포인트 그리기 추가
+    def _row_inserted(self, kind, idx):
+        """[신규] 행 idx 끼움을 인덱스/그래프/레이어에 반영 (경로는 아직 갱신하지 않음)"""
+        item = getattr(self, kind).record(idx)
+        self.indexes[kind].insert(idx, item)
+        affected = self.jump_graph.insert(idx, item) if kind == "platforms" else ()
+        if self.orig_img is not None:
+            self.renderer.insert_item(kind, idx, PRIM_BUILDERS[kind](item))
+            if kind == "platforms": self.renderer.insert_item("paths", idx, ())
+        if kind == "platforms" and self._paths_dirty:
+            self._paths_dirty = {i + (i >= idx) for i in self._paths_dirty}
+        return affected
+
+    def _apply_changes(self, changes):
+        """[수정] 바뀐 위치 목록(되돌리기/다시 실행/감지 병합)을 종류별로 인덱스·그래프·레이어에 증분 반영.
+        저장소는 이미 최종 상태이므로, 끼움/뺌이 한 블록이고 값만 바뀐 행이 모두 그 앞에 있을 때만 행 단위로
+        처리합니다 (블록 먼저, 값 변경은 나중에 최종 값으로). 그 밖의 모양이거나 Config.UNDO_REDRAW_ALL보다
+        많으면 그 종류만 다시 만듭니다."""
+        if not changes: return
+        if any(op != "set" for op, _, _ in changes): # 인덱스가 밀리므로 선택/호버 해제
+            self.selected_platform_idx = self.selected_portal_idx = self.selected_spawn_idx = self.selected_rope_idx = None
+            self.hover = None
+        by_kind = {}
+        for op, kind, idx in changes: by_kind.setdefault(kind, []).append((op, idx))
+        for kind, ops in by_kind.items():
+            sets = [idx for op, idx in ops if op == "set"]
+            moves = [(op, idx) for op, idx in ops if op != "set"]
+            if len(ops) > Config.UNDO_REDRAW_ALL or not _single_block(sets, moves):
+                self._rebuild_kind(kind)
+                continue
+            # 블록을 다 반영한 뒤 경로를 갱신해야 아직 그래프에 남은 행이 저장소 밖을 가리키지 않음
+            affected = set()
+            for op, idx in moves:
+                if op == "insert":
+                    affected = {i + (i >= idx) for i in affected} | set(self._row_inserted(kind, idx))
+                else:
+                    affected = {i - (i > idx) for i in affected if i != idx} | set(self._row_removed(kind, idx))
+            for idx in sets: affected.update(self._row_set(kind, idx))
+            if self.orig_img is not None: self._sync_paths(affected)
+        self._finish_rows(())
+
+    def _path_item(self, i, plats=None):
+        """발판 i에서 나가는 점프 경로 도형 (경로 레이어는 발판당 항목 하나)"""
+        plats = self.platforms if plats is None else plats
+        p1 = plats[i]
+        return tuple(prim for j in self.jump_graph.neighbors(i) for prim in path_prims(p1, plats[j]))
+
+    def _paths_shown(self):
+        """[신규] 경로 레이어가 보이는지 (발판 표시가 꺼지면 경로도 숨김)"""
+        return self.show_paths.get() and self.show_platforms.get()
+
+    def _sync_paths(self, affected):
+        """나가는 간선이 바뀐 발판들의 점프 경로만 갱신 ([수정] 숨겨져 있으면 행만 기록해 두고 켤 때 갱신)"""
+        if not self._paths_shown():
+            if self._paths_dirty is not None: self._paths_dirty.update(int(i) for i in affected)
+            return
+        for i in affected:
+            self.renderer.set_item("paths", int(i), self._path_item(i))
+
+    def _flush_paths(self):
+        """[신규] 숨겨진 동안 밀린 경로 행만 만들기 (전체 교체 뒤라면 전부)"""
+        dirty, self._paths_dirty = self._paths_dirty, set()
+        if dirty is None:
+            recs = self.platforms.to_records()
+            self.renderer.set_items("paths", [self._path_item(i, recs) for i in range(len(recs))])
+        else: self._sync_paths(sorted(dirty))
+
+    def _sync_selection(self):
+        """선택 레이어 갱신: 선택된 항목만 강조색으로 덧그립니다."""
+        def selected(items, idx, visible):
+            return items[idx] if idx is not None and idx < len(items) and visible.get() else None
+        prims = []
+        if (p := selected(self.platforms, self.selected_platform_idx, self.show_platforms)) is not None:
+            prims.extend(platform_prims(p, COLOR_SELECTED, 3))
+        if (p := selected(self.portals, self.selected_portal_idx, self.show_portals)) is not None:
+            prims.extend(portal_prims(p, COLOR_SELECTED))
+        if (s := selected(self.spawns, self.selected_spawn_idx, self.show_spawns)) is not None:
+            prims.extend(spawn_prims(s, COLOR_SELECTED))
+        if (r := selected(self.ropes, self.selected_rope_idx, self.show_ropes)) is not None:
+            prims.extend(rope_prims(r, COLOR_SELECTED))
+        self.renderer.set_items("selection", [prims])
+
+    def hit_test(self, rx, ry):
+        """[신규] 화면에 보이는 항목 중 (rx, ry)에 걸리는 것을 (kind, idx)로 반환 (포탈 → 발판 → 밧줄 → 스폰 순)"""
+        if self.show_portals.get():
+            idx = MapLogic.find_clicked_portal(self.portals, rx, ry, index=self.indexes["portals"])
+            if idx is not None: return "portals", idx
+        if self.show_platforms.get():
+            idx = MapLogic.find_clicked_platform(self.platforms, rx, ry, index=self.indexes["platforms"])
+            if idx is not None: return "platforms", idx
+        if self.show_ropes.get():
+            idx = MapLogic.find_clicked_rope(self.ropes, rx, ry, index=self.indexes["ropes"])
+            if idx is not None: return "ropes", idx
         if self.show_spawns.get():
-            for i, s in enumerate(self.spawns):
-                color = (0, 0, 255) if i == self.selected_spawn_idx else (128, 0, 128) # 보라색
-                cv2.circle(self.curr_img, (s['x'], s['y']), 6, color, -1)
-                cv2.putText(self.curr_img, "SPAWN", (s['x']-20, s['y']-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            idx = MapLogic.find_clicked_spawn(self.spawns, rx, ry, index=self.indexes["spawns"])
+            if idx is not None: return "spawns", idx
+        return None
+
+    def _sync_hover(self):
+        """[신규] 마우스 아래 항목 강조 레이어 갱신"""
+        prims = ()
+        if self.hover is not None:
+            kind, idx = self.hover
+            items = getattr(self, kind)
+            if idx < len(items): prims = PRIM_BUILDERS[kind](items[idx], COLOR_HOVER)
+            else: self.hover = None  # 저장소가 바뀌어 남은 오래된 인덱스
+        self.renderer.set_items("hover", [prims] if prims else [])
+
+    def on_canvas_motion(self, event):
+        """[신규] 호버 강조: 위치만 저장하고 다음 프레임에서 한 번만 검사 (이벤트 병합)"""
+        self._pending_hover = (event.x, event.y)
+        self.request_frame()
+
+    def _apply_hover(self):
+        if self._pending_hover is None: return
+        ex, ey = self._pending_hover
+        self._pending_hover = None
+        hover = self.hit_test(*self.win_to_real(ex, ey)) if self.mode == "PAN" else None
+        if hover != self.hover:
+            self.hover = hover
+            self._sync_hover()
+            self.renderer.render()
+
+    def _render(self):
+        """[신규] 누적된 변경분을 합성하고 화면 갱신 요청"""
+        if self.renderer.render(): self.request_frame()
+
+    def refresh_selection(self):
+        """[신규] 선택 상태만 바뀐 경우 선택 레이어만 다시 그리기"""
+        if self.orig_img is None: return
+        self._sync_selection()
+        self._render()
 
-        self.temp_preview_img = self.curr_img.copy()
+    def _set_preview(self, prims=()):
+        """[신규] 드래그 중 미리보기 도형 (발판 그리기/포탈 출구 선택)"""
+        self.renderer.set_items("preview", [prims] if prims else [])
+        self._render()
 
     def win_to_real(self, wx, wy):
         """[해결] 줌 상태에서의 좌표 불일치 문제를 완벽하게 수정"""
@@ -293,177 +818,264 @@ class ImprovedMapEditor:
     def on_canvas_click(self, event):
         rx, ry = self.win_to_real(event.x, event.y)
         if self.mode == "PAN":
-            # 포탈 선택 확인
-            if self.show_portals.get(): # [추가된 조건]
-                p_idx = MapLogic.find_clicked_portal(self.portals, rx, ry)
-                if p_idx is not None:
-                    self.selected_portal_idx, self.selected_platform_idx = p_idx, None
-                    PortalEditor(self.root, p_idx, self.portals[p_idx], self.img_h, self.img_w, 
+            # [수정] 포탈 → 발판 → 밧줄 → 스폰 순으로 공간 인덱스 검사
+            hit = self.hit_test(rx, ry)
+            if hit is not None:
+                kind, idx = hit
+                self.selected_platform_idx = idx if kind == "platforms" else None
+                self.selected_portal_idx = idx if kind == "portals" else None
+                self.selected_spawn_idx = idx if kind == "spawns" else None
+                self.selected_rope_idx = idx if kind == "ropes" else None
+                if kind == "portals":
+                    PortalEditor(self.root, idx, self.portals[idx], self.img_h, self.img_w, 
                                  self.on_item_update, self.on_portal_delete)
-                    self.redraw()
-                    return
-            
-            # 발판 선택 확인
-            if self.show_platforms.get(): # [추가된 조건]
-                idx = MapLogic.find_clicked_platform(self.platforms, rx, ry)
-                if idx is not None:
-                    self.selected_platform_idx, self.selected_portal_idx = idx, None
+                elif kind == "platforms":
                     PropertyEditor(self.root, idx, self.platforms[idx], self.img_h, self.img_w, 
                                    self.on_item_update, self.on_platform_delete)
-                    self.redraw()
-                    return
-            
-            # 스폰 선택 확인
-            if self.show_spawns.get(): # [추가된 조건]
-                s_idx = MapLogic.find_clicked_spawn(self.spawns, rx, ry)
-                if s_idx is not None:
-                    self.selected_spawn_idx = s_idx
-                    self.selected_platform_idx = self.selected_portal_idx = None
-                    SpawnEditor(self.root, s_idx, self.spawns[s_idx], self.img_h, self.img_w, self.on_item_update, self.on_spawn_delete)
-                    self.redraw()
-                    return
+                elif kind == "ropes":
+                    RopeEditor(self.root, idx, self.ropes[idx], self.img_h, self.img_w, self.on_item_update, self.on_rope_delete)
+                else:
+                    SpawnEditor(self.root, idx, self.spawns[idx], self.img_h, self.img_w, self.on_item_update, self.on_spawn_delete)
+                self.refresh_selection()
+                return
             
             # 빈 공간 클릭 시 선택 해제 및 드래그 준비
-            self.selected_platform_idx = self.selected_portal_idx = None
+            self.selected_platform_idx = self.selected_portal_idx = self.selected_spawn_idx = self.selected_rope_idx = None
             self.panning, self.last_mouse_pos = True, (event.x, event.y)
-            self.redraw()
+            self.refresh_selection()
             
         elif self.mode == "DRAW":
             self.drawing, self.start_p_real = True, (rx, ry)
+        elif self.mode == "ROI_DETECT": # [신규] 감지 영역 드래그 시작
+            self.roi_selecting, self.start_p_real = True, (rx, ry)
         elif self.mode == "PORTAL":
             if not self.picking_exit:
                 self.portal_in_temp, self.picking_exit = (rx, ry), True
             else:
-                self.portals.append({'in_x': self.portal_in_temp[0], 'in_y': self.portal_in_temp[1], 'out_x': rx, 'out_y': ry})
                 self.picking_exit = False
-                self.redraw()
+                self._set_preview()
+                self.add_item("portals", {'in_x': self.portal_in_temp[0], 'in_y': self.portal_in_temp[1], 'out_x': rx, 'out_y': ry})
         elif self.mode == "SPAWN": # [신규] 스폰 추가
-                self.spawns.append({'x': rx, 'y': ry, 'desc': 'Spawn Point'})
-                self.redraw()
+                self.add_item("spawns", {'x': rx, 'y': ry, 'desc': 'Spawn Point'})
 
     def on_key_press(self, event):
         """[신규] 키보드를 이용한 미세조정 기능 (1픽셀 단위)"""
-        if self.selected_platform_idx is None and self.selected_portal_idx is None:
+        if (self.selected_platform_idx is None and self.selected_portal_idx is None and self.selected_spawn_idx is None
+                and self.selected_rope_idx is None):
             return
 
         step = 1
         key = event.keysym
         shift = (event.state & 0x1) # Shift 키 눌림 여부
+        if key not in ("Up", "Down", "Left", "Right"): return
+        dy = -step if key == "Up" else step if key == "Down" else 0
+        dx = -step if key == "Left" else step if key == "Right" else 0
 
         if self.selected_platform_idx is not None:
-            p = self.platforms[self.selected_platform_idx]
-            if key == "Up": p['y'] -= step
-            elif key == "Down": p['y'] += step
-            elif key == "Left":
-                if shift: p['x_end'] -= step # Shift+Left: 끝점 축소
-                else: p['x_start'] -= step; p['x_end'] -= step # Left: 전체 이동
-            elif key == "Right":
-                if shift: p['x_end'] += step # Shift+Right: 끝점 확장
-                else: p['x_start'] += step; p['x_end'] += step # Right: 전체 이동
-        
+            kind, idx = "platforms", self.selected_platform_idx
+            p = self.platforms[idx]
+            if shift and dx: changes = {'x_end': p['x_end'] + dx} # Shift+좌우: 끝점 축소/확장
+            else: changes = {'y': p['y'] + dy, 'x_start': p['x_start'] + dx, 'x_end': p['x_end'] + dx} # 전체 이동
         elif self.selected_portal_idx is not None:
-            p = self.portals[self.selected_portal_idx]
-            if key == "Up": p['in_y'] -= step
-            elif key == "Down": p['in_y'] += step
-            elif key == "Left": p['in_x'] -= step
-            elif key == "Right": p['in_x'] += step
-
-        elif self.selected_spawn_idx is not None: # [신규] 스폰 이동
-            s = self.spawns[self.selected_spawn_idx]
-            if key == "Up": s['y'] -= step
-            elif key == "Down": s['y'] += step
-            elif key == "Left": s['x'] -= step
-            elif key == "Right": s['x'] += step
+            kind, idx = "portals", self.selected_portal_idx
+            p = self.portals[idx]
+            changes = {'in_x': p['in_x'] + dx, 'in_y': p['in_y'] + dy}
+        elif self.selected_rope_idx is not None: # [신규] 밧줄 이동
+            kind, idx = "ropes", self.selected_rope_idx
+            r = self.ropes[idx]
+            changes = {'x': r['x'] + dx, 'y_top': r['y_top'] + dy, 'y_bottom': r['y_bottom'] + dy}
+        else: # [신규] 스폰 이동
+            kind, idx = "spawns", self.selected_spawn_idx
+            s = self.spawns[idx]
+            changes = {'x': s['x'] + dx, 'y': s['y'] + dy}
 
-        self.redraw()
+        # [수정] 같은 항목을 연달아 미세조정하면 되돌리기 한 단계로 합쳐짐
+        self.update_item(kind, idx, changes, merge_key=("nudge", kind, idx))
 
     def on_item_update(self, idx, data):
         """[수정] 위젯에서 변경된 데이터 원본에 반영 및 실시간 리드로우"""
         # 1. 스폰 데이터인지 확인 ('desc' 키가 있으면 스폰)
         if "desc" in data:
-             self.spawns[idx].update(data)
+             kind = "spawns"
+
+        # [신규] 밧줄 데이터 ('y_top' 키)
+        elif "y_top" in data:
+            kind = "ropes"
         
         # 2. 발판 데이터인지 확인 ('y' 키가 있으면 발판)
         elif "y" in data: 
-            self.platforms[idx].update(data)
+            kind = "platforms"
             
         # 3. 나머지는 포탈 데이터로 간주
         else: 
-            self.portals[idx].update(data)
+            kind = "portals"
             
-        self.redraw()
+        self.update_item(kind, idx, data, merge_key=("edit", kind, idx))
 
     # --- 이하 나머지 코드는 기존과 동일 (생략 가능하나 구조 유지를 위해 포함) ---
     def on_canvas_drag(self, event):
-        rx, ry = self.win_to_real(event.x, event.y)
+        """[수정] 마우스 이동 이벤트는 저장만 해두고 다음 프레임에서 한 번에 처리 (이벤트 병합)"""
+        self._pending_motion = (event.x, event.y)
+        self.request_frame()
+
+    def _apply_motion(self):
+        """[신규] 프레임 사이에 쌓인 드래그 이벤트 중 마지막 위치만 반영"""
+        if self._pending_motion is None: return
+        ex, ey = self._pending_motion
+        self._pending_motion = None
+        rx, ry = self.win_to_real(ex, ey)
         if self.panning:
-            dx, dy = event.x - self.last_mouse_pos[0], event.y - self.last_mouse_pos[1]
+            dx, dy = ex - self.last_mouse_pos[0], ey - self.last_mouse_pos[1]
             cw, ch = max(10, self.canvas.winfo_width()), max(10, self.canvas.winfo_height())
             self.pan_x -= (dx / cw) * (self.img_w / self.zoom_scale)
             self.pan_y -= (dy / ch) * (self.img_h / self.zoom_scale)
-            self.last_mouse_pos = (event.x, event.y)
+            self.last_mouse_pos = (ex, ey)
         elif self.drawing:
-            self.temp_preview_img = self.curr_img.copy()
-            cv2.line(self.temp_preview_img, self.start_p_real, (rx, self.start_p_real[1]), (0, 0, 255), 2)
+            self._set_preview((("line", self.start_p_real, (rx, self.start_p_real[1]), (0, 0, 255), 2),))
         elif self.picking_exit:
-            self.temp_preview_img = self.curr_img.copy()
-            cv2.arrowedLine(self.temp_preview_img, self.portal_in_temp, (rx, ry), Config.COLOR_PORTAL_LINE, 2)
+            self._set_preview((("arrow", self.portal_in_temp, (rx, ry), Config.COLOR_PORTAL_LINE, 2),))
+        elif self.roi_selecting:
+            (x1, y1), color = self.start_p_real, (255, 200, 0)
+            corners = ((x1, y1), (rx, y1), (rx, ry), (x1, ry))
+            self._set_preview(tuple(("line", corners[k], corners[(k + 1) % 4], color, 1) for k in range(4)))
 
     def on_canvas_release(self, event):
+        self._apply_motion()
         if self.drawing:
             rx, ry = self.win_to_real(event.x, event.y)
             if abs(self.start_p_real[0] - rx) > 3:
-                self.platforms.append({'y': self.start_p_real[1], 'x_start': min(self.start_p_real[0], rx), 'x_end': max(self.start_p_real[0], rx)})
-                self.redraw()
+                self.add_item("platforms", {'y': self.start_p_real[1], 'x_start': min(self.start_p_real[0], rx), 'x_end': max(self.start_p_real[0], rx)})
             self.drawing = False
+            self._set_preview()
+        elif self.roi_selecting: # [신규] 드래그한 영역만 감지 (캐시된 마스크를 잘라 사용)
+            rx, ry = self.win_to_real(event.x, event.y)
+            (sx, sy), self.roi_selecting = self.start_p_real, False
+            self._set_preview()
+            if abs(sx - rx) > 3 and abs(sy - ry) > 3:
+                self.auto_detect_platforms((min(sx, rx), min(sy, ry), max(sx, rx), max(sy, ry)))
         self.panning = False
 
     def on_platform_delete(self, idx): 
-        self.platforms.pop(idx)
         self.selected_platform_idx = None
-        self.redraw()
+        self.remove_item("platforms", idx)
 
     def on_portal_delete(self, idx): 
-        self.portals.pop(idx)
         self.selected_portal_idx = None
-        self.redraw()
+        self.remove_item("portals", idx)
+
+    def on_spawn_delete(self, idx): 
+        self.selected_spawn_idx = None
+        self.remove_item("spawns", idx)
+
+    def on_rope_delete(self, idx):
+        self.selected_rope_idx = None
+        self.remove_item("ropes", idx)
     
     def on_mouse_wheel(self, event):
         self.zoom_scale = max(1.0, min(10.0, self.zoom_scale + (0.5 if event.delta > 0 else -0.5)))
-        self.redraw()
+        self.request_frame()
 
     def get_disp_img(self):
-        src = self.temp_preview_img if (self.drawing or self.picking_exit) else self.curr_img
-        if src is None: return None
+        """[수정] 현재 뷰 영역을 줌 피라미드의 캐시된 타일로 조립"""
+        if self.renderer.frame is None: return None
         vw, vh = self.img_w / self.zoom_scale, self.img_h / self.zoom_scale
         x1, y1 = int(self.pan_x - vw/2), int(self.pan_y - vh/2)
         tx1, ty1, tx2, ty2 = max(0, x1), max(0, y1), min(self.img_w, int(x1+vw)), min(self.img_h, int(y1+vh))
-        cropped = src[ty1:ty2, tx1:tx2]
+        if tx2 <= tx1 or ty2 <= ty1: return None
         cw, ch = max(10, self.canvas.winfo_width()), max(10, self.canvas.winfo_height())
-        return cv2.resize(cropped, (cw, ch))
+        return self.pyramid.viewport(tx1, ty1, tx2, ty2, cw, ch)
 
     def run_main_loop(self):
-        def update():
-            try:
-                disp = self.get_disp_img()
-                if disp is not None:
-                    img_pil = Image.fromarray(cv2.cvtColor(disp, cv2.COLOR_BGR2RGB))
-                    self.tk_img = ImageTk.PhotoImage(img_pil)
-                    self.canvas.delete("all")
-                    self.canvas.create_image(0, 0, anchor="nw", image=self.tk_img)
-                    info = f"Mode: {self.mode} | Zoom: x{self.zoom_scale:.1f} | Platforms: {len(self.platforms)}"
-                    self.canvas.create_text(15, 25, text=info, fill="yellow", anchor="nw", font=("Arial", 14, "bold"))
-                self.root.after(30, update)
-            except: pass
-        update(); self.root.mainloop()
+        self.request_frame()
+        self.root.mainloop()
+
+    def request_frame(self):
+        """[신규] 상태가 바뀌었을 때 다음 프레임 예약 (이미 예약돼 있으면 병합)"""
+        if self._frame_pending: return
+        self._frame_pending = True
+        self.root.after(Config.FRAME_INTERVAL_MS, self._present_frame)
+
+    def _present_frame(self):
+        """[신규] 예약된 프레임 출력: 기존 PhotoImage/캔버스 항목을 재사용해 픽셀만 교체.
+        [수정] 단계별(input/crop/resize/cvtColor/photo) 시간을 재고 HUD에 FPS/프레임 시간 백분위 표시"""
+        self._frame_pending = False
+        prof = self.profiler
+        prof.begin_frame()
+        with prof.stage("input"):
+            self._apply_motion()
+            self._apply_hover()
+        disp = self.get_disp_img() # crop/resize 단계는 ViewPyramid에서 측정
+        if disp is None:
+            prof.discard_frame()
+            return
+        with prof.stage("cvtColor"):
+            rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
+        with prof.stage("photo"):
+            img_pil = Image.fromarray(rgb)
+            if self.tk_img is None or (self.tk_img.width(), self.tk_img.height()) != img_pil.size:
+                # 캔버스 크기가 바뀐 경우에만 PhotoImage 재생성
+                self.tk_img = ImageTk.PhotoImage(img_pil)
+                if self.canvas_img_id is None:
+                    self.canvas_img_id = self.canvas.create_image(0, 0, anchor="nw", image=self.tk_img)
+                    self.hud_text_id = self.canvas.create_text(15, 25, fill="yellow", anchor="nw", font=Config.FONT_INFO)
+                else:
+                    self.canvas.itemconfig(self.canvas_img_id, image=self.tk_img)
+            else:
+                self.tk_img.paste(img_pil)
+        prof.end_frame()
+        info = f"Mode: {self.mode} | Zoom: x{self.zoom_scale:.1f} | Platforms: {len(self.platforms)}"
+        if self.map_name: info = f"Map: {self.map_name} | " + info
+        if self.status_msg: info += f"\n{self.status_msg}"
+        if self.show_profile: info += f"\n{prof.hud_text()}"
+        self.canvas.itemconfig(self.hud_text_id, text=info)
+
+    def toggle_profile_hud(self):
+        """[신규] HUD의 프레임 시간 표시 켜기/끄기"""
+        self.show_profile = not self.show_profile
+        self.request_frame()
 
     def save_data(self):
-        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="map_data.json")
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="map_data.json",
+                                            filetypes=[("JSON files", "*.json"), ("Binary map", "*.mapb")])
         if path:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump({"platforms": self.platforms, "portals": self.portals, "spawns": self.spawns}, f, indent=4, ensure_ascii=False)
+            name = self.map_name or os.path.splitext(os.path.basename(path))[0]
+            meta = {"metadata": self.map_meta} if self.map_meta else {}
+            in_bundle = self.map_file is not None and os.path.abspath(path) == os.path.abspath(self.map_file.path)
+            if in_bundle:
+                self.map_file.save_map(name, self.stores, self.map_meta) # [신규] 번들 안의 이 맵만 교체
+            elif path.lower().endswith(".mapb"): # [신규] 바이너리 맵만 저장
+                write_bundle(path, {name: {**self.stores, **meta}})
+            else:
+                data = {**meta, "platforms": self.platforms.to_records(), "portals": self.portals.to_records(),
+                        "spawns": self.spawns.to_records()}
+                if len(self.ropes): data["ropes"] = self.ropes.to_records() # [신규] 밧줄은 있을 때만
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+                if Config.EXPORT_BINARY: # [신규] 매크로용 바이너리 사본 (맵 하나만 빠르게 로드)
+                    write_bundle(bundle_path_for(path), {name: {**self.stores, **meta}})
+            if Config.EXPORT_ROUTES: # [수정] 매크로용 경로 표 (번들이면 맵별 파일, 백그라운드에서 계산)
+                self._export_routes(routes_path_for(path, name if in_bundle and self.map_file.is_bundle else None))
+            if self.journal: self.journal.mark_saved()
             messagebox.showinfo("완료", "데이터가 저장되었습니다.")
 
+    def _export_routes(self, path):
+        """[신규] 현재 발판/포탈 스냅샷으로 경로 표를 백그라운드에서 저장"""
+        self.route_worker.submit(export_routes, path, self.platforms.to_records(), self.portals.to_records())
+        if not self._routes_polling:
+            self._routes_polling = True
+            self.root.after(Config.PREVIEW_POLL_MS, self._poll_routes)
+
+    def _poll_routes(self):
+        busy = self.route_worker.busy
+        result = self.route_worker.poll()
+        if result is not None:
+            n, err = result
+            if err is not None: self.status_msg = f"경로 표 저장 실패: {err}"
+            else: self.status_msg = f"경로 표 저장 완료 (발판 {n}개{', 묶음별 형식' if n > Config.ROUTE_EXPORT_MAX_PLATFORMS else ''})"
+            self.request_frame()
+        if busy: self.root.after(Config.PREVIEW_POLL_MS, self._poll_routes)
+        else: self._routes_polling = False
+
     def on_right_click(self, event):
         self.panning, self.last_mouse_pos = True, (event.x, event.y)
     
@@ -471,10 +1083,12 @@ class ImprovedMapEditor:
         if self.picking_exit:
             self.picking_exit = False
             self.portal_in_temp = (-1, -1)
-        elif self.portals: self.portals.pop()
-        elif self.platforms: self.platforms.pop()
-        elif self.spawns: self.spawns.pop()
-        self.redraw()
+            self._set_preview()
+        else: self._apply_changes(self.history.undo()) # [수정] 마지막 편집 단계를 역연산으로 취소
+
+    def redo_last(self):
+        """[신규] 되돌린 편집 다시 실행"""
+        self._apply_changes(self.history.redo())
 
     # main.py 내 ImprovedMapEditor 클래스에 추가할 메서드 예시
 
@@ -502,5 +1116,29 @@ def auto_detect(self):
 
     
 
+def main(argv=None):
+    """[신규] --trace: 종료 시 단계별 구간을 Chrome trace-event JSON으로 저장 (chrome://tracing, ui.perfetto.dev)
+    --profile: 세션 전체를 cProfile로 측정해 저장하고 누적 시간 상위 함수 출력"""
+    import argparse
+    parser = argparse.ArgumentParser(description=Config.TITLE)
+    parser.add_argument("--trace", metavar="PATH", help="단계별 구간 trace 저장 경로 (Chrome trace-event JSON)")
+    parser.add_argument("--profile", nargs="?", const="editor.prof", metavar="PATH",
+                        help="세션 전체를 cProfile로 측정해 저장 (기본 editor.prof)")
+    args = parser.parse_args(argv)
+    if not args.profile:
+        ImprovedMapEditor(args.trace)
+        return 0
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(ImprovedMapEditor, args.trace)
+    finally:
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+        print(f"프로파일 저장: {args.profile} (python -m pstats {args.profile} 로 다시 볼 수 있습니다)")
+    return 0
+
+
 if __name__ == "__main__":
-    ImprovedMapEditor()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,215 @@
+# map_binary.py
+"""[신규] 압축 바이너리 맵 형식 (.mapb) 읽기/쓰기.
+
+JSON(indent=4)을 통째로 파싱하지 않고도 매크로가 필요한 맵 하나만 메모리 맵으로 읽을 수 있게 합니다.
+
+파일 구조 (리틀 엔디언):
+    헤더     magic "MAPB", version u16, 예약 u16, 맵 개수 u32, 인덱스 오프셋 u64
+    맵 데이터 맵마다 이름(UTF-8) + 발판 int32[n,3] + 포탈 int32[n,4] + 스폰 int32[n,2] + 밧줄 int32[n,3]
+             + extras JSON (배열은 8바이트 정렬, extras는 고정 열 밖의 키/메타데이터가 있을 때만)
+    인덱스   맵마다 (이름, 발판, 포탈, 스폰, 밧줄, extras)의 (오프셋 u64, 개수/길이 u32)
+
+버전 1 파일(밧줄 없음)도 그대로 읽습니다. 이때 밧줄은 빈 배열입니다.
+
+사용 예:
+    python map_binary.py map_data.json              # → map_data.mapb
+    python map_binary.py map_data.mapb -o out.json  # 되돌리기
+"""
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from map_store import ItemStore, PlatformStore, PortalStore, RopeStore, SpawnStore, as_columns
+
+MAGIC = b"MAPB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIQ")
+KINDS = (("platforms", PlatformStore.FIELDS), ("portals", PortalStore.FIELDS), ("spawns", SpawnStore.FIELDS),
+         ("ropes", RopeStore.FIELDS))
+VERSION_KINDS = {1: 3, 2: 4}   # [신규] 버전별 저장된 종류 수 (KINDS 앞에서부터)
+INDEX_ENTRIES = {v: struct.Struct("<" + "QI" * (n + 2)) for v, n in VERSION_KINDS.items()}   # 이름, 종류들, extras
+INDEX_ENTRY = INDEX_ENTRIES[VERSION]
+EXT = ".mapb"
+
+
+def is_bundle(path):
+    """파일 앞 4바이트로 바이너리 맵인지 확인"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == MAGIC
+    except OSError:
+        return False
+
+
+def bundle_path_for(map_path):
+    """맵 JSON 경로 → 바이너리 사본 경로 (map.json → map.mapb)"""
+    return os.path.splitext(map_path)[0] + EXT
+
+
+def _extras_of(items, fields):
+    """항목별 고정 열 밖의 키 → {행 번호(문자열): dict} (없으면 빈 dict)"""
+    if isinstance(items, ItemStore): extras = items.extras_list()
+    else: extras = [{k: v for k, v in it.items() if k not in fields} for it in items]
+    return {str(r): extra for r, extra in enumerate(extras) if extra}
+
+
+def maps_from_json(data, name="map"):
+    """JSON 데이터 → {맵 이름: 맵 dict}.
+    save_data 형식({"platforms": [...], ...})은 맵 하나로, 지역 키 형식({"지역": [발판...]} 또는
+    {"지역": {"platforms": ...}})은 지역마다 맵 하나로 봅니다."""
+    if any(kind in data for kind, _ in KINDS): return {name: data}
+    return {key: (value if isinstance(value, dict) else {"platforms": value}) for key, value in data.items()}
+
+
+def write_bundle(path, maps):
+    """{맵 이름: 맵 dict(platforms/portals/spawns는 dict 목록 또는 ItemStore)}를 바이너리로 저장"""
+    entries = []
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+
+        def put(blob, align=1):
+            pad = -f.tell() % align
+            if pad: f.write(b"\0" * pad)
+            offset = f.tell()
+            f.write(blob)
+            return offset
+
+        for name, data in maps.items():
+            name_b = str(name).encode("utf-8")
+            entry = [put(name_b), len(name_b)]
+            extras = {k: v for k, v in data.items() if k not in dict(KINDS)}  # 메타데이터 등
+            for kind, fields in KINDS:
+                items = data.get(kind) or []
+                cols = np.ascontiguousarray(as_columns(items, fields), dtype="<i4")
+                entry += [put(cols.tobytes(), 8), len(cols)]
+                if (kind_extras := _extras_of(items, fields)): extras[kind] = kind_extras
+            blob = json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extras else b""
+            entry += [put(blob), len(blob)]
+            entries.append(entry)
+
+        index_offset = put(b"".join(INDEX_ENTRY.pack(*e) for e in entries), 8)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), index_offset))
+    os.replace(tmp, path)  # 쓰는 도중 실패해도 기존 파일은 그대로
+
+
+class MapBundle:
+    """바이너리 맵 읽기. 파일은 메모리 맵으로 열고, 헤더와 인덱스만 읽어 두었다가
+    요청한 맵의 배열만 복사 없이(읽기 전용 뷰) 꺼냅니다."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, count, index_offset = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC: raise ValueError(f"바이너리 맵 파일이 아닙니다: {path}")
+            if version not in INDEX_ENTRIES: raise ValueError(f"지원하지 않는 버전입니다: {version}")
+            self.version = version
+            self._kinds = VERSION_KINDS[version]
+            entry = INDEX_ENTRIES[version]
+            self._index = {}
+            for k in range(count):
+                e = entry.unpack_from(self._mm, index_offset + k * entry.size)
+                self._index[bytes(self._mm[e[0]:e[0] + e[1]]).decode("utf-8")] = e
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    def close(self):
+        if getattr(self, "_mm", None) is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # arrays()로 꺼낸 뷰가 남아 있으면 그 뷰가 사라질 때 해제됩니다.
+        self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def names(self):
+        return list(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def arrays(self, name):
+        """맵 하나의 {종류: int32 (n, k) 배열}. 파일을 닫기 전까지만 유효한 읽기 전용 뷰입니다.
+        이전 버전 파일에 없는 종류는 빈 배열입니다."""
+        e = self._index[name]
+        out = {}
+        for k, (kind, fields) in enumerate(KINDS):
+            if k >= self._kinds:
+                out[kind] = np.zeros((0, len(fields)), "<i4")
+                continue
+            offset, n = e[2 + 2 * k], e[3 + 2 * k]
+            out[kind] = np.frombuffer(self._mm, "<i4", n * len(fields), offset).reshape(n, len(fields))
+        return out
+
+    def extras(self, name):
+        """맵 하나의 extras (메타데이터 + 종류별 {행 번호: 추가 키})"""
+        offset, length = self._index[name][2 + 2 * self._kinds:4 + 2 * self._kinds]
+        return json.loads(bytes(self._mm[offset:offset + length]).decode("utf-8")) if length else {}
+
+    def fill_stores(self, name, stores):
+        """맵 하나를 {종류: ItemStore}에 바로 채움 (dict를 거치지 않음). 메타데이터 dict 반환"""
+        extras = self.extras(name)
+        for kind, cols in self.arrays(name).items():
+            rows = extras.pop(kind, {})
+            stores[kind].replace_columns(cols, [rows.get(str(r)) for r in range(len(cols))])
+        return extras
+
+    def load(self, name):
+        """맵 하나를 save_data JSON과 같은 dict 형식으로"""
+        extras = self.extras(name)
+        data = {}
+        for (kind, fields), cols in zip(KINDS, self.arrays(name).values()):
+            rows = extras.pop(kind, {})
+            if kind == "ropes" and not len(cols): continue   # 밧줄은 있을 때만 (기존 JSON 형식 유지)
+            data[kind] = [dict(zip(fields, vals)) for vals in cols.tolist()]
+            for r, extra in rows.items():
+                data[kind][int(r)].update(extra)
+        data.update(extras)
+        return data
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="맵 JSON ↔ 바이너리 맵(.mapb) 변환")
+    parser.add_argument("input", help="맵 JSON 또는 .mapb 파일")
+    parser.add_argument("-o", "--out", help="출력 경로 (기본: 확장자만 바꿈)")
+    args = parser.parse_args(argv)
+
+    if is_bundle(args.input):
+        out = args.out or os.path.splitext(args.input)[0] + ".json"
+        with MapBundle.open(args.input) as bundle:
+            maps = {name: bundle.load(name) for name in bundle.names}
+        data = next(iter(maps.values())) if len(maps) == 1 else maps  # 맵 하나면 save_data 형식
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+    else:
+        out = args.out or bundle_path_for(args.input)
+        with open(args.input, "r", encoding="utf-8") as f:
+            maps = maps_from_json(json.load(f), os.path.splitext(os.path.basename(args.input))[0])
+        write_bundle(out, maps)
+    print(f"{args.input} → {out} (맵 {len(maps)}개)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
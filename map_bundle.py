@@ -0,0 +1,209 @@
+# map_bundle.py
+"""[신규] 여러 맵을 담은 파일(번들) 모델.
+
+지원 형식:
+    단일 맵 JSON   {"metadata": {...}, "platforms": [...], "portals": [...], "spawns": [...], "ropes": [...]}
+    지역 번들 JSON {"지역 이름": [발판...]} 또는 {"지역 이름": {"platforms": ..., "metadata": ...}}
+    바이너리 맵     .mapb (map_binary)
+
+파일을 열 때는 맵 이름 색인만 만들고, 맵의 지형(발판/포탈/스폰 저장소)은 open_map()으로 열 때 만듭니다.
+[수정] 맵 하나만 읽는 지연 로드는 .mapb에서만 됩니다 (메모리 맵 + 맵별 오프셋 색인). JSON은 번들이어도 열 때
+통째로 파싱합니다: 최상위 키별 바이트 구간만 훑는 색인을 NumPy로 만들어 봐도 26MB 번들에서 0.48s로
+C 파서의 json.load(0.3s)보다 느리고 메모리도 더 썼기 때문입니다. 큰 지역 번들은
+`python map_binary.py region.json`으로 .mapb를 만들어 쓰세요 (WorldGraph.hint가 안내).
+포탈에 'target_map'이 있으면 출구 좌표(out_x, out_y)는 그 맵의 좌표이며, world_graph()는 맵별 포탈만
+읽어 지역 전체의 맵 간 연결 그래프를 만듭니다 (발판은 읽지 않음).
+"""
+import heapq
+import json
+import os
+
+from map_binary import MapBundle, bundle_path_for, is_bundle, maps_from_json, write_bundle
+from map_store import PlatformStore, PortalStore, RopeStore, SpawnStore
+
+KINDS = ("platforms", "portals", "spawns", "ropes")
+
+
+def new_stores():
+    return {"platforms": PlatformStore(), "portals": PortalStore(), "spawns": SpawnStore(), "ropes": RopeStore()}
+
+
+def portal_target(portal):
+    """다른 맵으로 가는 포탈이면 대상 맵 이름, 같은 맵 안의 포탈이면 None"""
+    return portal.get("target_map") or None
+
+
+class MapFile:
+    """맵 파일 하나의 색인. 형식(단일/지역 번들/바이너리)과 관계없이 맵 이름으로 접근합니다.
+    JSON은 열 때 전체를 파싱하고 맵별 변환만 미룹니다 (맵만 골라 읽기는 .mapb, 모듈 설명 참고)."""
+    def __init__(self, path):
+        self.path = path
+        self.binary = is_bundle(path)
+        self._bin = None
+        self._raw = None
+        self._single = False
+        self._list_form = set()   # 발판 리스트만 있던 지역 (저장 시 형식 유지)
+        if self.binary:
+            self._bin = MapBundle.open(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stem = os.path.splitext(os.path.basename(path))[0]
+            self._single = any(kind in data for kind in KINDS)
+            self._list_form = {k for k, v in data.items() if isinstance(v, list)} if not self._single else set()
+            self._raw = maps_from_json(data, (data.get("metadata") or {}).get("name", stem) if self._single else stem)
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    def close(self):
+        if self._bin is not None: self._bin.close()
+        self._bin = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def names(self):
+        return self._bin.names if self.binary else list(self._raw)
+
+    @property
+    def lazy(self):
+        """[신규] 맵을 열 때 그 맵만 읽는지 (.mapb만 해당)"""
+        return self.binary
+
+    @property
+    def is_bundle(self):
+        """[신규] 맵 여러 개를 담을 수 있는 파일인지 (단일 맵 JSON이 아니면 True)"""
+        return self.binary or not self._single
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in (self._bin if self.binary else self._raw)
+
+    def metadata(self, name):
+        if self.binary: return dict(self._bin.extras(name).get("metadata") or {})
+        return dict(self._raw[name].get("metadata") or {})
+
+    def load_into(self, name, stores):
+        """맵 하나의 지형을 저장소에 채우고 metadata 반환 (이때만 해당 맵을 변환)"""
+        if self.binary: return dict(self._bin.fill_stores(name, stores).get("metadata") or {})
+        m = self._raw[name]
+        for kind in KINDS:
+            stores[kind].replace(m.get(kind) or [])
+        return dict(m.get("metadata") or {})
+
+    def open_map(self, name):
+        """맵 하나를 새 저장소 묶음으로 열어 (stores, metadata) 반환"""
+        stores = new_stores()
+        return stores, self.load_into(name, stores)
+
+    def portals(self, name):
+        """맵 하나의 포탈 dict 목록 (발판은 읽지 않음)"""
+        if not self.binary: return list(self._raw[name].get("portals") or [])
+        cols = self._bin.arrays(name)["portals"].tolist()
+        extras = self._bin.extras(name).get("portals", {})
+        out = [dict(zip(PortalStore.FIELDS, vals)) for vals in cols]
+        for r, extra in extras.items(): out[int(r)].update(extra)
+        return out
+
+    def world_graph(self):
+        return WorldGraph.from_file(self)
+
+    def save_map(self, name, stores, metadata=None):
+        """맵 하나를 교체(없으면 추가)해 파일 전체를 다시 씀. 다른 맵은 원래 내용 그대로 옮깁니다."""
+        record = {"metadata": dict(metadata)} if metadata else {}
+        record.update((kind, stores[kind].to_records()) for kind in KINDS if kind != "ropes" or len(stores[kind]))
+        if self.binary:
+            maps = {n: (record if n == name else self._bin.load(n)) for n in self.names}
+            maps.setdefault(name, record)
+            self.close()   # 메모리 맵을 닫아야 교체할 수 있음 (Windows)
+            write_bundle(self.path, maps)
+            self._bin = MapBundle.open(self.path)
+            return
+        self._raw[name] = record
+        if self._single and len(self._raw) == 1:
+            data = record
+        else:
+            data = {}
+            for n, m in self._raw.items():
+                # 발판만 있던 지역은 원래처럼 리스트로 저장
+                plain = n in self._list_form and not any(m.get(k) for k in KINDS[1:]) and not m.get("metadata")
+                data[n] = m["platforms"] if plain else m
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class WorldGraph:
+    """맵 간 연결 그래프: 노드는 맵, 간선은 다른 맵을 가리키는 포탈."""
+    def __init__(self, names, links, hint=None):
+        self.names = list(names)
+        self.links = links   # 맵 이름 → [(포탈 인덱스, 대상 맵, (out_x, out_y))]
+        self.hint = hint     # [신규] 더 빠르게 쓰는 방법 안내 (JSON 지역 번들이면 .mapb 변환)
+
+    @classmethod
+    def from_file(cls, map_file):
+        links = {}
+        for name in map_file.names:
+            links[name] = [(i, portal_target(p), (p["out_x"], p["out_y"]))
+                           for i, p in enumerate(map_file.portals(name)) if portal_target(p)]
+        hint = None
+        if map_file.is_bundle and not map_file.lazy:
+            hint = (f"지역 번들 JSON은 열 때마다 전체를 파싱합니다. 'python map_binary.py {map_file.path}'로 "
+                    f"{bundle_path_for(map_file.path)}를 만들면 맵 하나만 읽습니다.")
+        return cls(map_file.names, links, hint)
+
+    def neighbors(self, name):
+        return [target for _, target, _ in self.links.get(name, ())]
+
+    def route(self, src, dst):
+        """src 맵 → dst 맵으로 가는 최소 포탈 경로 [(맵, 포탈 인덱스, 다음 맵, 도착 좌표)] (불가하면 None)"""
+        if src == dst: return []
+        parent = {src: None}
+        heap = [(0, src)]
+        while heap:
+            d, name = heapq.heappop(heap)
+            if name == dst: break
+            for i, target, out in self.links.get(name, ()):
+                if target in parent: continue
+                parent[target] = (name, i, target, out)
+                heapq.heappush(heap, (d + 1, target))
+        if dst not in parent: return None
+        steps = []
+        while parent[dst] is not None:
+            steps.append(parent[dst])
+            dst = parent[dst][0]
+        return steps[::-1]
+
+    def dangling(self):
+        """번들에 없는 맵을 가리키는 포탈 [(맵, 포탈 인덱스, 대상 맵)]"""
+        known = set(self.names)
+        return [(name, i, target) for name, items in self.links.items() for i, target, _ in items if target not in known]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="맵 번들 색인/맵 간 포탈 경로 확인")
+    parser.add_argument("path", help="맵 JSON(단일/지역 번들) 또는 .mapb")
+    parser.add_argument("--route", nargs=2, metavar=("SRC", "DST"), help="맵 간 포탈 경로 출력")
+    args = parser.parse_args()
+    with MapFile.open(args.path) as map_file:
+        world = map_file.world_graph()
+        for name in map_file.names:
+            print(f"{name}: 연결 {', '.join(world.neighbors(name)) or '-'}")
+        for name, i, target in world.dangling():
+            print(f"경고: {name} 포탈 #{i} → 번들에 없는 맵 '{target}'")
+        if world.hint: print(f"안내: {world.hint}")
+        if args.route:
+            steps = world.route(*args.route)
+            if steps is None: print("경로 없음")
+            for name, i, target, (x, y) in steps or ():
+                print(f"{name} 포탈 #{i} → {target} ({x}, {y})")
@@ -6,6 +6,8 @@ from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import os
 
+from jump_graph import JumpGraph
+
 class ImprovedMapEditor:
     def __init__(self):
         self.root = tk.Tk()
@@ -138,12 +140,13 @@ class ImprovedMapEditor:
         if self.orig_img is None: return
         self.curr_img = self.orig_img.copy()
         if self.show_paths:
-            for i, p1 in enumerate(self.platforms):
-                for j, p2 in enumerate(self.platforms):
-                    if i != j and self.check_jump(p1, p2):
-                        c1 = ((p1['x_start']+p1['x_end'])//2, p1['y'])
-                        c2 = ((p2['x_start']+p2['x_end'])//2, p2['y'])
-                        cv2.line(self.curr_img, c1, c2, (255, 120, 0), 1)
+            # [수정] 전체 쌍 비교 대신 y 스윕 기반 점프 그래프 사용
+            src, dst = JumpGraph(self.platforms).edges()
+            for i, j in zip(src.tolist(), dst.tolist()):
+                p1, p2 = self.platforms[i], self.platforms[j]
+                c1 = ((p1['x_start']+p1['x_end'])//2, p1['y'])
+                c2 = ((p2['x_start']+p2['x_end'])//2, p2['y'])
+                cv2.line(self.curr_img, c1, c2, (255, 120, 0), 1)
         for p in self.platforms:
             cv2.line(self.curr_img, (p['x_start'], p['y']), (p['x_end'], p['y']), (0, 255, 0), 2)
         self.temp_preview_img = self.curr_img.copy()
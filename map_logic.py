@@ -1,34 +1,55 @@
 import math
 
 class MapLogic:
+    # 점프 규칙 (픽셀): 겹친 발판은 위로 MIN_DY ~ MAX_DY, 옆 발판은 가로 MAX_DX / 세로 SIDE_DY 이내
+    JUMP_MIN_DY = 10
+    JUMP_MAX_DY = 55
+    JUMP_MAX_DX = 70
+    JUMP_SIDE_DY = 30
+
     @staticmethod
     def check_jump(p1, p2):
         """두 발판 사이의 점프 가능 여부 계산"""
         overlap = not (p1['x_end'] < p2['x_start'] or p1['x_start'] > p2['x_end'])
         dy = p1['y'] - p2['y']
         dx = min(abs(p1['x_start'] - p2['x_end']), abs(p1['x_end'] - p2['x_start']))
-        return (overlap and 10 < dy < 55) or (not overlap and dx < 70 and abs(dy) < 30)
+        return ((overlap and MapLogic.JUMP_MIN_DY < dy < MapLogic.JUMP_MAX_DY) or
+                (not overlap and dx < MapLogic.JUMP_MAX_DX and abs(dy) < MapLogic.JUMP_SIDE_DY))
 
     @staticmethod
-    def find_clicked_platform(platforms, rx, ry, tolerance=6):
-        """클릭한 위치의 발판 인덱스 반환"""
+    def find_clicked_platform(platforms, rx, ry, tolerance=6, index=None):
+        """클릭한 위치의 발판 인덱스 반환 (index가 있으면 공간 인덱스로 검색)"""
+        if index is not None: return index.hit(rx, ry, tolerance)
         for i, p in enumerate(platforms):
             if abs(ry - p['y']) < tolerance and p['x_start'] <= rx <= p['x_end']:
                 return i
         return None
     
     @staticmethod
-    def find_clicked_portal(portals, rx, ry, tolerance=10):
+    def find_clicked_portal(portals, rx, ry, tolerance=10, index=None):
         """클릭한 위치 근처의 포탈 인덱스 반환"""
+        if index is not None: return index.hit(rx, ry, tolerance)
         for i, p in enumerate(portals):
             if math.dist((rx, ry), (p['in_x'], p['in_y'])) < tolerance:
                 return i
         return None
 
     @staticmethod
-    def find_clicked_spawn(spawns, rx, ry, tolerance=10):
+    def find_clicked_spawn(spawns, rx, ry, tolerance=10, index=None):
         """[신규] 클릭한 위치 근처의 스폰 포인트 인덱스 반환"""
+        if index is not None: return index.hit(rx, ry, tolerance)
         for i, s in enumerate(spawns):
             if math.dist((rx, ry), (s['x'], s['y'])) < tolerance:
                 return i
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def find_clicked_rope(ropes, rx, ry, tolerance=6, index=None):
+        """[신규] 클릭한 위치의 밧줄/사다리 인덱스 반환 (가로 거리가 가장 가까운 것)"""
+        if index is not None: return index.hit(rx, ry, tolerance)
+        best = None
+        for i, r in enumerate(ropes):
+            d = abs(rx - r['x'])
+            if d < tolerance and r['y_top'] <= ry <= r['y_bottom'] and (best is None or d < best[0]):
+                best = (d, i)
+        return None if best is None else best[1]
@@ -0,0 +1,279 @@
+# map_renderer.py
+import cv2
+import numpy as np
+
+from app_config import Config
+
+# 레이어 합성 순서 (아래 → 위)
+LAYER_ORDER = ("paths", "platforms", "ropes", "candidates", "portals", "spawns", "hover", "selection", "preview")
+
+COLOR_SELECTED = (0, 0, 255)   # 선택된 항목은 빨간색
+COLOR_PLATFORM = (0, 255, 0)
+COLOR_PATH = (255, 120, 0)
+COLOR_SPAWN = (128, 0, 128)    # 보라색
+COLOR_ROPE = (0, 140, 255)     # 주황색
+COLOR_HOVER = (255, 255, 0)    # 마우스 아래 항목은 하늘색
+COLOR_CANDIDATE = (0, 200, 255) # 아직 적용하지 않은 감지 후보는 주황색
+
+# 바운딩 박스에 더해줄 여유 픽셀 (안티에일리어싱/끝점 캡 대비)
+_PAD = 2
+# dirty rect가 이보다 많으면 하나의 외곽 사각형으로 합쳐서 처리
+_MAX_DIRTY_RECTS = 32
+# 베이스 → 합성 버퍼 복사 단위 (행)
+_COPY_ROWS = 1024
+
+
+# --- 도형(primitive) 생성 함수 ---
+# 도형은 ('line'|'arrow'|'circle'|'text', ...) 형태의 튜플이며 해시 가능해야 합니다.
+
+def platform_prims(p, color=COLOR_PLATFORM, thickness=2):
+    return (("line", (p['x_start'], p['y']), (p['x_end'], p['y']), color, thickness),)
+
+def portal_prims(p, color=Config.COLOR_PORTAL_LINE):
+    if p.get('target_map'): # [신규] 다른 맵으로 가는 포탈: 출구는 이 맵 좌표가 아니므로 입구와 대상 맵 이름만
+        return (("circle", (p['in_x'], p['in_y']), 6, color, 2),
+                ("circle", (p['in_x'], p['in_y']), 4, (255, 0, 0), -1),
+                ("text", f"-> {p['target_map']}", (p['in_x'] + 8, p['in_y'] - 8), 0.4, (255, 255, 255), 1))
+    return (("arrow", (p['in_x'], p['in_y']), (p['out_x'], p['out_y']), color, 2),
+            ("circle", (p['in_x'], p['in_y']), 4, (255, 0, 0), -1))
+
+def spawn_prims(s, color=COLOR_SPAWN):
+    return (("circle", (s['x'], s['y']), 6, color, -1),
+            ("text", "SPAWN", (s['x'] - 20, s['y'] - 10), 0.5, (255, 255, 255), 1))
+
+def rope_prims(r, color=COLOR_ROPE):
+    """[신규] 밧줄/사다리: 세로선 + 양 끝 점"""
+    return (("line", (r['x'], r['y_top']), (r['x'], r['y_bottom']), color, 2),
+            ("circle", (r['x'], r['y_top']), 3, color, -1),
+            ("circle", (r['x'], r['y_bottom']), 3, color, -1))
+
+PRIM_BUILDERS = {"platforms": platform_prims, "portals": portal_prims, "spawns": spawn_prims, "ropes": rope_prims}
+
+def path_prims(p1, p2):
+    c1 = ((p1['x_start'] + p1['x_end']) // 2, p1['y'])
+    c2 = ((p2['x_start'] + p2['x_end']) // 2, p2['y'])
+    return (("line", c1, c2, COLOR_PATH, 1),)
+
+
+def prim_bbox(prim):
+    """도형이 칠할 수 있는 픽셀 영역 (x1, y1, x2, y2), x2/y2는 미포함"""
+    kind = prim[0]
+    if kind in ("line", "arrow"):
+        (ax, ay), (bx, by), _, t = prim[1:]
+        pad = t + _PAD
+        if kind == "arrow":  # 화살촉 길이 = 선 길이의 10%
+            pad += int(0.1 * np.hypot(bx - ax, by - ay)) + 1
+        return min(ax, bx) - pad, min(ay, by) - pad, max(ax, bx) + pad + 1, max(ay, by) + pad + 1
+    if kind == "circle":
+        (cx, cy), r, _, t = prim[1:]
+        pad = r + max(t, 1) + _PAD
+        return cx - pad, cy - pad, cx + pad + 1, cy + pad + 1
+    if kind == "text":
+        text, (ox, oy), scale, _, t = prim[1:]
+        (tw, th), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, t)
+        return ox - _PAD, oy - th - _PAD, ox + tw + _PAD + 1, oy + base + t + _PAD + 1
+    raise ValueError(f"알 수 없는 도형 종류: {kind}")
+
+
+def draw_prim(img, prim, ox=0, oy=0):
+    """(ox, oy)만큼 원점을 옮긴 img에 도형 하나를 그립니다."""
+    kind = prim[0]
+    if kind == "line":
+        (ax, ay), (bx, by), color, t = prim[1:]
+        cv2.line(img, (ax - ox, ay - oy), (bx - ox, by - oy), color, t)
+    elif kind == "arrow":
+        (ax, ay), (bx, by), color, t = prim[1:]
+        cv2.arrowedLine(img, (ax - ox, ay - oy), (bx - ox, by - oy), color, t)
+    elif kind == "circle":
+        (cx, cy), r, color, t = prim[1:]
+        cv2.circle(img, (cx - ox, cy - oy), r, color, t)
+    elif kind == "text":
+        text, (tx, ty), scale, color, t = prim[1:]
+        cv2.putText(img, text, (tx - ox, ty - oy), cv2.FONT_HERSHEY_SIMPLEX, scale, color, t)
+
+
+def _union(a, b):
+    if a is None: return b
+    if b is None: return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _items_bbox(prims):
+    box = None
+    for prim in prims:
+        box = _union(box, prim_bbox(prim))
+    return box
+
+
+class OverlayLayer:
+    """[신규] 오버레이 레이어: 항목별 도형 목록과 바운딩 박스를 캐시합니다."""
+    def __init__(self, name):
+        self.name = name
+        self.visible = True
+        self.items = []   # 항목별 도형 튜플
+        self.boxes = []   # 항목별 바운딩 박스 (빈 항목은 None)
+        self._box_arr = None
+
+    def bbox(self):
+        box = None
+        for b in self.boxes:
+            box = _union(box, b)
+        return box
+
+    def set_item(self, i, prims):
+        """i번째 항목을 교체(i == len 이면 추가)하고 바뀐 영역을 반환"""
+        prims = tuple(prims)
+        if i == len(self.items):
+            self.items.append(prims)
+            self.boxes.append(_items_bbox(prims))
+            self._box_arr = None
+            return self.boxes[-1]
+        if self.items[i] == prims:
+            return None
+        old = self.boxes[i]
+        self.items[i], self.boxes[i] = prims, _items_bbox(prims)
+        self._box_arr = None
+        return _union(old, self.boxes[i])
+
+    def remove_item(self, i):
+        self.items.pop(i)
+        self._box_arr = None
+        return self.boxes.pop(i)
+
+    def insert_item(self, i, prims):
+        """i 위치에 항목을 끼워 넣고 그 영역을 반환 (되돌리기로 삭제를 취소할 때)"""
+        prims = tuple(prims)
+        self.items.insert(i, prims)
+        self.boxes.insert(i, _items_bbox(prims))
+        self._box_arr = None
+        return self.boxes[i]
+
+    def set_items(self, items):
+        """전체 항목을 교체하고 실제로 바뀐 항목들의 영역 목록을 반환"""
+        dirty = []
+        n = len(items)
+        while len(self.items) > n:
+            box = self.remove_item(len(self.items) - 1)
+            if box: dirty.append(box)
+        for i, prims in enumerate(items):
+            box = self.set_item(i, prims)
+            if box: dirty.append(box)
+        return dirty
+
+    def query(self, rect):
+        """rect와 겹치는 항목 인덱스 (벡터화된 박스 검사)"""
+        if self._box_arr is None:
+            self._box_arr = np.array([b if b else (0, 0, 0, 0) for b in self.boxes], np.int64).reshape(-1, 4)
+        b = self._box_arr
+        x1, y1, x2, y2 = rect
+        hit = (b[:, 0] < x2) & (b[:, 2] > x1) & (b[:, 1] < y2) & (b[:, 3] > y1)
+        return np.flatnonzero(hit)
+
+
+class LayeredRenderer:
+    """[신규] 불변 베이스 이미지 + 오버레이 레이어 합성기.
+    변경된 영역(dirty rect)만 베이스에서 복원한 뒤 해당 영역의 도형만 다시 그립니다."""
+    def __init__(self):
+        self.base = None
+        self.frame = None
+        self.h, self.w = 0, 0
+        self.version = 0
+        self.layers = {name: OverlayLayer(name) for name in LAYER_ORDER}
+        self._dirty = []
+        self.listeners = []   # 프레임 변경 콜백: f(rects), 베이스 교체 시 f(None)
+
+    def set_base(self, img, frame=None):
+        """베이스 이미지 교체 (합성 버퍼는 이때 한 번만 복사).
+        frame을 주면 해당 버퍼(예: 메모리 맵)를 합성 버퍼로 사용합니다."""
+        self.base = img
+        if self.base.flags.writeable: self.base.setflags(write=False)
+        self.h, self.w = img.shape[:2]
+        self.frame = np.empty_like(img) if frame is None else frame
+        for y in range(0, self.h, _COPY_ROWS):  # 큰 이미지도 조금씩 복사해 최대 메모리를 제한
+            self.frame[y:y + _COPY_ROWS] = img[y:y + _COPY_ROWS]
+        self.layers = {name: OverlayLayer(name) for name in LAYER_ORDER}
+        self._dirty = []
+        self.version += 1
+        for listener in self.listeners: listener(None)
+
+    def mark_dirty(self, rect):
+        if rect is None: return
+        x1, y1, x2, y2 = max(0, rect[0]), max(0, rect[1]), min(self.w, rect[2]), min(self.h, rect[3])
+        if x1 < x2 and y1 < y2:
+            self._dirty.append((x1, y1, x2, y2))
+
+    def set_visible(self, name, visible):
+        layer = self.layers[name]
+        if layer.visible != visible:
+            layer.visible = visible
+            self.mark_dirty(layer.bbox())
+
+    def set_items(self, name, items):
+        layer = self.layers[name]
+        for box in layer.set_items(items):
+            if layer.visible: self.mark_dirty(box)
+
+    def set_item(self, name, i, prims):
+        layer = self.layers[name]
+        box = layer.set_item(i, prims)
+        if layer.visible: self.mark_dirty(box)
+
+    def remove_item(self, name, i):
+        layer = self.layers[name]
+        box = layer.remove_item(i)
+        if layer.visible: self.mark_dirty(box)
+
+    def insert_item(self, name, i, prims):
+        layer = self.layers[name]
+        box = layer.insert_item(i, prims)
+        if layer.visible: self.mark_dirty(box)
+
+    def _merged_dirty(self):
+        rects = self._dirty
+        self._dirty = []
+        if len(rects) > _MAX_DIRTY_RECTS:
+            box = None
+            for r in rects: box = _union(box, r)
+            return [box]
+        # 겹치는 사각형끼리 병합
+        merged = []
+        for r in sorted(rects):
+            for k, m in enumerate(merged):
+                if r[0] < m[2] and r[2] > m[0] and r[1] < m[3] and r[3] > m[1]:
+                    merged[k] = _union(m, r)
+                    break
+            else:
+                merged.append(r)
+        return merged
+
+    def render(self):
+        """누적된 dirty rect만 다시 합성하고 갱신된 영역 목록을 반환"""
+        if self.frame is None or not self._dirty: return []
+        rects = self._merged_dirty()
+        for rect in rects:
+            self._composite(rect)
+        self.version += 1
+        for listener in self.listeners: listener(rects)
+        return rects
+
+    def _composite(self, rect):
+        x1, y1, x2, y2 = rect
+        hits = []
+        ex1, ey1, ex2, ey2 = rect
+        for name in LAYER_ORDER:
+            layer = self.layers[name]
+            if not layer.visible: continue
+            for i in layer.query(rect):
+                hits.append(layer.items[i])
+                b = layer.boxes[i]
+                ex1, ey1, ex2, ey2 = min(ex1, b[0]), min(ey1, b[1]), max(ex2, b[2]), max(ey2, b[3])
+        if not hits:
+            self.frame[y1:y2, x1:x2] = self.base[y1:y2, x1:x2]
+            return
+        # 도형이 잘리지 않도록 걸친 도형 전체를 포함하는 영역에 그린 뒤 dirty 부분만 옮겨 담습니다.
+        ex1, ey1, ex2, ey2 = max(0, ex1), max(0, ey1), min(self.w, ex2), min(self.h, ey2)
+        scratch = self.base[ey1:ey2, ex1:ex2].copy()
+        for prims in hits:
+            for prim in prims:
+                draw_prim(scratch, prim, ex1, ey1)
+        self.frame[y1:y2, x1:x2] = scratch[y1 - ey1:y2 - ey1, x1 - ex1:x2 - ex1]
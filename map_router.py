@@ -0,0 +1,247 @@
+# map_router.py
+import heapq
+import json
+import math
+import os
+
+import numpy as np
+
+from app_config import Config
+from jump_graph import JumpGraph
+from map_store import as_columns
+
+
+def platform_under(platforms, x, y, tolerance=6, max_drop=None):
+    """(x, y) 지점에서 아래로 가장 가까운 발판 인덱스 (발 밑 발판 찾기)"""
+    max_drop = Config.ROUTE_SNAP_DROP if max_drop is None else max_drop
+    cols = as_columns(platforms, ("y", "x_start", "x_end"))
+    dy = cols[:, 0] - y
+    ok = np.flatnonzero((cols[:, 1] <= x) & (x <= cols[:, 2]) & (-tolerance <= dy) & (dy <= max_drop))
+    if len(ok) == 0: return None
+    return int(ok[np.argmin(np.abs(dy[ok]))])  # 거리가 같으면 앞쪽 인덱스
+
+
+def path_from_table(next_hop, src, dst):
+    """다음 경유지 표로 src → dst 발판 경로 복원 (도달 불가면 None). next_hop은 n x n 표 또는 RouteTable"""
+    if next_hop[src][dst] < 0: return None
+    path = [src]
+    while path[-1] != dst:
+        path.append(int(next_hop[path[-1]][dst]))
+    return path
+
+
+class MapRouter:
+    """[신규] 발판/포탈 경로 탐색기.
+    노드는 발판, 간선은 점프 그래프(MapLogic.check_jump)와 포탈(순간이동)입니다."""
+    def __init__(self, platforms, portals=(), jump_graph=None):
+        self.platforms = platforms
+        self.n = len(platforms)
+        graph = jump_graph if jump_graph is not None else JumpGraph(platforms)
+        src, dst = graph.edges()
+        cols = as_columns(platforms, ("y", "x_start", "x_end"))
+        self.centers = np.column_stack(((cols[:, 1] + cols[:, 2]) / 2, cols[:, 0])).astype(float)
+        cost = np.hypot(*(self.centers[dst] - self.centers[src]).T) if len(src) else np.empty(0)
+
+        # 포탈: 입구 발밑 발판 → 출구 발밑 발판
+        p_src, p_dst = [], []
+        for portal in portals:
+            if portal.get('target_map'): continue  # 다른 맵으로 가는 포탈은 맵 간 그래프(map_bundle.WorldGraph)에서 다룸
+            a = platform_under(platforms, portal['in_x'], portal['in_y'])
+            b = platform_under(platforms, portal['out_x'], portal['out_y'])
+            if a is not None and b is not None and a != b:
+                p_src.append(a); p_dst.append(b)
+        self.has_portals = bool(p_src)
+
+        self.adj = [[] for _ in range(self.n)]   # 노드별 (이웃, 비용, 종류)
+        for a, b, c in zip(src.tolist(), dst.tolist(), cost.tolist()):
+            self.adj[a].append((b, c, "jump"))
+        for a, b in zip(p_src, p_dst):
+            self.adj[a].append((b, Config.ROUTE_PORTAL_COST, "portal"))
+
+    def _heuristic(self, dst):
+        # 포탈은 거리와 무관하게 싸므로 있으면 휴리스틱을 쓰지 않습니다 (Dijkstra).
+        if self.has_portals: return lambda v: 0.0
+        cx, cy = self.centers[dst]
+        return lambda v: math.hypot(self.centers[v][0] - cx, self.centers[v][1] - cy)
+
+    def _search(self, src, dst=None):
+        """A*/Dijkstra. dst가 없으면 모든 노드까지 탐색해 (비용, 부모, 확정 순서)를 반환"""
+        h = self._heuristic(dst) if dst is not None else (lambda v: 0.0)
+        dist = {src: 0.0}
+        parent = {src: -1}
+        order = []
+        heap = [(h(src), 0.0, src)]
+        done = set()
+        while heap:
+            _, d, v = heapq.heappop(heap)
+            if v in done: continue
+            done.add(v)
+            order.append(v)
+            if v == dst: break
+            for w, c, _ in self.adj[v]:
+                nd = d + c
+                if nd < dist.get(w, math.inf):
+                    dist[w], parent[w] = nd, v
+                    heapq.heappush(heap, (nd + h(w), nd, w))
+        return dist, parent, order
+
+    def shortest_path(self, src, dst):
+        """src → dst 발판 경로와 비용 (도달 불가면 (None, inf))"""
+        dist, parent, _ = self._search(src, dst)
+        if dst not in dist: return None, math.inf
+        path = [dst]
+        while path[-1] != src:
+            path.append(parent[path[-1]])
+        return path[::-1], dist[dst]
+
+    def next_hop_row(self, s, out=None):
+        """[신규] 출발 발판 s 한 줄의 다음 경유 발판 (도달 불가 -1). 큰 맵은 표 대신 필요한 줄만 계산"""
+        first = np.full(self.n, -1, np.int32) if out is None else out
+        _, parent, order = self._search(s)
+        first[s] = s
+        for v in order[1:]:  # 확정 순서대로면 부모가 항상 먼저 처리됩니다.
+            first[v] = v if parent[v] == s else first[parent[v]]
+        return first
+
+    def next_hop_table(self):
+        """모든 (출발, 도착) 쌍의 다음 경유 발판 표 (n x n, 도달 불가 -1, 도착지 자신은 그대로)"""
+        table = np.full((self.n, self.n), -1, np.int32)
+        for s in range(self.n):
+            self.next_hop_row(s, table[s])
+        return table
+
+    def components(self):
+        """[신규] 간선 방향을 무시한 연결 묶음 번호 (발판별). 다른 묶음 사이는 도달 불가"""
+        parent = list(range(self.n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        for a, edges in enumerate(self.adj):
+            for b, _, _ in edges: parent[find(a)] = find(b)
+        roots = {}
+        return np.array([roots.setdefault(find(v), len(roots)) for v in range(self.n)], np.int32)
+
+    def compact_routes(self, max_table=None):
+        """[신규] 큰 맵용 묶음별 경로 데이터 (version 2). 묶음이 max_table개 이하면 그 묶음만의 다음 경유지 표,
+        넘으면 표 대신 묶음의 경로 그래프(CSR: offsets/targets/costs)를 저장하고 읽는 쪽(RouteTable)이 필요한 줄만 계산.
+        표/그래프 안의 번호는 묶음 안 순번이고, 다음 경유지 값은 전체 발판 번호입니다."""
+        max_table = Config.ROUTE_EXPORT_MAX_PLATFORMS if max_table is None else max_table
+        comp = self.components()
+        members = [[] for _ in range(int(comp.max()) + 1 if self.n else 0)]
+        for v, c in enumerate(comp.tolist()): members[c].append(v)
+        out = []
+        for nodes in members:
+            local = {v: k for k, v in enumerate(nodes)}
+            if len(nodes) <= max_table:
+                rows = []
+                for s in nodes:
+                    row = self.next_hop_row(s, np.full(self.n, -1, np.int32))
+                    rows.append(row[nodes].tolist())
+                out.append({"platforms": nodes, "next_hop": rows})
+            else:
+                offsets, targets, costs = [0], [], []
+                for v in nodes:
+                    targets.extend(local[w] for w, _, _ in self.adj[v])
+                    costs.extend(round(c, 2) for _, c, _ in self.adj[v])
+                    offsets.append(len(targets))
+                out.append({"platforms": nodes, "graph": {"offsets": offsets, "targets": targets, "costs": costs}})
+        return {"version": 2, "platform_count": self.n, "component": comp.tolist(), "components": out}
+
+    def export(self, path):
+        """맵 JSON 옆에 경로 표 저장 (매크로는 next_hop[a][b]만 조회하면 됨).
+        [수정] 임시 파일에 쓴 뒤 교체하므로 도중에 멈춰도 이전 표가 깨지지 않습니다.
+        [수정] 발판이 Config.ROUTE_EXPORT_MAX_PLATFORMS보다 많으면 n x n 표 대신 묶음별 형식(compact_routes).
+        저장한 데이터를 반환 (읽을 때는 load_routes)"""
+        if self.n > Config.ROUTE_EXPORT_MAX_PLATFORMS: data = self.compact_routes()
+        else: data = {"version": 1, "platform_count": self.n, "next_hop": self.next_hop_table().tolist()}
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return data
+
+
+class RouteTable:
+    """[신규] 묶음별 경로 데이터(version 2)를 n x n 표처럼 조회 (table[a][b]).
+    줄은 처음 조회할 때 펼치며, 그래프로 저장된 묶음은 그 줄만 Dijkstra로 계산해 둡니다."""
+    def __init__(self, data):
+        self.n = data["platform_count"]
+        self.component = np.array(data["component"], np.int32)
+        self.components = data["components"]
+        self.position = np.zeros(self.n, np.int32)   # 묶음 안 순번
+        for c in self.components: self.position[c["platforms"]] = np.arange(len(c["platforms"]))
+        self._rows = {}
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, s):
+        if s not in self._rows:
+            c = self.components[self.component[s]]
+            nodes = np.array(c["platforms"], np.int32)
+            row = np.full(self.n, -1, np.int32)
+            if "next_hop" in c: row[nodes] = c["next_hop"][self.position[s]]
+            else: row[nodes] = self._graph_row(c["graph"], nodes, int(self.position[s]))
+            self._rows[s] = row
+        return self._rows[s]
+
+    @staticmethod
+    def _graph_row(graph, nodes, src):
+        """묶음 그래프에서 src(묶음 안 순번)의 다음 경유 발판 (전체 번호, 도달 불가 -1)"""
+        offsets, targets, costs = graph["offsets"], graph["targets"], graph["costs"]
+        first = np.full(len(nodes), -1, np.int32)
+        dist = {src: 0.0}
+        first[src] = nodes[src]
+        heap = [(0.0, src)]
+        done = set()
+        while heap:
+            d, v = heapq.heappop(heap)
+            if v in done: continue
+            done.add(v)
+            for k in range(offsets[v], offsets[v + 1]):
+                w, nd = targets[k], d + costs[k]
+                if nd < dist.get(w, math.inf):
+                    dist[w] = nd
+                    first[w] = nodes[w] if v == src else first[v]
+                    heapq.heappush(heap, (nd, w))
+        return first
+
+
+def load_routes(path):
+    """[신규] 경로 표 파일 → table[a][b]로 조회할 수 있는 표 (version 1은 n x n 목록, 2는 RouteTable)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data["next_hop"] if data.get("version", 1) == 1 else RouteTable(data)
+
+
+def routes_path_for(map_path, map_name=None):
+    """맵 파일 경로 → 경로 표 파일 경로 (map.json → map.routes.json).
+    [수정] 번들 안의 맵은 맵마다 따로 (region.json, "A" → region.A.routes.json)"""
+    stem = os.path.splitext(map_path)[0]
+    return f"{stem}.{map_name}.routes.json" if map_name else stem + ".routes.json"
+
+
+def export_routes(path, platforms, portals=()):
+    """[신규] 저장 시 경로 표 내보내기 (백그라운드 스레드용: 스냅샷으로 점프 그래프부터 새로 만듦).
+    [수정] 큰 맵도 생략하지 않고 묶음별 형식으로 저장 (MapRouter.export). 발판 수 반환"""
+    router = MapRouter(platforms, portals)
+    router.export(path)
+    return router.n
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="맵 JSON에서 경로 표(.routes.json) 생성")
+    parser.add_argument("maps", nargs="+", help="save_data 형식 맵 JSON 파일")
+    args = parser.parse_args()
+    for map_path in args.maps:
+        with open(map_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        router = MapRouter(data.get('platforms', []), data.get('portals', []))
+        out = routes_path_for(map_path)
+        data = router.export(out)
+        kind = "n x n 표" if data["version"] == 1 else f"묶음 {len(data['components'])}개"
+        print(f"{map_path}: 발판 {router.n}개, {kind} → {out}")
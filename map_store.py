@@ -0,0 +1,265 @@
+# map_store.py
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+def as_columns(items, fields):
+    """ItemStore 또는 dict 목록 → (n, len(fields)) int64 배열 (인덱스/그래프/병합용 일괄 변환)"""
+    if isinstance(items, ItemStore): return items.columns(*fields)
+    if isinstance(items, np.ndarray): return items  # 이미 변환된 배열 (같은 fields 순서)
+    return np.array([[it[f] for f in fields] for it in items], np.int64).reshape(-1, len(fields))
+
+
+class ItemView(MutableMapping):
+    """[신규] 저장소의 항목 하나를 dict처럼 다루는 얇은 뷰 (ui_widgets 편집기/키보드 미세조정용).
+    안정 id로 묶여 있어 다른 항목이 삭제되어 행 위치가 바뀌어도 같은 항목을 가리킵니다."""
+    __slots__ = ("store", "id")
+
+    def __init__(self, store, item_id):
+        self.store = store
+        self.id = item_id
+
+    def __getitem__(self, key):
+        return self.store.get_field(self.store.row_of(self.id), key)
+
+    def __setitem__(self, key, value):
+        self.store.set_field(self.store.row_of(self.id), key, value)
+
+    def __delitem__(self, key):
+        if key in self.store.FIELDS: raise KeyError(f"필수 필드는 삭제할 수 없습니다: {key}")
+        del self.store.extras_of(self.store.row_of(self.id), create=True)[key]
+
+    def __iter__(self):
+        yield from self.store.FIELDS
+        yield from (self.store.extras_of(self.store.row_of(self.id)) or {})
+
+    def __len__(self):
+        return len(self.store.FIELDS) + len(self.store.extras_of(self.store.row_of(self.id)) or {})
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class ItemStore:
+    """[신규] 맵 항목(발판/포탈/스폰) 열 기반 저장소.
+    좌표는 NumPy 구조화 배열의 int32 열로, 그 밖의 키(설명 등)는 항목별 extras dict로 보관합니다.
+    리스트처럼 len/인덱싱/append/pop을 지원하며 인덱싱하면 dict 호환 ItemView를 돌려줍니다.
+    렌더/인덱스/그래프/저장 같은 일괄 처리는 columns()/to_records()로 열 단위로 처리합니다."""
+    FIELDS = ()
+
+    def __init__(self, items=()):
+        self.dtype = np.dtype([("id", np.int64)] + [(f, np.int32) for f in self.FIELDS])
+        self._next_id = 0
+        self.clear()
+        if items: self.extend(items)
+
+    # --- 내부 ---
+    def _reserve(self, n):
+        if n <= len(self._data): return
+        grown = np.zeros(max(n, 2 * len(self._data), 16), self.dtype)
+        grown[:self._n] = self._data[:self._n]
+        self._data = grown
+
+    def _pack(self, items):
+        """dict 목록 → (구조화 배열, extras 목록)"""
+        items = list(items)
+        arr = np.zeros(len(items), self.dtype)
+        for f in self.FIELDS:
+            arr[f] = [it[f] for it in items]
+        extras = []
+        for it in items:
+            extra = {k: v for k, v in it.items() if k not in self.FIELDS}
+            extras.append(extra or None)
+        arr["id"] = np.arange(self._next_id, self._next_id + len(items))
+        self._next_id += len(items)
+        return arr, extras
+
+    def row_of(self, item_id):
+        """안정 id → 현재 행 번호"""
+        if self._rows is None:
+            self._rows = {int(i): r for r, i in enumerate(self._data["id"][:self._n].tolist())}
+        try:
+            return self._rows[item_id]
+        except KeyError:
+            raise KeyError(f"삭제된 항목입니다 (id={item_id})") from None
+
+    def get_field(self, row, key):
+        if key in self.FIELDS: return int(self._data[key][row])
+        extra = self._extras[row]
+        if extra is None or key not in extra: raise KeyError(key)
+        return extra[key]
+
+    def set_field(self, row, key, value):
+        if key in self.FIELDS: self._data[key][row] = int(value)
+        else: self.extras_of(row, create=True)[key] = value
+
+    def extras_of(self, row, create=False):
+        if create and self._extras[row] is None: self._extras[row] = {}
+        return self._extras[row]
+
+    # --- 리스트 호환 ---
+    def __len__(self):
+        return self._n
+
+    def __bool__(self):
+        return self._n > 0
+
+    def _row(self, i):
+        if i < 0: i += self._n
+        if not 0 <= i < self._n: raise IndexError(f"항목 인덱스 범위 밖: {i}")
+        return i
+
+    def __getitem__(self, i):
+        return ItemView(self, int(self._data["id"][self._row(i)]))
+
+    def __iter__(self):
+        for item_id in self.ids.tolist():
+            yield ItemView(self, item_id)
+
+    def append(self, item):
+        self.insert(self._n, item)
+
+    def extend(self, items):
+        arr, extras = self._pack(items)
+        self._reserve(self._n + len(arr))
+        self._data[self._n:self._n + len(arr)] = arr
+        self._extras.extend(extras)
+        if self._rows is not None:
+            self._rows.update((int(i), self._n + k) for k, i in enumerate(arr["id"].tolist()))
+        self._n += len(arr)
+
+    def insert(self, i, item):
+        i = min(max(i + self._n if i < 0 else i, 0), self._n)
+        arr, extras = self._pack([item])
+        self._reserve(self._n + 1)
+        self._data[i + 1:self._n + 1] = self._data[i:self._n]
+        self._data[i] = arr[0]
+        self._extras.insert(i, extras[0])
+        self._n += 1
+        self._rows = None if i < self._n - 1 else self._rows
+        if self._rows is not None: self._rows[int(arr["id"][0])] = i
+
+    def pop(self, i=-1):
+        """i번째 항목을 빼고 일반 dict로 반환"""
+        i = self._row(i)
+        record = self.record(i)
+        self._data[i:self._n - 1] = self._data[i + 1:self._n]
+        self._extras.pop(i)
+        self._n -= 1
+        self._rows = None
+        return record
+
+    def clear(self):
+        self._data = np.zeros(0, self.dtype)
+        self._extras = []
+        self._n = 0
+        self._rows = None
+
+    def replace(self, items):
+        """전체 교체 (JSON 불러오기)"""
+        self.clear()
+        self.extend(items)
+
+    def replace_columns(self, cols, extras=None):
+        """(n, len(FIELDS)) 정수 배열로 전체 교체 (바이너리 맵 불러오기, dict를 거치지 않음)"""
+        n = len(cols)
+        self.clear()
+        self._reserve(n)
+        for k, f in enumerate(self.FIELDS):
+            self._data[f][:n] = cols[:, k]
+        self._data["id"][:n] = np.arange(self._next_id, self._next_id + n)
+        self._next_id += n
+        self._extras = [dict(e) if e else None for e in extras] if extras is not None else [None] * n
+        self._n = n
+
+    # --- 행 단위 델타 (되돌리기 기록용, id와 extras를 그대로 보존) ---
+    def rows_at(self, rows):
+        """행 번호 목록의 (구조화 배열 사본, extras 사본)"""
+        rows = np.asarray(rows, np.int64)
+        return self._data[rows], [dict(self._extras[r]) if self._extras[r] else None for r in rows.tolist()]
+
+    def put_rows(self, rows, data, extras):
+        """rows_at()으로 떠 둔 값을 같은 행들에 되돌려 씀 (id 포함)"""
+        rows = np.asarray(rows, np.int64)
+        self._data[rows] = data
+        for r, extra in zip(rows.tolist(), extras):
+            self._extras[r] = dict(extra) if extra else None
+        self._rows = None
+
+    def restore(self, i, data, extras):
+        """rows_at()으로 떠 둔 행들을 i 위치에 다시 끼워 넣음 (삭제 되돌리기/추가 다시 실행)"""
+        n = len(data)
+        self._reserve(self._n + n)
+        self._data[i + n:self._n + n] = self._data[i:self._n]
+        self._data[i:i + n] = data
+        self._extras[i:i] = [dict(extra) if extra else None for extra in extras]
+        self._n += n
+        self._rows = None
+
+    def delete(self, i, n=1):
+        """i부터 n개 행 삭제"""
+        self._data[i:self._n - n] = self._data[i + n:self._n]
+        del self._extras[i:i + n]
+        self._n -= n
+        self._rows = None
+
+    # --- 일괄 접근 ---
+    @property
+    def ids(self):
+        return self._data["id"][:self._n]
+
+    def column(self, field):
+        """열 하나 (읽기 전용으로 쓸 것)"""
+        return self._data[field][:self._n]
+
+    def columns(self, *fields):
+        """여러 열을 (n, k) int64 배열로"""
+        fields = fields or self.FIELDS
+        out = np.empty((self._n, len(fields)), np.int64)
+        for k, f in enumerate(fields):
+            out[:, k] = self._data[f][:self._n]
+        return out
+
+    def record(self, i):
+        """i번째 항목을 일반 dict로"""
+        rec = {f: int(self._data[f][i]) for f in self.FIELDS}
+        if self._extras[i]: rec.update(self._extras[i])
+        return rec
+
+    def copy(self):
+        """독립된 사본 (자동 저장 스냅샷용, 열은 배열 복사 한 번)"""
+        other = type(self)()
+        other._data = self._data[:self._n].copy()
+        other._extras = [dict(e) if e else None for e in self._extras]
+        other._n, other._next_id = self._n, self._next_id
+        return other
+
+    def extras_list(self):
+        """항목별 extras (없으면 None) 목록"""
+        return list(self._extras)
+
+    def to_records(self):
+        """전체를 일반 dict 목록으로 (JSON 저장/렌더용, 열 단위 tolist로 변환)"""
+        cols = [self._data[f][:self._n].tolist() for f in self.FIELDS]
+        records = [dict(zip(self.FIELDS, vals)) for vals in zip(*cols)] if cols else []
+        for rec, extra in zip(records, self._extras):
+            if extra: rec.update(extra)
+        return records
+
+
+class PlatformStore(ItemStore):
+    FIELDS = ("y", "x_start", "x_end")
+
+
+class PortalStore(ItemStore):
+    FIELDS = ("in_x", "in_y", "out_x", "out_y")
+
+
+class SpawnStore(ItemStore):
+    FIELDS = ("x", "y")
+
+
+class RopeStore(ItemStore):
+    """[신규] 밧줄/사다리 (세로 구간)"""
+    FIELDS = ("x", "y_top", "y_bottom")
@@ -0,0 +1,214 @@
+# minimap_locator.py
+"""[신규] 실시간 미니맵 위치 추적.
+
+roi_selector.py가 저장한 ROI(roi_config.json)를 매 프레임 캡처해 캐릭터 표시(노란 점)를 찾고,
+에디터 좌표(기준 맵 이미지 좌표)로 바꾼 뒤 맵 JSON의 발밑 발판에 붙입니다.
+
+    1. 정합: ROI 프레임이 기준 맵(에디터에 불러온 이미지)의 어디인지 템플릿 매칭으로 한 번 찾음
+    2. 유지: LOCATE_VERIFY_EVERY 프레임마다 위상 상관으로 어긋남만 확인 (어긋났으면 다시 정합)
+    3. 표시 찾기: 직전 위치 주변만 HSV 색 마스크로 검사하고, 없을 때만 ROI 전체를 검사.
+       기준 맵에서 이미 표시 색인 픽셀(노란 지형 등)은 빼고, 후보가 여럿이면 직전 위치에 가장 가까운 것
+    4. 발판: 미리 배열로 바꿔 둔 발판에서 발밑 발판 선택 (map_router.platform_under)
+
+사용 예:
+    python minimap_locator.py --map Asteria_1.json --base minimap_base.png             # 게임 창
+    python minimap_locator.py --source video:record.mp4 --map Asteria_1.json --base map_base.png --bench out.json
+"""
+import argparse
+import json
+import sys
+
+import cv2
+import numpy as np
+
+from app_config import Config
+from capture_source import FpsMeter, WindowCapture, open_source
+from image_store import decode_image
+from map_bundle import MapFile
+from map_router import platform_under
+from map_store import as_columns
+
+
+def load_roi(path='roi_config.json'):
+    """roi_config.json → 화면 좌표 (left, top, width, height)"""
+    with open(path, 'r') as f:
+        roi = json.load(f)
+    return roi['left'], roi['top'], roi['width'], roi['height']
+
+
+class MinimapLocator:
+    """ROI 프레임 → 에디터 좌표 위치. 프레임마다 locate()를 부릅니다."""
+    def __init__(self, base, platforms=(), offset=None):
+        self.base_gray = cv2.cvtColor(base, cv2.COLOR_BGR2GRAY) if base.ndim == 3 else base
+        self.platforms = as_columns(platforms, ("y", "x_start", "x_end"))   # 프레임마다 변환하지 않도록 미리
+        self.offset = offset      # ROI 프레임 (0, 0)의 기준 맵 좌표 (None이면 첫 프레임에서 정합)
+        self.score = None         # 마지막 정합 점수
+        self.last = None          # 직전 표시 위치 (ROI 좌표)
+        self.frames = 0
+        self.registrations = 0
+        self._ref = None          # 위상 상관 기준 프레임 (float32)
+        self._window = None
+        self._lo = np.array(Config.LOCATE_MARKER_HSV_LO, np.uint8)
+        self._hi = np.array(Config.LOCATE_MARKER_HSV_HI, np.uint8)
+        # [신규] 기준 맵에 원래 있는 표시 색 픽셀 (정지한 노란 지형이 표시로 잡히지 않게 프레임 마스크에서 뺌)
+        self._static = None
+        if base.ndim == 3:
+            self._static = cv2.dilate(self._marker_mask(base), np.ones((3, 3), np.uint8))
+
+    # --- 정합 ---
+    def register(self, frame):
+        """기준 맵에서 ROI 프레임 위치를 템플릿 매칭으로 찾음. 점수가 낮으면 None"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.registrations += 1
+        bh, bw = self.base_gray.shape[:2]
+        if gray.shape[0] > bh or gray.shape[1] > bw:
+            self.offset, self.score = None, 0.0
+            return None
+        _, self.score, _, loc = cv2.minMaxLoc(cv2.matchTemplate(self.base_gray, gray, cv2.TM_CCOEFF_NORMED))
+        if self.score < Config.LOCATE_MIN_SCORE:
+            self.offset = None
+            return None
+        self.offset = loc
+        self._set_reference(gray)
+        return loc
+
+    def _set_reference(self, gray):
+        self._ref = gray.astype(np.float32)
+        self._window = cv2.createHanningWindow(gray.shape[::-1], cv2.CV_32F)
+
+    def _check_drift(self, frame):
+        """위상 상관으로 기준 프레임 대비 ROI 내용이 밀렸는지 확인 (밀렸거나 응답이 약하면 다시 정합)"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray.shape != self._ref.shape: return self.register(frame)
+        (dx, dy), response = cv2.phaseCorrelate(self._ref, gray.astype(np.float32), self._window)
+        if response >= 0.1 and abs(dx) < 0.5 and abs(dy) < 0.5: return self.offset
+        # 어긋남 의심: 움직이는 표시 때문일 수도 있으므로 템플릿 매칭으로 확인
+        self.last = None
+        return self.register(frame)
+
+    # --- 캐릭터 표시 ---
+    def _marker_mask(self, img):
+        return cv2.inRange(cv2.cvtColor(img, cv2.COLOR_BGR2HSV), self._lo, self._hi)
+
+    def _blob(self, img, x0=0, y0=0, static=True):
+        """[수정] 색 마스크에서 크기가 맞는 덩어리의 중심 (ROI 좌표, 없으면 None).
+        img는 ROI의 (x0, y0)부터 잘라 낸 영역. static이면 기준 맵에 원래 있던 표시 색 픽셀을 빼고,
+        후보가 여럿이면 직전 위치에 가장 가까운 것 (직전 위치가 없으면 가장 큰 것)"""
+        mask = self._marker_mask(img)
+        if static and self._static is not None and self.offset is not None:
+            bx, by = self.offset[0] + x0, self.offset[1] + y0
+            known = self._static[by:by + mask.shape[0], bx:bx + mask.shape[1]]
+            if known.shape == mask.shape: mask[known > 0] = 0
+        if not cv2.countNonZero(mask): return None
+        n, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        lo, hi = Config.LOCATE_MARKER_AREA
+        ok = np.flatnonzero((areas >= lo) & (areas <= hi))
+        if len(ok) == 0: return None
+        pts = centroids[ok + 1] + (x0, y0)
+        if self.last is None: k = np.argmax(areas[ok])
+        else: k = np.argmin(np.hypot(pts[:, 0] - self.last[0], pts[:, 1] - self.last[1]))
+        return float(pts[k, 0]), float(pts[k, 1])
+
+    def find_marker(self, frame):
+        """ROI 좌표의 표시 중심. 직전 위치 주변을 먼저 보고, 없으면 전체를 봅니다.
+        [수정] 둘 다 없으면 기준 맵의 표시 색 자리를 빼지 않고 다시 봄 (기준 이미지를 찍을 때의 캐릭터 자리에
+        서 있는 경우). 그 자리가 정지한 지형이었다면 진짜 표시가 보이는 즉시 위 단계에서 그쪽으로 옮겨 감"""
+        window = None
+        if self.last is not None:
+            r = Config.LOCATE_SEARCH_RADIUS
+            h, w = frame.shape[:2]
+            x0, y0 = max(0, int(self.last[0]) - r), max(0, int(self.last[1]) - r)
+            x1, y1 = min(w, int(self.last[0]) + r + 1), min(h, int(self.last[1]) + r + 1)
+            window = (frame[y0:y1, x0:x1], x0, y0)
+            pos = self._blob(*window)
+            if pos is not None: return pos
+        pos = self._blob(frame)
+        if pos is None: pos = self._blob(*(window or (frame,)), static=False)
+        return pos
+
+    def locate(self, frame):
+        """프레임 하나 → {'x', 'y', 'platform', 'platform_y'} (에디터 좌표, 표시를 못 찾으면 None)"""
+        self.frames += 1
+        if self.offset is None:
+            if self.register(frame) is None: return None
+        elif Config.LOCATE_VERIFY_EVERY and self.frames % Config.LOCATE_VERIFY_EVERY == 0:
+            if self._check_drift(frame) is None: return None
+        pos = self.find_marker(frame)
+        self.last = pos
+        if pos is None: return None
+        x, y = int(round(pos[0])) + self.offset[0], int(round(pos[1])) + self.offset[1]
+        k = platform_under(self.platforms, x, y) if len(self.platforms) else None
+        return {'x': x, 'y': y, 'platform': k, 'platform_y': None if k is None else int(self.platforms[k, 0])}
+
+
+def run_locator(source, locator, rect=None, max_frames=None, on_fix=None):
+    """소스에서 rect 영역을 계속 캡처해 위치 추적. (찾은 프레임 수, FpsMeter) 반환"""
+    meter = FpsMeter()
+    found = 0
+    while max_frames is None or meter.frames < max_frames:
+        source.advance()
+        fix = locator.locate(source.grab(rect))
+        if fix is not None: found += 1
+        if on_fix: on_fix(meter.frames, fix)
+        meter.tick()
+    return found, meter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="미니맵 캐릭터 위치 실시간 추적")
+    parser.add_argument("--source", default="window:MapleStory", help="캡처 소스 (capture_source.open_source 형식)")
+    parser.add_argument("--roi", default='roi_config.json', help="roi_selector가 저장한 ROI (게임 창 소스일 때)")
+    parser.add_argument("--rect", help="재생 소스에서 잘라 쓸 영역 x,y,w,h (없으면 프레임 전체가 ROI)")
+    parser.add_argument("--base", default='map_base.png', help="기준 맵 이미지 (맵 JSON 좌표의 기준)")
+    parser.add_argument("--map", help="발판을 붙일 맵 JSON/.mapb")
+    parser.add_argument("--map-name", help="번들 파일에서 쓸 맵 이름 (기본: 첫 맵)")
+    parser.add_argument("--frames", type=int, default=None, help="이 프레임 수만큼 돌고 종료")
+    parser.add_argument("--bench", help="FPS 측정 결과를 저장할 JSON 경로")
+    parser.add_argument("--quiet", action="store_true", help="프레임별 위치 출력 생략")
+    args = parser.parse_args(argv)
+
+    base = decode_image(args.base)
+    if base is None:
+        print(f"오류: 기준 맵 이미지를 열 수 없습니다: {args.base}")
+        return 1
+    platforms = ()
+    if args.map:
+        with MapFile.open(args.map) as map_file:
+            stores, _ = map_file.open_map(args.map_name or map_file.names[0])
+        platforms = stores["platforms"]
+    locator = MinimapLocator(base, platforms)
+
+    try:
+        source = open_source(args.source)
+    except (RuntimeError, ImportError, OSError) as e:
+        print(f"오류: {e}")
+        return 1
+    with source:
+        rect = None
+        if args.rect:
+            rect = tuple(int(v) for v in args.rect.split(","))
+        elif isinstance(source, WindowCapture):
+            left, top, w, h = load_roi(args.roi)
+            rect = (left - source.origin[0], top - source.origin[1], w, h)
+
+        def on_fix(k, fix):
+            if args.quiet or fix is None: return
+            plat = "-" if fix['platform'] is None else f"#{fix['platform']} (y={fix['platform_y']})"
+            print(f"{k:6d}: ({fix['x']}, {fix['y']}) 발판 {plat}")
+
+        try:
+            found, meter = run_locator(source, locator, rect, args.frames, on_fix)
+        except KeyboardInterrupt:
+            return 0
+    print(f"{meter.frames} 프레임 중 {found} 프레임 위치 확인, {meter.elapsed:.2f}s, {meter.fps:.1f} FPS "
+          f"(정합 {locator.registrations}회, 점수 {locator.score or 0:.2f})")
+    if args.bench:
+        with open(args.bench, 'w', encoding='utf-8') as f:
+            json.dump({'source': args.source, 'frames': meter.frames, 'found': found, 'seconds': round(meter.elapsed, 4),
+                       'fps': round(meter.fps, 2), 'offset': locator.offset, 'registrations': locator.registrations}, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
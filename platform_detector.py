@@ -0,0 +1,328 @@
+# platform_detector.py
+import cv2
+import numpy as np
+
+from app_config import Config
+from map_store import as_columns
+from spatial_index import PlatformIndex
+
+# 발판 윗줄이 이 비율 넘게 막혀 있으면 설 수 없는 면(블록 속/아랫면)으로 봅니다.
+MAX_COVERED = 0.5
+
+
+def to_gray(img):
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def binarize(gray, threshold):
+    _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
+    return thresh
+
+
+def open_mask(thresh, min_len):
+    """가로 min_len 커널로 모폴로지 열림 (짧은 가로 조각과 세로 벽 제거)"""
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(1, min_len), 1))
+    return cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=1)
+
+
+def _runs(mask):
+    """이진 마스크(0/255)의 행별 가로 런 추출: (행, 시작 x, 끝 x(미포함)) 배열, 행 → x 순으로 정렬됨.
+    각 행 끝에 빈 칸을 하나 붙여 1차원으로 펼치면 값이 바뀌는 위치가 시작/끝 순서로 번갈아 나옵니다."""
+    h, w = mask.shape[:2]
+    flat = np.zeros(h * (w + 1) + 1, np.uint8)
+    flat[1:].reshape(h, w + 1)[:, :w] = mask
+    change = np.flatnonzero(flat[1:] != flat[:-1])
+    rows = change[0::2] // (w + 1)
+    return rows, change[0::2] - rows * (w + 1), change[1::2] - rows * (w + 1)
+
+
+def _compress(parent):
+    """부모 포인터를 루트까지 압축 (포인터 점프)"""
+    while True:
+        nxt = parent[parent]
+        if np.array_equal(nxt, parent): return parent
+        parent = nxt
+
+
+def _label_runs(rows, s, e, w):
+    """런 단위 연결 요소 번호 (8방향, 요소 안에서 가장 작은 런 인덱스).
+    각 런을 윗줄에서 맞닿는 첫 런에 매달아 숲을 만들고 포인터 점프로 루트를 찾은 뒤,
+    윗줄 런 여러 개에 걸친 나머지 간선만 작은 번호 쪽으로 잇기를 반복합니다."""
+    n = len(s)
+    key_s, key_e = rows * w + s, rows * w + e
+    lo = np.searchsorted(key_e, (rows - 1) * w + s, side="left")   # 윗줄에서 e >= s 인 첫 런
+    hi = np.searchsorted(key_s, (rows - 1) * w + e, side="right")  # 윗줄에서 s <= e 인 마지막 런 + 1
+    count = np.maximum(hi - lo, 0)
+    parent = _compress(np.where(count > 0, lo, np.arange(n)))
+
+    extra = np.maximum(count - 1, 0)
+    a = np.repeat(np.arange(n), extra)
+    b = np.repeat(lo + 1, extra) + (np.arange(extra.sum()) - np.repeat(np.cumsum(extra) - extra, extra))
+    while len(a):
+        ra, rb = parent[a], parent[b]
+        diff = ra != rb
+        a, b, ra, rb = a[diff], b[diff], ra[diff], rb[diff]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        parent = _compress(parent)
+    return parent
+
+
+def platform_chains(detected):
+    """[신규] 열린 마스크 → 발판 후보 묶음 (윗변 y, 높이, x_start, x_end, 윗면 노출 여부) 배열 튜플.
+    행별 런을 연결 요소(8방향)로 묶어 행마다 좌우 범위를 구한 뒤, 윗줄과 범위가 절반 넘게
+    겹치지 않는 곳에서 끊어 세로 묶음을 만듭니다. 그래서 벽에 붙은 발판이나 폭이 다른
+    발판이 붙어 쌓인 경우에도 한 덩어리로 합쳐지지 않습니다.
+    min_len/max_h와 무관하므로 한 번 만들어 두고 select_platforms로 여러 설정을 고를 수 있습니다."""
+    h, w = detected.shape[:2]
+    return chains_from_runs(*_runs(detected), h, w)
+
+
+def band_runs(bands):
+    """[신규] (띠 마스크, 띠 시작 행) 순서대로 런을 뽑아 이어 붙임 → 전체 기준 (행, 시작 x, 끝 x).
+    런은 행마다 독립이라 띠로 나눠 뽑아도 전체 마스크에서 뽑은 것과 같고, 픽셀 대신 런만 모아 둡니다."""
+    rows, s, e = [np.empty(0, np.int64)], [np.empty(0, np.int64)], [np.empty(0, np.int64)]
+    for mask, y0 in bands:
+        r, bs, be = _runs(mask)
+        rows.append(r + y0); s.append(bs); e.append(be)
+    return np.concatenate(rows), np.concatenate(s), np.concatenate(e)
+
+
+def chains_from_runs(rows, s, e, h, w):
+    """[신규] 행 → x 순으로 정렬된 런 → platform_chains와 같은 묶음 배열 튜플 (h, w 는 마스크 크기)"""
+    if len(s) == 0:
+        empty = np.empty(0, np.int64)
+        return empty, empty, empty, empty, np.empty(0, bool)
+    label = _label_runs(rows, s, e, w + 1)
+
+    # 연결 요소별 · 행별 좌우 범위 (요소 → 행 순으로 정렬)
+    order = np.lexsort((rows, label))
+    group = label[order] * h + rows[order]
+    first = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    seg_label, seg_row = label[order[first]], rows[order[first]]
+    seg_s = np.minimum.reduceat(s[order], first)
+    seg_e = np.maximum.reduceat(e[order], first)
+
+    # 같은 요소의 윗줄 범위와 절반 넘게 겹치면 같은 묶음, 아니면 새 묶음 시작
+    overlap = np.minimum(seg_e[1:], seg_e[:-1]) - np.maximum(seg_s[1:], seg_s[:-1])
+    longer = np.maximum(seg_e[1:] - seg_s[1:], seg_e[:-1] - seg_s[:-1])
+    same = (seg_label[1:] == seg_label[:-1]) & (seg_row[1:] == seg_row[:-1] + 1) & (2 * overlap > longer)
+    head = np.flatnonzero(np.r_[True, ~same])
+    top = seg_row[head]
+    height = np.diff(np.r_[head, len(seg_s)])
+    xs = np.minimum.reduceat(seg_s, head)
+    xe = np.maximum.reduceat(seg_e, head)
+    # 맨 윗줄 바로 위가 MAX_COVERED 넘게 막혀 있으면 블록 내부/아랫면 (설 수 없음)
+    ts, te = seg_s[head], seg_e[head]
+    exposed = _covered(rows * (w + 1) + s, s, e, w + 1, top - 1, ts, te) <= MAX_COVERED * (te - ts)
+    return top, height, xs, xe, exposed
+
+
+def select_platforms(chains, min_len, max_h=8):
+    """묶음 중 발판 조건(길이 min_len 이상, 높이 max_h 미만, 윗면 노출)을 만족하는 것만
+    (y, x_start, x_end, 윗변 y) 배열 튜플로 반환 (윗변 → x 순 정렬)"""
+    top, height, xs, xe, exposed = chains
+    keep = exposed & (height < max_h) & (xe - xs >= min_len)
+    top, xs, xe = top[keep], xs[keep], xe[keep]
+    sort = np.lexsort((xs, top))
+    top, xs, xe = top[sort], xs[sort], xe[sort]
+    return top + 1, xs, xe, top
+
+
+def extract_runs(detected, min_len, max_h=8):
+    """[신규] 런 길이 기반 발판 추출 (벡터화). (y, x_start, x_end, 윗변 y) 배열 튜플 반환"""
+    return select_platforms(platform_chains(detected), min_len, max_h)
+
+
+def _covered(key, s, e, w, row, qs, qe):
+    """row 행에서 [qs, qe) 구간 중 런이 덮고 있는 픽셀 수 (row < 0 이면 0)"""
+    lo = np.searchsorted(key, row * w + qs, side="left")   # qs 이상에서 시작하는 첫 런
+    hi = np.searchsorted(key, row * w + qe, side="left")   # qe 전에 시작하는 마지막 런 + 1
+    cum = np.r_[0, np.cumsum(e - s)]
+    inside = cum[hi] - cum[lo] - np.where(hi > lo, np.maximum(e[hi - 1] - qe, 0), 0)
+    # qs보다 앞에서 시작해 qs를 넘어오는 런
+    prev = np.maximum(lo - 1, 0)
+    head = np.where((lo > 0) & (key[prev] >= row * w), np.clip(np.minimum(e[prev], qe) - qs, 0, None), 0)
+    return np.where(row >= 0, inside + head, 0)
+
+
+def extract_platforms(detected, min_len, max_h=8):
+    """열린 마스크에서 발판 조건을 만족하는 것만 (y, x_start, x_end, 윗변 y) 목록으로 반환"""
+    return list(zip(*(a.tolist() for a in extract_runs(detected, min_len, max_h))))
+
+
+def detect_from_gray(gray, threshold, min_len, max_h=8):
+    return extract_platforms(open_mask(binarize(gray, threshold), min_len), min_len, max_h)
+
+
+def detect_platforms(img, threshold, min_len, max_h=8):
+    """밝기 임계값 → 가로 모폴로지 열림 → 런 길이 추출로 발판 후보 검출.
+    반환값은 (y, x_start, x_end, 윗변 y) 목록이며 좌표는 img 기준입니다."""
+    return detect_from_gray(to_gray(img), threshold, min_len, max_h)
+
+
+class DetectionCancelled(Exception):
+    """[신규] 더 새로운 감지 요청이 들어와 진행 중인 감지를 중단함"""
+
+
+def _check(cancel):
+    if cancel is not None and cancel(): raise DetectionCancelled()
+
+
+def _select_runs(runs, h, w, min_len, max_h, x0=0, y0=0):
+    """전체 런 → 발판 (y, x_start, x_end) 배열 (x0, y0 는 런 좌표의 원점)"""
+    y, xs, xe, _ = select_platforms(chains_from_runs(*runs, h, w), min_len, max_h)
+    return np.column_stack((y + y0, xs + x0, xe + x0))
+
+
+def _extract_bands(mask, min_len, max_h, rect, cancel=None):
+    """[수정] 열린 마스크를 띠 단위로 읽어 런만 모은 뒤 한 번에 묶어 발판 추출. (y, x_start, x_end) 배열 반환.
+    연결 요소를 런 전체에서 보므로 띠 경계를 넘는 벽/블록도 rect를 한 번에 처리한 결과와 같습니다."""
+    h, w = mask.shape[:2]
+    x1, y1, x2, y2 = rect
+    x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+    if x2 <= x1 or y2 <= y1: return np.empty((0, 3), np.int64)
+
+    def bands():
+        for start in range(y1, y2, Config.DETECT_BAND_ROWS):
+            _check(cancel)
+            yield mask[start:min(y2, start + Config.DETECT_BAND_ROWS), x1:x2], start - y1
+    return _select_runs(band_runs(bands()), y2 - y1, x2 - x1, min_len, max_h, x1, y1)
+
+
+def to_dicts(found):
+    """(y, x_start, x_end) 배열 → save_data 형식 dict 목록"""
+    return [{'y': y, 'x_start': xs, 'x_end': xe} for y, xs, xe in found.tolist()]
+
+
+class DetectionCache:
+    """[신규] 감지 중간 결과 캐시 (그레이 → 이진화 → 열림 마스크, 전체 이미지 기준).
+    파라미터가 바뀌면 그 단계부터 뒤만 다시 만들고, 영역(ROI) 감지는 캐시된 마스크를 잘라 씁니다.
+    가로 커널만 쓰므로 각 단계는 띠 단위로 채워도 전체를 한 번에 처리한 것과 같습니다.
+    (발판 묶음은 연결 요소라 띠마다 나누지 않고, 띠에서 뽑은 런을 모아 한 번에 만듭니다.)
+    cancel 콜백이 참을 반환하면 띠 사이에서 DetectionCancelled로 중단하며, 채우다 만 단계는 무효로 남습니다."""
+    def __init__(self):
+        self.image = None
+        self.threshold = None
+        self.min_len = None
+        self.gray = self.thresh = self.opened = None
+
+    def set_image(self, image):
+        """이미지가 바뀌면 모든 단계 무효화"""
+        if image is self.image: return
+        self.image = image
+        self.threshold = self.min_len = None
+        self.gray = self.thresh = self.opened = None
+
+    def _alloc(self):
+        return self.image.alloc_plane()
+
+    def _fill(self, out, func, cancel=None):
+        for start in range(0, self.image.h, Config.DETECT_BAND_ROWS):
+            _check(cancel)
+            end = min(self.image.h, start + Config.DETECT_BAND_ROWS)
+            out[start:end] = func(start, end)
+        return out
+
+    def masks(self, threshold, min_len, cancel=None):
+        """(threshold, min_len)에 맞는 열린 마스크 반환 (바뀐 단계부터만 재계산)"""
+        if self.gray is None:
+            self.gray = self._fill(self._alloc(), lambda a, b: to_gray(self.image.read((0, a, self.image.w, b))), cancel)
+        if self.thresh is None or threshold != self.threshold:
+            if self.thresh is None: self.thresh = self._alloc()
+            self.threshold = self.min_len = None
+            self._fill(self.thresh, lambda a, b: binarize(self.gray[a:b], threshold), cancel)
+            self.threshold = threshold
+        if self.opened is None or min_len != self.min_len:
+            if self.opened is None: self.opened = self._alloc()
+            self.min_len = None
+            self._fill(self.opened, lambda a, b: open_mask(self.thresh[a:b], min_len), cancel)
+            self.min_len = min_len
+        return self.opened
+
+    def detect(self, threshold, min_len, max_h=8, rect=None, cancel=None):
+        """캐시된 마스크로 발판 감지 (save_data 형식 dict 목록, rect 는 (x1, y1, x2, y2))"""
+        opened = self.masks(threshold, min_len, cancel)
+        return to_dicts(_extract_bands(opened, min_len, max_h, rect or (0, 0, self.image.w, self.image.h), cancel))
+
+
+def detect_image(image, threshold, min_len, max_h=8, rect=None):
+    """[신규] 이미지 백엔드(MappedImage)에서 띠 단위로 읽으며 발판 감지 (save_data 형식 dict 목록).
+    [수정] 모폴로지 커널이 가로 방향뿐이라 띠마다 열린 마스크의 런을 뽑아 모으면 전체 마스크의 런과 같고,
+    발판 묶음(연결 요소)은 모은 런 전체에서 한 번에 만들므로 띠 경계를 넘는 벽/블록이 있어도
+    이미지를 한 번에 처리한 결과와 같습니다. 메모리는 픽셀이 아니라 런 수에 비례합니다."""
+    x1, y1, x2, y2 = rect or (0, 0, image.w, image.h)
+    if x2 <= x1 or y2 <= y1: return []
+
+    def bands():
+        for band, _, by, _, _ in image.iter_bands(Config.DETECT_BAND_ROWS, 0, rect):
+            yield open_mask(binarize(to_gray(band), threshold), min_len), by - y1
+    return to_dicts(_select_runs(band_runs(bands()), y2 - y1, x2 - x1, min_len, max_h, x1, y1))
+
+
+def _best_pairs(cand, q, old, ids):
+    """(후보 번호 q, 짝 후보 ids) 쌍에서 후보별 최적 짝: 겹친 길이가 큰 순, 같으면 높이 차가 작은 순, 인덱스가 작은 순"""
+    overlap = np.minimum(cand[q, 2], old[:, 2]) - np.maximum(cand[q, 1], old[:, 1])
+    order = np.lexsort((ids, np.abs(cand[q, 0] - old[:, 0]), -overlap, q))
+    q, ids = q[order], ids[order]
+    best = np.full(len(cand), -1, np.int64)
+    first = np.r_[True, q[1:] != q[:-1]] if len(q) else np.empty(0, bool)
+    best[q[first]] = ids[first]
+    return best
+
+
+def _batch_twins(cand, pending, y_tol, x_tol):
+    """[신규] pending 후보마다 같은 배치에서 앞선 pending 후보 중 최적 짝의 번호 (없으면 -1)"""
+    rows = np.flatnonzero(pending)
+    index = PlatformIndex()
+    index.rebuild(cand[rows])
+    q, ids = index.query_intervals(cand[rows, 0], cand[rows, 1], cand[rows, 2], y_tol, x_tol)
+    q, ids = rows[q], rows[ids]
+    keep = ids < q   # 앞선 후보에만 합침 (color_detector.dedupe처럼 앞의 것이 남음)
+    return _best_pairs(cand, q[keep], cand[ids[keep]], ids[keep])
+
+
+def merge_platforms(platforms, found, index=None, y_tol=None, x_tol=None):
+    """[신규] 감지 결과 found를 기존 platforms에 중복 없이 병합 (platforms를 제자리에서 수정).
+    같은 높이(±y_tol)에서 x 구간이 겹치거나 x_tol 이내로 맞닿는 기존 발판 중 가장 많이 겹치는
+    것을 짝으로 삼아, 양 끝점이 모두 x_tol 이내면 건너뛰고 아니면 기존 발판을 합집합으로 늘립니다.
+    짝이 없으면 새로 추가하되, 같은 배치에서 앞서 추가된 후보와 겹치면 그 후보에 같은 규칙으로 합칩니다.
+    index는 platforms와 동기화된 PlatformIndex (없으면 새로 만듦).
+    반환: {'added': 추가된 인덱스 목록, 'updated': 늘어난 기존 발판 인덱스 목록,
+           'before': 늘어난 발판의 원래 {인덱스: (x_start, x_end)} (되돌리기용),
+           'merged': 기존 발판(또는 앞선 후보)에 합친 후보 수, 'skipped': 중복이라 건너뛴 후보 수}"""
+    y_tol = Config.MERGE_Y_TOL if y_tol is None else y_tol
+    x_tol = Config.MERGE_X_TOL if x_tol is None else x_tol
+    report = {'added': [], 'updated': [], 'before': {}, 'merged': 0, 'skipped': 0}
+    if not found: return report
+    if index is None:
+        index = PlatformIndex()
+        index.rebuild(platforms)
+    fields = ("y", "x_start", "x_end")
+    cand = as_columns(found, fields)
+    q, ids = index.query_intervals(cand[:, 0], cand[:, 1], cand[:, 2], y_tol, x_tol)
+
+    best = _best_pairs(cand, q, as_columns(platforms, fields)[ids], ids)
+    # [수정] 기존 발판과 짝이 없는 후보끼리도 같은 규칙으로 앞선 후보에 합치거나 건너뜀 (한 배치 안의 중복)
+    twin = _batch_twins(cand, best < 0, y_tol, x_tol).tolist()
+    updated, added, slot = set(), [], {}   # slot: 후보 번호 → added 안의 위치
+    for k, (p, i) in enumerate(zip(found, best.tolist())):
+        if i < 0 and twin[k] < 0:
+            slot[k] = len(added)
+            added.append(dict(p))
+            continue
+        e = platforms[i] if i >= 0 else added[slot[twin[k]]]
+        if i < 0: slot[k] = slot[twin[k]]
+        xs, xe = min(e['x_start'], p['x_start']), max(e['x_end'], p['x_end'])
+        # 양 끝점이 허용 오차 안이거나 기존 발판 안에 포함되면 중복
+        if xs - e['x_start'] >= -x_tol and xe - e['x_end'] <= x_tol:
+            report['skipped'] += 1
+            continue
+        if i >= 0:
+            report['before'].setdefault(i, (e['x_start'], e['x_end']))
+            updated.add(i)
+        e['x_start'], e['x_end'] = xs, xe
+        report['merged'] += 1
+    report['added'] = list(range(len(platforms), len(platforms) + len(added)))
+    platforms.extend(added)
+    report['updated'] = sorted(updated)
+    return report
@@ -1,156 +1,268 @@
+import argparse
+import json
+import time
+
 import cv2
 import numpy as np
-import mss
-import json
-import win32gui
-import win32con
+
+from capture_source import FpsMeter, open_source
 
 # --- 설정 ---
 WINDOW_TITLE = "MapleStory"
+FULL_REFRESH_SEC = 0.5   # [신규] 창 전체는 이 간격으로만 다시 캡처 (ROI 영역은 매 프레임)
 # --------------
 
+PARAM_KEYS = ['Left', 'Top', 'Width', 'Height']
+INITIAL_PARAMS = {'Left': 10, 'Top': 50, 'Width': 200, 'Height': 150}
+# 방향키 코드 (Windows waitKeyEx, GTK/X11)
+KEY_DEC = {2490368, 2424832, 65362, 65361}   # Up, Left
+KEY_INC = {2621440, 2555904, 65364, 65363}   # Down, Right
+KEY_ENTER = {13, 10, 65293}
+KEY_BACKSPACE = {8, 65288}
+KEY_NAMES = {'up': 65362, 'down': 65364, 'left': 65361, 'right': 65363, 'enter': 13, 'bs': 8}
+
 def nothing(x):
     pass
 
-def main():
-    print("--- ROI 선택기 (v2.2) ---")
-    print(f"'{WINDOW_TITLE}' 창을 찾고 있습니다...")
-
-    hwnd = win32gui.FindWindow(None, WINDOW_TITLE)
-    if not hwnd:
-        print(f"오류: '{WINDOW_TITLE}' 창을 찾을 수 없습니다. 게임이 실행 중인지 확인하세요.")
-        return
-
-    if win32gui.IsIconic(hwnd):
-        print(f"오류: '{WINDOW_TITLE}' 창이 최소화되어 있습니다. 창을 활성화한 후 다시 실행해 주세요.")
-        return
-        
-    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-    win32gui.SetForegroundWindow(hwnd)
-
-    with mss.mss() as sct:
-        left, top, right, bot = win32gui.GetWindowRect(hwnd)
-        WINDOW_WIDTH = right - left
-        WINDOW_HEIGHT = bot - top
-        
-        if WINDOW_WIDTH <= 0 or WINDOW_HEIGHT <= 0:
-            print(f"오류: '{WINDOW_TITLE}' 창의 크기를 가져올 수 없습니다. (너비/높이 0 이하)")
-            return
-
-        print(f"창 발견! 위치:({left}, {top}), 크기:({WINDOW_WIDTH}x{WINDOW_HEIGHT})")
-        capture_zone = {'top': top, 'left': left, 'width': WINDOW_WIDTH, 'height': WINDOW_HEIGHT}
-
-        # --- 창 생성 ---
+
+class SelectorState:
+    """[신규] 선택기 상태 (값, 선택된 항목, 숫자 입력). version은 화면에 보이는 값이 바뀔 때마다 증가."""
+    def __init__(self, params):
+        self.params = dict(params)
+        self.active_idx = 0
+        self.number_input_str = ""
+        self.version = 0
+
+    def changed(self):
+        self.version += 1
+
+    def clamp(self, width, height):
+        p = self.params
+        before = dict(p)
+        p['Left'] = max(0, min(p['Left'], width))
+        p['Top'] = max(0, min(p['Top'], height))
+        p['Width'] = max(1, min(p['Width'], width - p['Left']))
+        p['Height'] = max(1, min(p['Height'], height - p['Top']))
+        if p != before: self.changed()
+
+    def rect(self):
+        p = self.params
+        return p['Left'], p['Top'], p['Width'], p['Height']
+
+    def handle_key(self, key):
+        """키 하나 처리. 'save' / 'quit' / None 반환"""
+        if key == -1: return None
+        active_key = PARAM_KEYS[self.active_idx]
+        if ord('1') <= key <= ord('4'):
+            self.active_idx = key - ord('1')
+            self.number_input_str = ""
+        elif ord('0') <= key <= ord('9'):
+            self.number_input_str += chr(key)
+        elif key in KEY_BACKSPACE:
+            self.number_input_str = self.number_input_str[:-1]
+        elif key in KEY_ENTER:
+            try:
+                if self.number_input_str:
+                    self.params[active_key] = int(self.number_input_str)
+            except ValueError:
+                print("잘못된 숫자 형식입니다.")
+            finally:
+                self.number_input_str = ""
+        elif key in KEY_DEC: self.params[active_key] -= 1
+        elif key in KEY_INC: self.params[active_key] += 1
+        elif key == ord('s'): return 'save'
+        elif key == ord('q'): return 'quit'
+        else: return None
+        self.changed()
+        return None
+
+
+def draw_controls(img, state):
+    img.fill(20)
+    for i, p_key in enumerate(PARAM_KEYS):
+        color = (0, 255, 0) if i == state.active_idx else (255, 255, 255) # 활성 파라미터는 녹색, 나머지는 흰색
+        cv2.putText(img, f"{p_key}: {state.params[p_key]}", (10, 30 + i * 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    cv2.putText(img, "Input:", (10, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+    if state.number_input_str:
+        cv2.putText(img, state.number_input_str, (80, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+    return img
+
+
+class CvUI:
+    """OpenCV 창/트랙바. 트랙바와 Controls 패널은 값이 바뀐 경우에만 갱신합니다."""
+    def __init__(self, width, height, params, delay=20):
+        self.delay = delay
         cv2.namedWindow('Trackbars', cv2.WINDOW_NORMAL)
         cv2.resizeWindow('Trackbars', 600, 200)
         cv2.namedWindow('ROI Selector', cv2.WINDOW_NORMAL)
-        # ===================== NEW: 컨트롤 패널 창 추가 =====================
         cv2.namedWindow('Controls', cv2.WINDOW_NORMAL)
-        control_panel_img = np.zeros((150, 400, 3), dtype=np.uint8) # 제어판 영역 생성
-        # =================================================================
-
-        initial_params = {'Left': 10, 'Top': 50, 'Width': 200, 'Height': 150}
-        
-        cv2.createTrackbar('Left', 'Trackbars', initial_params['Left'], WINDOW_WIDTH, nothing)
-        cv2.createTrackbar('Top', 'Trackbars', initial_params['Top'], WINDOW_HEIGHT, nothing)
-        cv2.createTrackbar('Width', 'Trackbars', initial_params['Width'], WINDOW_WIDTH, nothing)
-        cv2.createTrackbar('Height', 'Trackbars', initial_params['Height'], WINDOW_HEIGHT, nothing)
-        
-        print("\n--- 조작법 ---")
-        print("ROI Selector 또는 Controls 창을 활성화한 상태에서 아래 키를 누르세요.")
-        print("1, 2, 3, 4 키: Left, Top, Width, Height 선택")
-        print("방향키: 선택된 값 1씩 조절")
-        print("숫자 + Enter: 선택된 값 직접 설정")
-        print("'s': 저장 | 'q': 종료")
-
-        params = initial_params.copy()
-        param_keys = ['Left', 'Top', 'Width', 'Height']
-        active_param_idx = 0
-        number_input_str = ""
-        is_saved = False
-
-        while True:
-            game_img = np.array(sct.grab(capture_zone))
-
-            mouse_moved = False
-            for p_key in param_keys:
-                trackbar_pos = cv2.getTrackbarPos(p_key, 'Trackbars')
-                if params[p_key] != trackbar_pos:
-                    params[p_key] = trackbar_pos
-                    mouse_moved = True
-            
-            if mouse_moved:
-                number_input_str = ""
-
-            key = cv2.waitKeyEx(20)
-
-            if key != -1:
-                active_param_key = param_keys[active_param_idx]
-                
-                if ord('1') <= key <= ord('4'):
-                    active_param_idx = key - ord('1')
-                    number_input_str = ""
-                elif ord('0') <= key <= ord('9'):
-                    number_input_str += chr(key)
-                elif key == 8: # Backspace
-                    number_input_str = number_input_str[:-1]
-                elif key == 13: # Enter
-                    try:
-                        if number_input_str:
-                            params[active_param_key] = int(number_input_str)
-                    except ValueError:
-                        print("잘못된 숫자 형식입니다.")
-                    finally:
-                        number_input_str = ""
-                elif key == 2490368: params[active_param_key] -= 1 # Up
-                elif key == 2621440: params[active_param_key] += 1 # Down
-                elif key == 2424832: params[active_param_key] -= 1 # Left
-                elif key == 2555904: params[active_param_key] += 1 # Right
-                elif key == ord('s'):
-                    is_saved = True
-                    break
-                elif key == ord('q'):
-                    break
-
-            params['Left'] = max(0, min(params['Left'], WINDOW_WIDTH))
-            params['Top'] = max(0, min(params['Top'], WINDOW_HEIGHT))
-            params['Width'] = max(1, min(params['Width'], WINDOW_WIDTH - params['Left']))
-            params['Height'] = max(1, min(params['Height'], WINDOW_HEIGHT - params['Top']))
-            
-            for p_key, p_val in params.items():
+        self.control_panel_img = np.zeros((150, 400, 3), dtype=np.uint8) # 제어판 영역
+        for p_key, limit in zip(PARAM_KEYS, (width, height, width, height)):
+            cv2.createTrackbar(p_key, 'Trackbars', params[p_key], limit, nothing)
+        self._pushed = dict(params)     # 마지막으로 트랙바에 반영한 값
+        self._shown_version = None
+
+    def read_trackbars(self, state):
+        """마우스로 움직인 트랙바 값을 상태에 반영. 바뀌었으면 True"""
+        moved = False
+        for p_key in PARAM_KEYS:
+            pos = cv2.getTrackbarPos(p_key, 'Trackbars')
+            if pos != self._pushed[p_key]:
+                state.params[p_key] = self._pushed[p_key] = pos
+                moved = True
+        if moved:
+            state.number_input_str = ""
+            state.changed()
+        return moved
+
+    def update(self, state, frame):
+        for p_key, p_val in state.params.items():
+            if self._pushed[p_key] != p_val:
                 cv2.setTrackbarPos(p_key, 'Trackbars', p_val)
+                self._pushed[p_key] = p_val
+        if state.version != self._shown_version:
+            cv2.imshow('Controls', draw_controls(self.control_panel_img, state))
+            self._shown_version = state.version
+        cv2.imshow('ROI Selector', frame)
+
+    def poll_key(self):
+        return cv2.waitKeyEx(self.delay)
+
+    def close(self):
+        cv2.destroyAllWindows()
 
-            # ===================== NEW: 컨트롤 패널 업데이트 =====================
-            control_panel_img.fill(20) # 매 프레임마다 패널을 검은색에 가깝게 초기화
-            
-            for i, p_key in enumerate(param_keys):
-                color = (0, 255, 0) if i == active_param_idx else (255, 255, 255) # 활성 파라미터는 녹색, 나머지는 흰색
-                text = f"{p_key}: {params[p_key]}"
-                cv2.putText(control_panel_img, text, (10, 30 + i * 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-            
-            cv2.putText(control_panel_img, "Input:", (10, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            if number_input_str:
-                cv2.putText(control_panel_img, number_input_str, (80, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                
-            cv2.imshow('Controls', control_panel_img)
-            # =================================================================
-
-            # ROI 사각형 그리기
-            cv2.rectangle(game_img, (params['Left'], params['Top']), (params['Left'] + params['Width'], params['Top'] + params['Height']), (0, 255, 0), 2)
-            cv2.imshow('ROI Selector', game_img)
-
-        if is_saved:
-            final_roi = {'top': top + params['Top'], 'left': left + params['Left'], 'width': params['Width'], 'height': params['Height']}
-            with open('roi_config.json', 'w') as f:
-                json.dump(final_roi, f, indent=4)
-            print(f"\n좌표 정보 저장 완료: {final_roi}")
-            roi_img = np.array(sct.grab(final_roi))
-            cv2.imwrite('map_base.png', roi_img)
-            print("미니맵 이미지 'map_base.png' 저장 완료.")
+
+class HeadlessUI:
+    """[신규] 창 없이 도는 UI (CI/벤치마크용). 키 입력은 미리 정한 순서대로 한 프레임에 하나씩."""
+    def __init__(self, keys=()):
+        self.keys = list(keys)
+        self.control_panel_img = np.zeros((150, 400, 3), dtype=np.uint8)
+        self._shown_version = None
+        self.last_frame = None
+
+    def read_trackbars(self, state):
+        return False
+
+    def update(self, state, frame):
+        if state.version != self._shown_version:
+            draw_controls(self.control_panel_img, state)
+            self._shown_version = state.version
+        self.last_frame = frame
+
+    def poll_key(self):
+        return self.keys.pop(0) if self.keys else -1
+
+    def close(self):
+        pass
+
+
+def parse_keys(text):
+    """'2,right,right,enter,s' → 키 코드 목록 (한 글자는 그 문자, 이름은 KEY_NAMES)"""
+    keys = []
+    for token in filter(None, (t.strip() for t in (text or "").split(","))):
+        keys.append(KEY_NAMES[token.lower()] if token.lower() in KEY_NAMES else ord(token))
+    return keys
+
+
+def run_selector(source, ui, params=None, max_frames=None, full_refresh=FULL_REFRESH_SEC):
+    """선택 루프. 창 전체는 full_refresh 간격으로만 캡처해 두고, 매 프레임은 ROI 영역만 캡처해
+    그 위에 붙입니다. (상태, 'save'/'quit'/None, FpsMeter) 반환"""
+    width, height = source.size
+    state = SelectorState(params or INITIAL_PARAMS)
+    state.clamp(width, height)
+    meter = FpsMeter()
+    background = view = None
+    last_full = 0.0
+    prev_box = None   # 직전 프레임에 덮어쓴 영역 (사각형 두께 포함)
+    action = None
+    while max_frames is None or meter.frames < max_frames:
+        source.advance()
+        now = time.perf_counter()
+        if background is None or now - last_full >= full_refresh:
+            background = source.grab()
+            view = background.copy()
+            last_full, prev_box = now, None
+        elif prev_box is not None:
+            x1, y1, x2, y2 = prev_box
+            view[y1:y2, x1:x2] = background[y1:y2, x1:x2]
+
+        ui.read_trackbars(state)
+        action = state.handle_key(ui.poll_key())
+        if action: break
+        state.clamp(width, height)
+
+        x, y, w, h = state.rect()
+        roi = source.grab((x, y, w, h))
+        view[y:y + roi.shape[0], x:x + roi.shape[1]] = roi
+        cv2.rectangle(view, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        prev_box = (max(0, x - 2), max(0, y - 2), min(width, x + w + 3), min(height, y + h + 3))
+        ui.update(state, view)
+        meter.tick()
+    return state, action, meter
+
+
+def save_roi(source, state, config_path='roi_config.json', image_path='map_base.png'):
+    left, top = source.origin
+    p = state.params
+    final_roi = {'top': top + p['Top'], 'left': left + p['Left'], 'width': p['Width'], 'height': p['Height']}
+    with open(config_path, 'w') as f:
+        json.dump(final_roi, f, indent=4)
+    print(f"\n좌표 정보 저장 완료: {final_roi}")
+    cv2.imwrite(image_path, source.grab(state.rect()))
+    print(f"미니맵 이미지 '{image_path}' 저장 완료.")
+    return final_roi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="미니맵 ROI 선택기")
+    parser.add_argument("--source", default=f"window:{WINDOW_TITLE}",
+                        help="캡처 소스 (window:제목 / image:파일·폴더 / video:파일 / synthetic:800x600)")
+    parser.add_argument("--headless", action="store_true", help="창 없이 실행 (CI/벤치마크)")
+    parser.add_argument("--frames", type=int, default=None, help="이 프레임 수만큼 돌고 종료")
+    parser.add_argument("--keys", default="", help="headless에서 순서대로 누를 키 (예: 2,down,down,s)")
+    parser.add_argument("--full-refresh", type=float, default=FULL_REFRESH_SEC, help="창 전체 재캡처 간격(초)")
+    parser.add_argument("--bench", help="FPS 측정 결과를 저장할 JSON 경로")
+    parser.add_argument("--config", default='roi_config.json', help="ROI 좌표 저장 경로")
+    parser.add_argument("--image", default='map_base.png', help="미니맵 이미지 저장 경로")
+    args = parser.parse_args(argv)
+    if args.headless and args.frames is None: args.frames = 300   # 끝없이 돌지 않도록
+
+    print("--- ROI 선택기 (v2.3) ---")
+    print(f"캡처 소스: {args.source}")
+    try:
+        source = open_source(args.source)
+    except (RuntimeError, ImportError, OSError) as e:
+        print(f"오류: {e}")
+        return 1
+
+    with source:
+        width, height = source.size
+        print(f"창 발견! 위치:{source.origin}, 크기:({width}x{height})")
+        if args.headless:
+            ui = HeadlessUI(parse_keys(args.keys))
         else:
-            print("\n저장하지 않고 종료합니다.")
+            ui = CvUI(width, height, INITIAL_PARAMS)
+            print("\n--- 조작법 ---")
+            print("ROI Selector 또는 Controls 창을 활성화한 상태에서 아래 키를 누르세요.")
+            print("1, 2, 3, 4 키: Left, Top, Width, Height 선택")
+            print("방향키: 선택된 값 1씩 조절")
+            print("숫자 + Enter: 선택된 값 직접 설정")
+            print("'s': 저장 | 'q': 종료")
+        try:
+            state, action, meter = run_selector(source, ui, max_frames=args.frames, full_refresh=args.full_refresh)
+        finally:
+            ui.close()
 
-    cv2.destroyAllWindows()
+        print(f"\n{meter.frames} 프레임, {meter.elapsed:.2f}s, {meter.fps:.1f} FPS")
+        if args.bench:
+            with open(args.bench, 'w', encoding='utf-8') as f:
+                json.dump({'source': args.source, 'headless': args.headless, 'frames': meter.frames,
+                           'seconds': round(meter.elapsed, 4), 'fps': round(meter.fps, 2), 'roi': state.params}, f, indent=4)
+        if action == 'save':
+            save_roi(source, state, args.config, args.image)
+        else:
+            print("저장하지 않고 종료합니다.")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
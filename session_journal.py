@@ -0,0 +1,195 @@
+# session_journal.py
+"""[신규] 편집 세션 자동 저장 (추가 전용 작업 저널 + 주기적 스냅샷).
+
+편집마다 바뀐 행만 한 줄(JSON)로 저널에 덧붙이고, 일정 횟수마다 전체 상태를 바이너리 맵(.mapb)
+스냅샷으로 압축한 뒤 저널을 비웁니다. 파일 쓰기는 백그라운드 스레드가 맡으므로 편집 한 번의
+비용은 바뀐 행 수에만 비례합니다. 비정상 종료 후에는 스냅샷 + 저널 꼬리를 재생해 복구합니다.
+
+저널 한 줄: [순번, 동작, 종류, ...]
+    ["ins", kind, i, 행 값 목록, extras 목록]   i 위치에 행들을 끼워 넣음
+    ["del", kind, i, n]                         i부터 n개 삭제
+    ["set", kind, 행 번호 목록, 행 값 목록, extras 목록]
+"""
+import json
+import os
+import queue
+import tempfile
+import threading
+import traceback
+
+import numpy as np
+
+from app_config import Config
+from edit_history import DeleteRows, EditGroup, InsertRows, UpdateRows
+from map_binary import MapBundle, write_bundle
+
+SESSION_MAP = "session"
+
+
+def _cols(data, fields):
+    return np.column_stack([data[f] for f in fields]).tolist() if len(data) else []
+
+
+def command_ops(command, forward, stores):
+    """되돌리기 명령 하나가 저장소에 미친 효과 → 저널 동작 목록 (forward=False면 취소한 효과)"""
+    if isinstance(command, EditGroup):
+        commands = command.commands if forward else reversed(command.commands)
+        return [op for c in commands for op in command_ops(c, forward, stores)]
+    fields = stores[command.kind].FIELDS
+    if isinstance(command, InsertRows):
+        if forward != isinstance(command, DeleteRows):
+            return [["ins", command.kind, command.i, _cols(command.data, fields), command.extras]]
+        return [["del", command.kind, command.i, len(command.data)]]
+    if isinstance(command, UpdateRows):
+        data, extras = command.new if forward else command.old
+        return [["set", command.kind, command.rows, _cols(data, fields), extras]]
+    raise TypeError(f"알 수 없는 명령: {type(command).__name__}")
+
+
+def apply_op(stores, op):
+    """저널 동작 하나를 저장소에 재생"""
+    kind = op[1]
+    store = stores[kind]
+    if op[0] == "ins":
+        _, _, i, cols, extras = op
+        for k, (vals, extra) in enumerate(zip(cols, extras)):
+            store.insert(i + k, {**dict(zip(store.FIELDS, vals)), **(extra or {})})
+    elif op[0] == "del":
+        store.delete(op[2], op[3])
+    elif op[0] == "set":
+        _, _, rows, cols, extras = op
+        data = store.rows_at(rows)[0]
+        for k, f in enumerate(store.FIELDS):
+            data[f] = [vals[k] for vals in cols]
+        store.put_rows(rows, data, extras)
+    else:
+        raise ValueError(f"알 수 없는 저널 동작: {op[0]}")
+
+
+class SessionJournal:
+    """자동 저장 저널. EditHistory.listeners에 record를 걸어 두면 편집마다 기록됩니다."""
+    def __init__(self, directory=None, compact_ops=None):
+        self.directory = directory or Config.AUTOSAVE_DIR or os.path.join(tempfile.gettempdir(), "map_editor_autosave")
+        self.snapshot_path = os.path.join(self.directory, "session.mapb")
+        self.journal_path = os.path.join(self.directory, "session.journal")
+        self.compact_ops = Config.AUTOSAVE_COMPACT_OPS if compact_ops is None else compact_ops
+        self.stores = None
+        self.meta = {}
+        self.seq = 0
+        self.dirty = False         # 마지막 저장 이후 편집이 있었는지
+        self._pending = 0          # 마지막 스냅샷 이후 기록한 동작 수
+        self.compact_due = False   # 스냅샷을 찍을 차례 (편집 처리가 끝난 뒤 compact_if_due로)
+        self._queue = queue.Queue()
+        self._thread = None
+        self.error = None          # 백그라운드 쓰기 오류 (있으면 메시지)
+
+    # --- 기록 ---
+    def has_session(self):
+        """복구할 이전 세션이 남아 있는지"""
+        return os.path.exists(self.snapshot_path)
+
+    def start(self, stores, meta=None):
+        """새 세션 시작: 현재 상태를 스냅샷으로 쓰고 저널을 비움"""
+        self.stores = stores
+        self.dirty = False
+        self.compact(meta)
+
+    def record(self, command, forward):
+        """EditHistory 리스너: 편집 효과를 저널에 덧붙임 (직렬화만 여기서, 쓰기는 백그라운드).
+        [수정] 리스너 안에서는 호출한 쪽이 저장소를 아직 고치는 중일 수 있으므로 스냅샷을 바로 찍지 않고
+        compact_due만 표시합니다. 찍는 시점은 편집이 끝난 뒤의 compact_if_due (에디터가 유휴 시 호출)이고,
+        그 전에 다음 편집이 오면 그 편집의 동작을 덧붙인 뒤 찍습니다."""
+        if self.stores is None: return
+        lines = []
+        for op in command_ops(command, forward, self.stores):
+            self.seq += 1
+            lines.append(json.dumps([self.seq] + op, ensure_ascii=False, separators=(",", ":")))
+        self._put(("append", "\n".join(lines) + "\n"))
+        self.dirty = True
+        self._pending += len(lines)
+        if self.compact_due: self.compact()
+        elif self._pending >= self.compact_ops: self.compact_due = True
+
+    def compact_if_due(self):
+        """[신규] 표시된 스냅샷이 있으면 지금 찍음 (편집 처리가 끝난 뒤에 호출)"""
+        if self.compact_due: self.compact()
+
+    def compact(self, meta=None):
+        """현재 상태 전체를 스냅샷으로 (저장소 복사는 메인 스레드에서, 파일 쓰기는 백그라운드)"""
+        if self.stores is None: return
+        if meta is not None: self.meta = dict(meta)
+        snapshot = {kind: store.copy() for kind, store in self.stores.items()}
+        snapshot.update(self.meta, seq=self.seq)
+        self._pending = 0
+        self.compact_due = False
+        self._put(("snapshot", snapshot))
+
+    def mark_saved(self):
+        self.dirty = False
+
+    def flush(self):
+        """대기 중인 쓰기가 끝날 때까지 기다림"""
+        if self._thread is not None: self._queue.join()
+
+    def close(self, discard=False):
+        """저널 종료. discard면 세션 파일 삭제 (저장 후 정상 종료)"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if discard:
+            for path in (self.snapshot_path, self.journal_path):
+                if os.path.exists(path): os.remove(path)
+
+    def _put(self, item):
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+            self._thread.start()
+        self._queue.put(item)
+
+    def _run(self):
+        f = open(self.journal_path, "a", encoding="utf-8")
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None: return
+                    if item[0] == "append":
+                        f.write(item[1])
+                        f.flush()
+                        if Config.AUTOSAVE_FSYNC: os.fsync(f.fileno())
+                    else:
+                        # 스냅샷을 먼저 교체한 뒤 저널을 비움. 그 사이에 죽어도 순번으로 중복 재생을 막습니다.
+                        write_bundle(self.snapshot_path, {SESSION_MAP: item[1]})
+                        f.close()
+                        f = open(self.journal_path, "w", encoding="utf-8")
+                except Exception as e:
+                    self.error = str(e)
+                    traceback.print_exc()
+                finally:
+                    self._queue.task_done()
+        finally:
+            f.close()
+
+    # --- 복구 ---
+    def recover(self, stores):
+        """스냅샷 + 저널 꼬리로 stores를 복원하고 세션 메타데이터(이미지 경로 등)를 반환.
+        마지막 줄이 쓰다 만 상태면 그 앞까지만 재생합니다."""
+        with MapBundle.open(self.snapshot_path) as bundle:
+            meta = bundle.fill_stores(SESSION_MAP, stores)
+        self.seq = meta.pop("seq", 0)
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if entry[0] <= self.seq: continue
+                    apply_op(stores, entry[1:])
+                    self.seq = entry[0]
+                    replayed += 1
+        meta["replayed"] = replayed
+        return meta
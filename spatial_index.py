@@ -0,0 +1,157 @@
+# spatial_index.py
+import numpy as np
+
+from map_store import as_columns
+
+
+class _SortedIndex:
+    """[신규] 한 축(key)으로 정렬된 NumPy 배열 기반 공간 인덱스의 공통부.
+    항목은 리스트 위치(인덱스)로 식별하며, 삽입/삭제 시 뒤쪽 인덱스를 한 번에 밀고 당깁니다.
+    [수정] 값 변경(set)은 정렬 위치가 그대로면 그 행만 덮어씀 (드래그/크기 조절). 정렬 위치가 바뀌는 변경과
+    중간 삽입/삭제는 배열 복사라 O(n)이지만 저장소(ItemStore)의 중간 삽입/삭제도 O(n)이고 벡터 연산이라
+    10만 개에서 1~2ms 수준입니다 (트리로 바꿔도 위치 번호를 미는 비용은 남음)."""
+    FIELDS = ()   # 저장할 dict 키 (첫 번째가 정렬 축)
+
+    def __init__(self):
+        self.rebuild([])
+
+    def __len__(self):
+        return len(self._id)
+
+    def rebuild(self, items):
+        """리스트 전체로 인덱스를 다시 만듭니다."""
+        cols = as_columns(items, self.FIELDS)
+        order = np.argsort(cols[:, 0], kind="stable")
+        self._cols = cols[order]
+        self._id = order.astype(np.int64)
+        self._pos = None   # id → 정렬 위치 (지연 생성)
+
+    def _where(self, i):
+        if self._pos is None:
+            self._pos = np.empty(len(self._id), np.int64)
+            self._pos[self._id] = np.arange(len(self._id))
+        return self._pos[i]
+
+    def _drop(self, i):
+        k = self._where(i)
+        self._cols = np.delete(self._cols, k, axis=0)
+        self._id = np.delete(self._id, k)
+
+    def _put(self, i, item):
+        row = np.array([item[f] for f in self.FIELDS], np.int64)
+        k = np.searchsorted(self._cols[:, 0], row[0], side="right")
+        self._cols = np.insert(self._cols, k, row, axis=0)
+        self._id = np.insert(self._id, k, i)
+        self._pos = None
+
+    def set(self, i, item):
+        """i번째 항목 갱신 (i == len 이면 추가)"""
+        if i < len(self._id):
+            k = self._where(i)
+            row = np.array([item[f] for f in self.FIELDS], np.int64)
+            keys = self._cols[:, 0]
+            if (k == 0 or keys[k - 1] <= row[0]) and (k == len(keys) - 1 or row[0] <= keys[k + 1]):
+                self._cols[k] = row   # 정렬 위치가 그대로면 제자리 갱신 (위치 표도 그대로 유효)
+                return
+            self._drop(i)
+        self._put(i, item)
+
+    def insert(self, i, item):
+        """리스트 중간 삽입: i 이상의 인덱스를 하나씩 뒤로 밉니다."""
+        self._id[self._id >= i] += 1
+        self._put(i, item)
+
+    def remove(self, i):
+        """리스트에서 i번째를 뺀 것과 같게 인덱스를 갱신"""
+        self._drop(i)
+        self._id[self._id > i] -= 1
+        self._pos = None
+
+    def _span(self, lo, hi):
+        """정렬 축 값이 lo < v < hi 인 구간 (이진 탐색)"""
+        keys = self._cols[:, 0]
+        return np.searchsorted(keys, lo, side="right"), np.searchsorted(keys, hi, side="left")
+
+
+class PlatformIndex(_SortedIndex):
+    """[신규] 수평 발판 인덱스: y로 정렬하고 y 범위를 이진 탐색한 뒤 x 구간을 벡터 검사합니다."""
+    FIELDS = ("y", "x_start", "x_end")
+
+    def hit(self, rx, ry, tolerance=6):
+        """(rx, ry)에서 세로 거리가 가장 가까운 발판 인덱스 (MapLogic.find_clicked_platform과 같은 판정)"""
+        a, b = self._span(ry - tolerance, ry + tolerance)
+        c = self._cols[a:b]
+        ok = np.flatnonzero((c[:, 1] <= rx) & (rx <= c[:, 2]))
+        if len(ok) == 0: return None
+        ids = self._id[a:b][ok]
+        dist = np.abs(c[ok, 0] - ry)
+        best = np.lexsort((ids, dist))[0]
+        return int(ids[best])
+
+    def query_rect(self, x1, y1, x2, y2):
+        """사각형 [x1, x2] x [y1, y2]와 겹치는 발판 인덱스 목록"""
+        a, b = self._span(y1 - 1, y2 + 1)
+        c = self._cols[a:b]
+        ok = (c[:, 1] <= x2) & (c[:, 2] >= x1)
+        return np.sort(self._id[a:b][ok])
+
+
+    def query_intervals(self, y, x_start, x_end, y_tol=0, x_tol=0):
+        """[신규] 구간 여러 개를 한 번에 조회: |dy| <= y_tol 이고 x 구간이 x_tol 이내로 겹치거나
+        맞닿는 (질의 번호, 발판 인덱스) 쌍 배열을 반환합니다."""
+        y, x_start, x_end = (np.asarray(v, np.int64).ravel() for v in (y, x_start, x_end))
+        keys = self._cols[:, 0]
+        lo = np.searchsorted(keys, y - y_tol, side="left")
+        hi = np.searchsorted(keys, y + y_tol, side="right")
+        count = hi - lo
+        q = np.repeat(np.arange(len(y)), count)
+        k = np.repeat(lo, count) + (np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count))
+        c = self._cols[k]
+        ok = (c[:, 1] <= x_end[q] + x_tol) & (c[:, 2] >= x_start[q] - x_tol)
+        return q[ok], self._id[k[ok]]
+
+
+class PointIndex(_SortedIndex):
+    """[신규] 점 객체(포탈 입구, 스폰) 인덱스: x로 정렬 후 y와 거리를 벡터 검사합니다."""
+    def __init__(self, x_key, y_key):
+        self.FIELDS = (x_key, y_key)
+        super().__init__()
+
+    def hit(self, rx, ry, tolerance=10):
+        """반경 tolerance 안에서 가장 가까운 점의 인덱스"""
+        a, b = self._span(rx - tolerance, rx + tolerance)
+        c = self._cols[a:b]
+        d2 = (c[:, 0] - rx) ** 2 + (c[:, 1] - ry) ** 2
+        ok = np.flatnonzero(d2 < tolerance * tolerance)
+        if len(ok) == 0: return None
+        ids = self._id[a:b][ok]
+        best = np.lexsort((ids, d2[ok]))[0]
+        return int(ids[best])
+
+    def query_rect(self, x1, y1, x2, y2):
+        a, b = self._span(x1 - 1, x2 + 1)
+        c = self._cols[a:b]
+        ok = (c[:, 1] >= y1) & (c[:, 1] <= y2)
+        return np.sort(self._id[a:b][ok])
+
+
+class RopeIndex(_SortedIndex):
+    """[신규] 밧줄/사다리(세로 구간) 인덱스: x로 정렬 후 y 구간을 벡터 검사합니다."""
+    FIELDS = ("x", "y_top", "y_bottom")
+
+    def hit(self, rx, ry, tolerance=6):
+        """(rx, ry)에서 가로 거리가 가장 가까운 밧줄 인덱스 (MapLogic.find_clicked_rope와 같은 판정)"""
+        a, b = self._span(rx - tolerance, rx + tolerance)
+        c = self._cols[a:b]
+        ok = np.flatnonzero((c[:, 1] <= ry) & (ry <= c[:, 2]))
+        if len(ok) == 0: return None
+        ids = self._id[a:b][ok]
+        dist = np.abs(c[ok, 0] - rx)
+        best = np.lexsort((ids, dist))[0]
+        return int(ids[best])
+
+    def query_rect(self, x1, y1, x2, y2):
+        a, b = self._span(x1 - 1, x2 + 1)
+        c = self._cols[a:b]
+        ok = (c[:, 1] <= y2) & (c[:, 2] >= y1)
+        return np.sort(self._id[a:b][ok])
@@ -0,0 +1,461 @@
+# stitch_maps.py
+"""[신규] 미니맵 캡처 여러 장을 하나의 큰 맵 이미지로 잇기.
+
+    1. 정합: 겹칠 만한 캡처 쌍마다 모든 이동량의 겹친 영역 정규화 상관을 FFT로 한꺼번에 구해 가장 잘 맞는
+       위치를 고릅니다. 점수가 낮으면 ORB 특징점 매칭으로 다시 시도합니다. 쌍 정합은 워커 프로세스들이 나눠 처리합니다.
+       쌍은 캡처 순서상 이웃에서 시작해, 지금까지의 배치로 겹치는 쌍과 떨어진 묶음을 이을 축소본 후보를
+       몇 번 더 찾아 정합합니다 (또는 전체 쌍).
+    2. 배치: 인정된 쌍들로 캡처 위치를 최소 제곱으로 풀고, 잘 맞지 않는 쌍은 빼고 다시 풉니다.
+    3. 합성: 가장자리를 서서히 섞으며(feather) 한 장으로 합칩니다.
+    4. 조각 맵: 캡처와 이름이 같은 맵 JSON이 있으면 합친 좌표로 옮기고 중복을 합쳐 하나의 맵으로 저장합니다.
+
+출력: world.png (합친 이미지), world.stitch.json (캡처별 위치), world.json (합친 맵, 조각 맵이 있을 때)
+
+사용 예:
+    python stitch_maps.py captures/ --out world.png --workers 8
+    python stitch_maps.py "captures/*.png" --out world.png --maps pieces/ --all-pairs
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from app_config import Config
+from batch_detect import collect_images
+from fix_json import migrate_data
+from image_store import decode_image, encode_image
+from map_bundle import KINDS, MapFile, new_stores
+from platform_detector import merge_platforms
+
+
+# --- 쌍 정합 ---
+@lru_cache(maxsize=16)
+def _load_gray(path):
+    img = decode_image(path)
+    if img is None: raise ValueError(f"이미지를 열 수 없습니다: {path}")
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def _overlap_score(a, b, d, min_overlap):
+    """b를 a 기준 d=(dx, dy)에 놓았을 때 겹친 영역의 정규화 상관 (겹침이 작으면 -1)"""
+    dx, dy = d
+    x1, y1 = max(0, dx), max(0, dy)
+    x2, y2 = min(a.shape[1], dx + b.shape[1]), min(a.shape[0], dy + b.shape[0])
+    if x2 <= x1 or y2 <= y1: return -1.0
+    if (x2 - x1) * (y2 - y1) < min_overlap * min(a.size, b.size): return -1.0
+    pa = a[y1:y2, x1:x2].astype(np.float64)
+    pb = b[y1 - dy:y2 - dy, x1 - dx:x2 - dx].astype(np.float64)
+    pa -= pa.mean()
+    pb -= pb.mean()
+    denom = np.sqrt((pa * pa).sum() * (pb * pb).sum())
+    return float((pa * pb).sum() / denom) if denom > 0 else 0.0
+
+
+def _orb_offset(a, b):
+    """ORB 특징점 매칭으로 구한 b의 a 기준 위치 (이동량 중앙값, 찾지 못하면 None)"""
+    orb = cv2.ORB_create(1000)
+    ka, da = orb.detectAndCompute(a, None)
+    kb, db = orb.detectAndCompute(b, None)
+    if da is None or db is None: return None
+    matches = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True).match(da, db)
+    if len(matches) < 4: return None
+    diffs = np.array([np.subtract(ka[m.queryIdx].pt, kb[m.trainIdx].pt) for m in matches])
+    d = np.median(diffs, axis=0)
+    if np.count_nonzero(np.all(np.abs(diffs - d) <= 2, axis=1)) < 4: return None
+    return int(round(d[0])), int(round(d[1]))
+
+
+def _ncc_map(a, b, min_overlap):
+    """모든 이동량에 대한 겹친 영역 정규화 상관을 FFT 상관 몇 번으로 한꺼번에 계산 (마스크 정규화 상관).
+    0으로 채워 두 영상 크기의 합 이상으로 늘리므로 순환 겹침 없이 (dx, dy) = (열, 행) 또는 음수는 크기만큼 뺀 값입니다.
+    겹친 면적이 작은 쪽의 min_overlap 비율보다 작은 이동량은 -1"""
+    h = cv2.getOptimalDFTSize(a.shape[0] + b.shape[0])
+    w = cv2.getOptimalDFTSize(a.shape[1] + b.shape[1])
+    a = a - a.mean()
+    b = b - b.mean()
+    fa, fa2, fma = (np.fft.rfft2(x, (h, w)) for x in (a, a * a, np.ones_like(a)))
+    fb, fb2, fmb = (np.conj(np.fft.rfft2(x, (h, w))) for x in (b, b * b, np.ones_like(b)))
+
+    def corr(x, y):
+        return np.fft.irfft2(x * y, (h, w))
+    n = np.maximum(np.round(corr(fma, fmb)), 1)
+    sa, sb = corr(fa, fmb), corr(fma, fb)
+    num = corr(fa, fb) - sa * sb / n
+    den = np.sqrt(np.maximum(corr(fa2, fmb) - sa * sa / n, 0) * np.maximum(corr(fma, fb2) - sb * sb / n, 0))
+    ok = (n >= min_overlap * min(a.size, b.size)) & (den > 1e-6 * n)
+    return np.where(ok, num / np.where(ok, den, 1), -1.0), (h, w)
+
+
+def _ambiguous_peak(ncc, y, x, radius):
+    """[신규] 상관 지도의 최고점 (y, x)를 믿기 어려운지: 주변 radius 밖의 다음 봉우리와 차이가 STITCH_MIN_MARGIN
+    미만이거나, 3칸 안에 겹침 부족(-1)인 이동량이 있어 진짜 위치가 겹침 하한 밖에 있을 수 있는 경우"""
+    rows, cols = ncc.shape
+
+    def window(r):
+        return np.ix_(np.arange(y - r, y + r + 1) % rows, np.arange(x - r, x + r + 1) % cols)
+    if ncc[window(3)].min() < -0.5: return True
+    rest = ncc.copy()
+    rest[window(radius)] = -1.0
+    return ncc[y, x] - rest.max() < Config.STITCH_MIN_MARGIN
+
+
+def register_pair(a, b, min_overlap=None):
+    """회색조 캡처 a, b → (b의 a 기준 위치 (dx, dy), 점수).
+    주파수 영역 정규화 상관으로 가장 잘 맞는 이동량을 찾고 (큰 캡처는 축소본에서 찾은 뒤 단계별로 다듬음),
+    점수가 낮으면 ORB 특징점 매칭으로 다시 시도합니다.
+    [수정] 최고점이 애매하면 (_ambiguous_peak) ORB가 같은 위치를 가리킬 때만 인정하고, 아니면 점수 0"""
+    min_overlap = Config.STITCH_MIN_OVERLAP if min_overlap is None else min_overlap
+    # 큰 캡처는 축소본에서 전체 탐색 후 한 단계씩 키우며 주변 ±1만 다시 확인
+    levels = [(a, b)]
+    while max(levels[-1][0].shape + levels[-1][1].shape) > Config.STITCH_COARSE_SIZE:
+        levels.append((cv2.pyrDown(levels[-1][0]), cv2.pyrDown(levels[-1][1])))
+    ca, cb = levels[-1]
+    ncc, (h, w) = _ncc_map(ca.astype(np.float64), cb.astype(np.float64), min_overlap)
+    y, x = np.unravel_index(int(np.argmax(ncc)), ncc.shape)
+    ambiguous = _ambiguous_peak(ncc, y, x, max(4, min(cb.shape) // 5))
+    d = (int(x) if x < ca.shape[1] else int(x) - w, int(y) if y < ca.shape[0] else int(y) - h)
+    for la, lb in reversed(levels[:-1]):
+        near = [(2 * d[0] + i, 2 * d[1] + j) for i in (-1, 0, 1) for j in (-1, 0, 1)]
+        d = max((_overlap_score(la, lb, c, min_overlap), c) for c in near)[1]
+    score = _overlap_score(a, b, d, min_overlap)
+    if score < Config.STITCH_MIN_SCORE:
+        c = _orb_offset(a, b)
+        if c is not None:
+            s = _overlap_score(a, b, c, min_overlap)
+            if s > score: score, d = s, c
+    elif ambiguous:
+        c = _orb_offset(a, b)
+        if c is None or max(abs(c[0] - d[0]), abs(c[1] - d[1])) > 2: score = 0.0
+    return d, score
+
+
+def _register_job(job):
+    """워커: (i, j, 경로 i, 경로 j) → (i, j, (dx, dy), 점수, 오류)"""
+    i, j, path_a, path_b = job
+    try:
+        d, score = register_pair(_load_gray(path_a), _load_gray(path_b))
+        return i, j, d, score, None
+    except Exception as e:
+        return i, j, (0, 0), -1.0, f"{type(e).__name__}: {e}"
+
+
+def candidate_pairs(n, neighbors=None, all_pairs=False):
+    """처음 정합할 캡처 쌍 목록 (기본: 캡처 순서상 neighbors개 이내 이웃, 나머지는 search_pairs가 배치로 찾음)"""
+    k = n if all_pairs else (Config.STITCH_NEIGHBORS if neighbors is None else neighbors)
+    return [(i, j) for i in range(n) for j in range(i + 1, min(n, i + k + 1))]
+
+
+def _thumbnails(paths):
+    """[신규] 캡처별 (크기 (h, w), 축소본). 모든 캡처를 같은 단계만큼 줄여 축소본끼리의 이동량 배율이 같음"""
+    sizes, thumbs = [], []
+    for path in paths:
+        gray = _load_gray(path)
+        sizes.append(gray.shape[:2])
+        while max(gray.shape) > Config.STITCH_THUMB_SIZE: gray = cv2.pyrDown(gray)
+        thumbs.append(gray)
+    levels = [int(np.ceil(np.log2(max(max(size) / Config.STITCH_THUMB_SIZE, 1)))) for size in sizes]
+    for k, level in enumerate(levels):   # 작은 캡처도 가장 큰 캡처와 같은 단계까지
+        for _ in range(max(levels) - level): thumbs[k] = cv2.pyrDown(thumbs[k])
+    return sizes, [t.astype(np.float64) for t in thumbs]
+
+
+def _overlap_ratio(pa, sa, pb, sb):
+    """위치 pa, pb에 놓인 크기 sa, sb (h, w) 캡처의 겹친 면적 / 작은 쪽 면적"""
+    w = min(pa[0] + sa[1], pb[0] + sb[1]) - max(pa[0], pb[0])
+    h = min(pa[1] + sa[0], pb[1] + sb[0]) - max(pa[1], pb[1])
+    return max(w, 0) * max(h, 0) / min(sa[0] * sa[1], sb[0] * sb[1])
+
+
+def _overlap_pairs(comp, sizes, min_overlap):
+    """[신규] 한 묶음의 배치에서 min_overlap 이상 겹치는 캡처 쌍 (캡처보다 큰 격자 칸으로 나눠 주변 칸끼리만 비교)"""
+    cell = max(max(sizes[k]) for k in comp)
+    grid = {}
+    for k, (x, y) in comp.items(): grid.setdefault((x // cell, y // cell), []).append(k)
+    pairs = set()
+    for (cx, cy), nodes in grid.items():
+        near = [j for gx in (cx - 1, cx, cx + 1) for gy in (cy - 1, cy, cy + 1) for j in grid.get((gx, gy), ())]
+        for i in nodes:
+            pairs.update((i, j) for j in near if i < j and _overlap_ratio(comp[i], sizes[i], comp[j], sizes[j]) >= min_overlap)
+    return pairs
+
+
+def _bridge_pairs(comps, thumbs, tried, scores, k, min_overlap):
+    """[신규] 떨어진 묶음을 이을 후보: 가장 큰 묶음 밖의 캡처마다 다른 묶음 캡처 중 축소본 상관이 높은
+    아직 정합하지 않은 k개 (축소본 상관은 scores에 모아 두고 다음 단계에서 다시 씀)"""
+    group = {node: g for g, comp in enumerate(comps) for node in comp}
+    pairs = set()
+    for g, comp in enumerate(comps[1:], 1):
+        for i in comp:
+            ranked = []
+            for j, gj in group.items():
+                pair = (min(i, j), max(i, j))
+                if gj == g or pair in tried: continue
+                if pair not in scores: scores[pair] = float(_ncc_map(thumbs[pair[0]], thumbs[pair[1]], min_overlap)[0].max())
+                ranked.append((scores[pair], pair))
+            pairs.update(pair for _, pair in sorted(ranked, reverse=True)[:k])
+    return pairs
+
+
+def search_pairs(paths, neighbors=None, all_pairs=False, workers=None, progress=None, rounds=None):
+    """[신규] 겹칠 쌍을 찾아 가며 정합한 결과 목록.
+    캡처 순서상 이웃부터 정합한 뒤, 매 단계 지금까지의 결과로 묶음별 배치를 구해 (1) 같은 묶음 안에서 배치상
+    겹치는데 아직 정합하지 않은 쌍과 (2) 떨어진 묶음을 이을 축소본 후보를 정합합니다. 새 쌍이 없으면 끝.
+    전체 쌍을 정합하지 않으므로 정합 횟수는 대략 캡처 수에 비례하고, 축소본 비교만 묶음 밖 캡처 수 × 전체입니다."""
+    rounds = Config.STITCH_SEARCH_ROUNDS if rounds is None else rounds
+    n = len(paths)
+    tried, results = set(), []
+
+    def run(pairs):
+        pairs = sorted(set(pairs) - tried)
+        tried.update(pairs)
+        results.extend(register_all(paths, pairs, workers, progress))
+        return len(pairs)
+    run(candidate_pairs(n, neighbors, all_pairs))
+    if all_pairs or n < 3: return results
+    sizes, thumbs = _thumbnails(paths)
+    scores = {}
+    for _ in range(rounds):
+        comps = layout_components(n, results)
+        pairs = set().union(*(_overlap_pairs(comp, sizes, Config.STITCH_MIN_OVERLAP) for comp in comps))
+        if len(comps) > 1:
+            pairs |= _bridge_pairs(comps, thumbs, tried, scores, Config.STITCH_BRIDGE_PAIRS, Config.STITCH_MIN_OVERLAP)
+        if not run(pairs): break
+    return results
+
+
+def register_all(paths, pairs, workers=None, progress=None):
+    """쌍 정합을 워커 풀에서 실행해 결과 목록 반환"""
+    jobs = [(i, j, paths[i], paths[j]) for i, j in pairs]
+    if len(jobs) <= 1 or workers == 1:
+        results = map(_register_job, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        # 이웃 쌍이 같은 워커에 몰리도록 연속 구간으로 나눔 (워커별 이미지 캐시 재사용)
+        results = pool.map(_register_job, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1))))
+    out = []
+    try:
+        for r in results:
+            out.append(r)
+            if progress: progress(*r)
+    finally:
+        if pool is not None: pool.shutdown()
+    return out
+
+
+# --- 배치 ---
+def _accepted(results, min_score):
+    return sorted(((i, j, d, s) for i, j, d, s, err in results if err is None and s >= min_score), key=lambda e: -e[3])
+
+
+def layout_components(n, results, min_score=None):
+    """[신규] 쌍 정합 결과 → 연결 묶음별 초기 위치 [{캡처 번호: (x, y)}] (큰 묶음부터, 각 묶음의 첫 캡처가 원점).
+    점수가 높은 쌍부터 최대 신장 트리를 만들어 위치를 정합니다."""
+    min_score = Config.STITCH_MIN_SCORE if min_score is None else min_score
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    adj = {}
+    for i, j, d, _ in _accepted(results, min_score):
+        if find(i) == find(j): continue
+        parent[find(i)] = find(j)
+        adj.setdefault(i, []).append((j, d[0], d[1]))
+        adj.setdefault(j, []).append((i, -d[0], -d[1]))
+    groups = {}
+    for k in range(n): groups.setdefault(find(k), []).append(k)
+    comps = []
+    for group in sorted(groups.values(), key=lambda g: (-len(g), g[0])):
+        pos = {group[0]: (0, 0)}
+        stack = [group[0]]
+        while stack:
+            i = stack.pop()
+            for j, dx, dy in adj.get(i, ()):
+                if j not in pos:
+                    pos[j] = (pos[i][0] + dx, pos[i][1] + dy)
+                    stack.append(j)
+        comps.append(pos)
+    return comps
+
+
+def solve_layout(n, results, min_score=None, max_residual=3.0):
+    """쌍 정합 결과 → ({캡처 번호: (x, y)}, 사용한 쌍 목록).
+    가장 큰 연결 묶음의 초기 위치(layout_components)와 max_residual 이내로 맞는 쌍만 남겨 최소 제곱으로 다듬습니다.
+    그 묶음의 첫 캡처가 원점입니다."""
+    min_score = Config.STITCH_MIN_SCORE if min_score is None else min_score
+    edges = _accepted(results, min_score)
+    pos = layout_components(n, results, min_score)[0]
+    comp = sorted(pos)
+    used = [e for e in edges if e[0] in pos and e[1] in pos and
+            max(abs(pos[e[1]][0] - pos[e[0]][0] - e[2][0]), abs(pos[e[1]][1] - pos[e[0]][1] - e[2][1])) <= max_residual]
+    if len(comp) > 1:
+        col = {node: k for k, node in enumerate(comp[1:])}   # 첫 캡처는 고정 (0, 0)
+        a = np.zeros((len(used), len(col)))
+        rhs = np.array([d for _, _, d, _ in used], float)
+        for r, (i, j, _, _) in enumerate(used):
+            if j in col: a[r, col[j]] += 1
+            if i in col: a[r, col[i]] -= 1
+        w = np.sqrt([s for _, _, _, s in used])[:, None]
+        sol = np.linalg.lstsq(a * w, rhs * w, rcond=None)[0]
+        pos.update((node, (int(round(sol[k, 0])), int(round(sol[k, 1])))) for node, k in col.items())
+    return pos, used
+
+
+# --- 합성 ---
+def _feather(h, w, width):
+    ry = np.minimum(np.arange(h) + 1, np.arange(h)[::-1] + 1)
+    rx = np.minimum(np.arange(w) + 1, np.arange(w)[::-1] + 1)
+    return np.minimum.outer(np.minimum(ry / width, 1), np.minimum(rx / width, 1)).astype(np.float32)
+
+
+def blend(paths, positions, feather=None):
+    """캡처들을 위치대로 합성 → (이미지, 원점 이동량, {캡처 번호: (h, w)}).
+    누적 가중 평균을 캡처 영역에만 갱신합니다."""
+    feather = Config.STITCH_FEATHER if feather is None else feather
+    sizes = {k: _load_gray(paths[k]).shape[:2] for k in positions}
+    x0 = min(x for x, _ in positions.values())
+    y0 = min(y for _, y in positions.values())
+    width = max(positions[k][0] + sizes[k][1] for k in positions) - x0
+    height = max(positions[k][1] + sizes[k][0] for k in positions) - y0
+    world = np.zeros((height, width, 3), np.float32)
+    weight = np.zeros((height, width), np.float32)
+    for k in sorted(positions):
+        img = decode_image(paths[k]).astype(np.float32)
+        h, w = img.shape[:2]
+        x, y = positions[k][0] - x0, positions[k][1] - y0
+        wk = _feather(h, w, feather)
+        region, wr = world[y:y + h, x:x + w], weight[y:y + h, x:x + w]
+        total = wr + wk
+        region *= (wr / total)[..., None]
+        region += img * (wk / total)[..., None]
+        wr[:] = total
+    return np.clip(world + 0.5, 0, 255).astype(np.uint8), (x0, y0), sizes
+
+
+# --- 조각 맵 ---
+def translate_map(data, dx, dy):
+    """save_data 형식 맵을 (dx, dy)만큼 옮긴 사본. 다른 맵으로 가는 포탈의 출구는 그 맵 좌표라 그대로 둡니다."""
+    out = {}
+    out["platforms"] = [{**{k: v for k, v in p.items() if k != "id"}, "y": p["y"] + dy,
+                         "x_start": p["x_start"] + dx, "x_end": p["x_end"] + dx} for p in data.get("platforms") or []]
+    portals = []
+    for p in data.get("portals") or []:
+        q = {**p, "in_x": p["in_x"] + dx, "in_y": p["in_y"] + dy}
+        if not p.get("target_map"): q.update(out_x=p["out_x"] + dx, out_y=p["out_y"] + dy)
+        portals.append(q)
+    out["portals"] = portals
+    out["spawns"] = [{**s, "x": s["x"] + dx, "y": s["y"] + dy} for s in data.get("spawns") or []]
+    out["ropes"] = [{**r, "x": r["x"] + dx, "y_top": r["y_top"] + dy, "y_bottom": r["y_bottom"] + dy}
+                    for r in data.get("ropes") or []]
+    return out
+
+
+def _near(items, item, keys, tol):
+    return any(all(abs(it[k] - item[k]) <= tol for k in keys) and it.get("target_map") == item.get("target_map")
+               for it in items)
+
+
+def merge_piece_maps(pieces, name="stitched", tol=None):
+    """[(맵 dict, dx, dy)] → 합친 save_data 형식 맵. 발판은 merge_platforms로, 포탈/스폰/밧줄은 tol 이내 중복을 건너뜀"""
+    tol = Config.STITCH_DEDUP_TOL if tol is None else tol
+    stores = new_stores()
+    portals, spawns, ropes = [], [], []
+    for data, dx, dy in pieces:
+        moved = translate_map(data, dx, dy)
+        merge_platforms(stores["platforms"], moved["platforms"])
+        for p in moved["portals"]:
+            if not _near(portals, p, ("in_x", "in_y"), tol): portals.append(p)
+        for s in moved["spawns"]:
+            if not _near(spawns, s, ("x", "y"), tol): spawns.append(s)
+        for r in moved["ropes"]:
+            if not _near(ropes, r, ("x", "y_top", "y_bottom"), tol): ropes.append(r)
+    merged = {"metadata": {"name": name, "stitched_from": len(pieces)},
+              "platforms": stores["platforms"].to_records(), "portals": portals, "spawns": spawns}
+    if ropes: merged["ropes"] = ropes
+    migrate_data(merged, name)   # id/스키마 버전 부여
+    return merged
+
+
+def piece_map_path(image_path, maps_dir=None):
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    for ext in (".json", ".mapb"):
+        path = os.path.join(maps_dir or os.path.dirname(image_path), stem + ext)
+        if os.path.exists(path): return path
+    return None
+
+
+def load_piece_map(path):
+    with MapFile.open(path) as map_file:
+        stores, _ = map_file.open_map(map_file.names[0])
+    return {kind: stores[kind].to_records() for kind in KINDS}
+
+
+def stitch(paths, out_path, maps_dir=None, workers=None, neighbors=None, all_pairs=False, progress=None):
+    """캡처 목록을 이어 out_path에 저장하고 요약 dict 반환"""
+    t0 = time.perf_counter()
+    results = search_pairs(paths, neighbors, all_pairs, workers, progress)
+    t1 = time.perf_counter()
+    positions, used = solve_layout(len(paths), results)
+    world, (x0, y0), sizes = blend(paths, positions)
+    encode_image(out_path, world)
+    stem = os.path.splitext(out_path)[0]
+
+    captures, pieces = [], []
+    for k in sorted(positions):
+        x, y = positions[k][0] - x0, positions[k][1] - y0
+        h, w = sizes[k]
+        map_path = piece_map_path(paths[k], maps_dir)
+        if map_path: pieces.append((load_piece_map(map_path), x, y))
+        captures.append({"path": paths[k], "x": x, "y": y, "width": w, "height": h, "map": map_path})
+    layout = {"image": os.path.basename(out_path), "width": world.shape[1], "height": world.shape[0],
+              "captures": captures, "unplaced": [p for k, p in enumerate(paths) if k not in positions],
+              "pairs": [{"a": i, "b": j, "dx": d[0], "dy": d[1], "score": round(s, 4)} for i, j, d, s in used],
+              "errors": [{"a": i, "b": j, "error": err} for i, j, _, _, err in results if err]}
+    with open(stem + ".stitch.json", "w", encoding="utf-8") as f:
+        json.dump(layout, f, indent=4, ensure_ascii=False)
+    if pieces:
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump(merge_piece_maps(pieces, os.path.basename(stem)), f, indent=4, ensure_ascii=False)
+    return {"captures": len(paths), "placed": len(positions), "pairs": len(results), "used_pairs": len(used),
+            "errors": len(layout["errors"]),
+            "maps": len(pieces), "size": (world.shape[1], world.shape[0]),
+            "register_seconds": round(t1 - t0, 3), "seconds": round(time.perf_counter() - t0, 3)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="미니맵 캡처 여러 장을 하나의 맵 이미지로 잇기")
+    parser.add_argument("inputs", nargs="+", help="캡처 이미지, 디렉터리 또는 글롭 패턴 (이름 순서 = 캡처 순서)")
+    parser.add_argument("--out", default="stitched.png", help="합친 이미지 경로 (.stitch.json/.json도 같은 이름으로)")
+    parser.add_argument("--maps", help="조각 맵 JSON 폴더 (기본: 캡처와 같은 폴더의 같은 이름)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--neighbors", type=int, default=None, help=f"처음에 캡처 순서상 이웃 몇 장까지 정합할지 (기본 {Config.STITCH_NEIGHBORS}, 나머지는 배치로 찾음)")
+    parser.add_argument("--all-pairs", action="store_true", help="모든 쌍 정합 (순서가 뒤섞인 캡처)")
+    parser.add_argument("--quiet", action="store_true", help="쌍별 출력 생략")
+    args = parser.parse_args(argv)
+
+    paths = collect_images(args.inputs)
+    if not paths:
+        print("처리할 이미지가 없습니다.")
+        return 1
+
+    def progress(i, j, d, score, error):
+        if args.quiet and not error: return
+        print(f"{os.path.basename(paths[i])} ↔ {os.path.basename(paths[j])}: " + (error or f"({d[0]}, {d[1]}) 점수 {score:.3f}"), flush=True)
+
+    s = stitch(paths, args.out, args.maps, args.workers, args.neighbors, args.all_pairs, progress)
+    print(f"완료: {s['placed']}/{s['captures']}장 배치 (쌍 {s['used_pairs']}/{s['pairs']}개 사용, 실패 {s['errors']}개), {s['size'][0]}x{s['size'][1]}, "
+          f"조각 맵 {s['maps']}개, 정합 {s['register_seconds']:.2f}s / 전체 {s['seconds']:.2f}s → {args.out}")
+    return 0 if s["placed"] == s["captures"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
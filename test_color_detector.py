@@ -0,0 +1,82 @@
+# test_color_detector.py
+"""색 감지: 합성 그림에 그린 포탈/스폰/밧줄을 정답 위치에서 찾는지, 중복 제거가 모든 쌍을 비교한 것과 같은지"""
+import cv2
+import numpy as np
+import pytest
+
+from app_config import Config
+from color_detector import dedupe, detect_colors, drop_existing
+from image_store import MappedImage
+
+
+def _bgr(h, s, v):
+    return tuple(int(c) for c in cv2.cvtColor(np.uint8([[[h, s, v]]]), cv2.COLOR_HSV2BGR)[0, 0])
+
+
+PORTAL, SPAWN, ROPE = _bgr(42, 230, 220), _bgr(145, 200, 230), _bgr(98, 210, 120)
+
+
+def _scene(seed, h=400, w=500):
+    """격자 칸마다 아이콘/밧줄을 하나씩 그리고, 크기가 맞지 않는 같은 색 덩어리를 미끼로 둔 그림"""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(20, 70, (h, w, 3), dtype=np.uint8)
+    truth = {"portals": [], "spawns": [], "ropes": []}
+    for gy in range(20, h - 40, 60):
+        for gx in range(20, w - 40, 60):
+            x, y = gx + int(rng.integers(0, 20)), gy + int(rng.integers(0, 20))
+            kind = ("portals", "spawns", "ropes")[int(rng.integers(0, 3))]
+            if kind == "portals":
+                cv2.circle(img, (x, y), 5, PORTAL, 2)
+                truth[kind].append((x, y))
+            elif kind == "spawns":
+                cv2.fillConvexPoly(img, np.array([(x, y - 4), (x + 4, y), (x, y + 4), (x - 4, y)]), SPAWN)
+                truth[kind].append((x, y))
+            else:
+                length = int(rng.integers(12, 40))
+                img[y:y + length, x:x + 2] = ROPE
+                truth[kind].append((x + 1, y, y + length - 1))
+    img[h - 15:h - 5, 10:60] = PORTAL   # 아이콘보다 큰 덩어리
+    img[h - 10:h - 8, 100:200] = ROPE   # 가로선 (밧줄 아님)
+    return img, truth
+
+
+@pytest.mark.parametrize("band_rows", [5, 2048])
+@pytest.mark.parametrize("seed", range(3))
+def test_detects_drawn_items(monkeypatch, seed, band_rows):
+    monkeypatch.setattr(Config, "DETECT_BAND_ROWS", band_rows)
+    img, truth = _scene(seed)
+    found = detect_colors(MappedImage(img))
+    got = {"portals": sorted((p['in_x'], p['in_y']) for p in found["portals"]),
+           "spawns": sorted((s['x'], s['y']) for s in found["spawns"]),
+           "ropes": sorted((r['x'], r['y_top'], r['y_bottom']) for r in found["ropes"])}
+    for kind, want in truth.items():
+        want = sorted(want)
+        assert len(got[kind]) == len(want), kind
+        assert all(max(abs(a - b) for a, b in zip(g, t)) <= 1 for g, t in zip(got[kind], want)), (kind, got[kind], want)
+    # 영역 감지는 영역 안의 것만, 좌표는 전체 그림 기준 (경계에 걸린 아이콘은 잘린 채로 잡힐 수 있음)
+    x1, y1, x2, y2 = rect = (100, 80, 420, 300)
+    inside = detect_colors(MappedImage(img), rect=rect)["spawns"]
+    assert all(x1 <= s['x'] < x2 and y1 <= s['y'] < y2 for s in inside)
+    assert all(s in inside for s in found["spawns"] if x1 + 5 <= s['x'] < x2 - 5 and y1 + 5 <= s['y'] < y2 - 5)
+
+
+def _close(kind, a, b, tol):
+    if kind == "ropes":
+        return abs(a['x'] - b['x']) <= tol and a['y_top'] <= b['y_bottom'] + tol and a['y_bottom'] >= b['y_top'] - tol
+    return abs(a['x'] - b['x']) <= tol and abs(a['y'] - b['y']) <= tol
+
+
+@pytest.mark.parametrize("kind", ["spawns", "ropes"])
+def test_dedupe_matches_pairwise_check(kind):
+    rng = np.random.default_rng(4)
+    if kind == "ropes":
+        items = [{'x': int(x), 'y_top': int(y), 'y_bottom': int(y) + 15} for x, y in rng.integers(0, 120, (300, 2))]
+    else:
+        items = [{'x': int(x), 'y': int(y), 'desc': "d"} for x, y in rng.integers(0, 150, (300, 2))]
+    tol = 6
+    kept = []
+    for item in items:   # 앞에서부터 남긴 것들과 하나씩 비교
+        if not any(_close(kind, item, k, tol) for k in kept): kept.append(item)
+    assert dedupe(kind, items, tol) == kept
+    existing, new = items[:100], items[100:]
+    assert drop_existing(kind, new, existing, tol) == [n for n in new if not any(_close(kind, n, e, tol) for e in existing)]
@@ -0,0 +1,106 @@
+# test_edit_history.py
+"""되돌리기 기록: 무작위 편집을 하나씩 되돌리면 매 단계 스냅샷과 같고, 다시 실행하면 마지막 상태로 돌아오는지"""
+import numpy as np
+import pytest
+
+from edit_history import DeleteRows, EditGroup, EditHistory, InsertRows, UpdateRows
+from map_store import PlatformStore, PortalStore, RopeStore, SpawnStore
+
+
+def _stores():
+    return {"platforms": PlatformStore(), "portals": PortalStore(), "spawns": SpawnStore(), "ropes": RopeStore()}
+
+
+def _snapshot(stores):
+    return {kind: (store.to_records(), store.ids.tolist()) for kind, store in stores.items()}
+
+
+def _item(kind, rng):
+    a, b = (int(v) for v in rng.integers(0, 500, 2))
+    if kind == "platforms": return {'y': a, 'x_start': b, 'x_end': b + 30}
+    if kind == "portals": return {'in_x': a, 'in_y': b, 'out_x': b, 'out_y': a, 'target_map': f"m{a}"}
+    if kind == "spawns": return {'x': a, 'y': b, 'desc': "d"}
+    return {'x': a, 'y_top': b, 'y_bottom': b + 20}
+
+
+def _edit(stores, history, rng):
+    """에디터(add_item/update_item/remove_item/감지 병합)와 같은 순서로 저장소를 바꾸고 기록"""
+    kind = str(rng.choice(list(stores)))
+    store, op = stores[kind], rng.integers(0, 4)
+    if op == 0 or not len(store):
+        store.append(_item(kind, rng))
+        history.push(InsertRows.capture(stores, kind, len(store) - 1))
+    elif op == 1:
+        idx = int(rng.integers(0, len(store)))
+        old = store.rows_at([idx])
+        for key, value in _item(kind, rng).items(): store[idx][key] = value
+        history.push(UpdateRows(kind, [idx], old, store.rows_at([idx])))
+    elif op == 2:
+        idx = int(rng.integers(0, len(store)))
+        command = DeleteRows.capture(stores, kind, idx)
+        store.pop(idx)
+        history.push(command)
+    else:
+        rows = sorted({int(r) for r in rng.integers(0, len(store), 3)})
+        old = store.rows_at(rows)
+        for r in rows: store[r][store.FIELDS[0]] += 1
+        n0 = len(store)
+        store.extend(_item(kind, rng) for _ in range(2))
+        history.push(EditGroup([UpdateRows(kind, rows, old, store.rows_at(rows)), InsertRows.capture(stores, kind, n0, 2)]))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_undo_redo_walks_every_snapshot(seed):
+    rng = np.random.default_rng(seed)
+    stores = _stores()
+    history = EditHistory(stores, limit=1000, max_rows=100000, coalesce_ms=0)
+    snapshots = [_snapshot(stores)]
+    for _ in range(120):
+        _edit(stores, history, rng)
+        snapshots.append(_snapshot(stores))
+    for want in reversed(snapshots[:-1]):
+        assert history.undo() is not None
+        assert _snapshot(stores) == want
+    assert history.undo() is None and not history.can_undo()
+    for want in snapshots[1:]:
+        assert history.redo() is not None
+        assert _snapshot(stores) == want
+    assert history.redo() is None
+    history.undo()
+    _edit(stores, history, rng)   # 새 편집은 다시 실행 목록을 버림
+    assert not history.can_redo()
+
+
+def test_coalesced_updates_undo_in_one_step():
+    stores = _stores()
+    history = EditHistory(stores, coalesce_ms=60000)
+    stores["platforms"].append({'y': 10, 'x_start': 0, 'x_end': 50})
+    history.push(InsertRows.capture(stores, "platforms", 0))
+    start = _snapshot(stores)
+    for dx in range(1, 6):   # 방향키 미세조정처럼 같은 키로 이어진 편집
+        old = stores["platforms"].rows_at([0])
+        stores["platforms"][0]['x_start'] = dx
+        history.push(UpdateRows("platforms", [0], old, stores["platforms"].rows_at([0])), ("move", "platforms", 0))
+    end = _snapshot(stores)
+    assert history.undo() == [("set", "platforms", 0)]
+    assert _snapshot(stores) == start
+    history.redo()
+    assert _snapshot(stores) == end
+    history.undo()
+    history.undo()
+    assert not len(stores["platforms"]) and not history.can_undo()
+
+
+def test_limits_drop_oldest_steps():
+    stores = _stores()
+    history = EditHistory(stores, limit=5, max_rows=8, coalesce_ms=0)
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        stores["spawns"].append(_item("spawns", rng))
+        history.push(InsertRows.capture(stores, "spawns", len(stores["spawns"]) - 1))
+    steps = 0
+    while history.undo() is not None: steps += 1
+    assert steps == 5 and len(stores["spawns"]) == 15
+    stores["platforms"].extend(_item("platforms", rng) for _ in range(9))
+    history.push(InsertRows.capture(stores, "platforms", 0, 9))   # 한 단계가 행 상한을 넘으면 기록하지 않은 것과 같음
+    assert not history.can_undo()
@@ -0,0 +1,71 @@
+# test_jump_graph.py
+"""점프 그래프: 증분 갱신(set/insert/remove) 결과가 MapLogic.check_jump로 모든 쌍을 검사한 것과 같은지"""
+import numpy as np
+import pytest
+
+from jump_graph import JumpGraph
+from map_logic import MapLogic
+
+
+def _plat(rng):
+    x = int(rng.integers(0, 500))
+    return {'y': int(rng.integers(0, 400)), 'x_start': x, 'x_end': x + int(rng.integers(5, 120))}
+
+
+def _brute(platforms):
+    return {(i, j) for i, a in enumerate(platforms) for j, b in enumerate(platforms)
+            if i != j and MapLogic.check_jump(a, b)}
+
+
+def _edges(graph):
+    src, dst = graph.edges()
+    return set(zip(src.tolist(), dst.tolist()))
+
+
+def _adjacency(edges):
+    out = {}
+    for i, j in edges: out.setdefault(i, set()).add(j)
+    return out
+
+
+def _out(adj, k):
+    return adj.get(k, set())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_updates_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    platforms = [_plat(rng) for _ in range(80)]
+    graph = JumpGraph(platforms)
+    edges = _brute(platforms)
+    assert _edges(graph) == edges
+    before = _adjacency(edges)
+    for step in range(150):
+        op = rng.integers(0, 4)
+        k = int(rng.integers(0, len(platforms) + 1))
+        if op == 0 and k < len(platforms):   # 드래그: 조금 옮기거나 멀리 옮김
+            p = dict(platforms[k], y=platforms[k]['y'] + int(rng.choice([-40, -3, 3, 40])))
+            platforms[k] = p
+            affected = graph.set(k, p)
+            old = {i: _out(before, i) for i in range(len(platforms))}
+        elif op == 1:
+            p = _plat(rng)
+            if k == len(platforms): platforms.append(p); affected = graph.set(k, p)
+            else: platforms.insert(k, p); affected = graph.insert(k, p)
+            old = {i + (i >= k): {j + (j >= k) for j in _out(before, i)} for i in range(len(platforms) - 1)}
+        elif len(platforms) > 10 and k < len(platforms):
+            platforms.pop(k)
+            affected = graph.remove(k)
+            old = {i - (i > k): {j - (j > k) for j in _out(before, i) if j != k} for i in range(len(platforms) + 1) if i != k}
+        else:
+            continue
+        edges = _brute(platforms)
+        assert _edges(graph) == edges, step
+        after = _adjacency(edges)
+        # 나가는 간선이 바뀐 발판은 모두 반환값에 들어 있어야 함 (경로 레이어가 그 행만 다시 그림)
+        changed = {i for i in range(len(platforms)) if _out(after, i) != old.get(i, set())}
+        assert changed <= set(affected.tolist()), step
+        before = after
+    indptr, indices = graph.csr()
+    for k in range(len(platforms)):
+        assert list(indices[indptr[k]:indptr[k + 1]]) == sorted(_out(before, k))
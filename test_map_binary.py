@@ -0,0 +1,58 @@
+# test_map_binary.py
+"""바이너리 맵(.mapb): JSON → .mapb → JSON 왕복이 원래 데이터와 같은지 (추가 키/메타데이터/빈 종류 포함)"""
+import json
+
+import numpy as np
+import pytest
+
+from map_binary import MapBundle, bundle_path_for, is_bundle, main, maps_from_json, write_bundle
+from map_store import PlatformStore, PortalStore, RopeStore, SpawnStore
+
+
+def _map(rng, n, ropes=True):
+    data = {
+        "platforms": [{'y': int(y), 'x_start': int(x), 'x_end': int(x) + 40} for y, x in rng.integers(-50, 5000, (n, 2))],
+        "portals": [{'in_x': k, 'in_y': k * 2, 'out_x': -k, 'out_y': 7} for k in range(n // 10)],
+        "spawns": [{'x': k, 'y': k + 1, 'desc': f"몹 {k}"} for k in range(n // 7)],
+        "metadata": {"name": "테스트 맵", "scale": 1.5},
+    }
+    if data["portals"]: data["portals"][0]["target_map"] = "다른 맵"
+    if data["platforms"]: data["platforms"][-1]["note"] = {"tags": ["a", "b"]}
+    if ropes: data["ropes"] = [{'x': k, 'y_top': 10, 'y_bottom': 10 + k} for k in range(n // 5)]
+    return data
+
+
+def _expected(data):
+    """load()는 발판/포탈/스폰은 늘 채우고 밧줄은 있을 때만 넣음 (save_data 형식)"""
+    out = {"platforms": [], "portals": [], "spawns": []}
+    out.update({k: v for k, v in data.items() if k != "ropes" or v})
+    return out
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip_matches_json(tmp_path, seed):
+    rng = np.random.default_rng(seed)
+    maps = {"지역 A": _map(rng, 200), "B": _map(rng, 30, ropes=False), "빈 맵": {"platforms": []}}
+    path = str(tmp_path / "region.mapb")
+    write_bundle(path, maps)
+    assert is_bundle(path) and not is_bundle(str(tmp_path / "missing.mapb"))
+    with MapBundle.open(path) as bundle:
+        assert bundle.names == list(maps) and len(bundle) == 3 and "B" in bundle
+        for name, data in maps.items():
+            assert bundle.load(name) == _expected(data)
+            stores = {"platforms": PlatformStore(), "portals": PortalStore(), "spawns": SpawnStore(), "ropes": RopeStore()}
+            meta = bundle.fill_stores(name, stores)
+            assert meta == {k: v for k, v in data.items() if k not in stores}
+            for kind, store in stores.items():
+                assert store.to_records() == data.get(kind, []), (name, kind)
+
+
+def test_cli_converts_both_ways(tmp_path):
+    data = _map(np.random.default_rng(9), 50)
+    src = tmp_path / "map.json"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    main([str(src)])
+    assert is_bundle(bundle_path_for(str(src)))
+    out = tmp_path / "back.json"
+    main([bundle_path_for(str(src)), "-o", str(out)])
+    assert maps_from_json(json.loads(out.read_text(encoding="utf-8")), "map") == {"map": data}
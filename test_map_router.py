@@ -0,0 +1,50 @@
+# test_map_router.py
+"""경로 표: 큰 맵용 묶음별 형식(version 2)이 n x n 표와 같은 경로를 내는지"""
+import math
+
+import numpy as np
+import pytest
+
+from app_config import Config
+from map_router import MapRouter, load_routes, path_from_table
+
+
+def _platforms(seed, n):
+    """서로 닿지 않는 세 구역(묶음)에 흩어진 발판"""
+    rng = np.random.default_rng(seed)
+    plats = []
+    for k in range(n):
+        x = int(rng.integers(0, 400)) + (k % 3) * 2000
+        plats.append({'y': int(rng.integers(50, 600)), 'x_start': x, 'x_end': x + int(rng.integers(30, 120))})
+    return plats
+
+
+def _cost(router, path):
+    return sum(math.dist(router.centers[a], router.centers[b]) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("max_platforms", [10, 60])   # 10: 큰 묶음은 그래프, 60: 모두 표
+def test_compact_routes_match_dense_table(tmp_path, monkeypatch, max_platforms):
+    plats = _platforms(0, 120)
+    router = MapRouter(plats)
+    dense = router.next_hop_table()
+    monkeypatch.setattr(Config, "ROUTE_EXPORT_MAX_PLATFORMS", max_platforms)
+    path = str(tmp_path / "m.routes.json")
+    data = router.export(path)
+    assert data["version"] == 2 and len(data["components"]) >= 3
+    assert any("graph" in c for c in data["components"]) == (max_platforms < 40)
+    table = load_routes(path)
+    for a in range(0, len(plats), 7):
+        for b in range(len(plats)):
+            want = path_from_table(dense, a, b)
+            got = path_from_table(table, a, b)
+            if want is None: assert got is None
+            else: assert got[0] == a and got[-1] == b and math.isclose(_cost(router, got), _cost(router, want), abs_tol=0.1)
+
+
+def test_small_map_keeps_dense_table(tmp_path):
+    plats = _platforms(1, 40)
+    router = MapRouter(plats)
+    path = str(tmp_path / "m.routes.json")
+    assert router.export(path)["version"] == 1
+    assert np.array_equal(np.array(load_routes(path)), router.next_hop_table())
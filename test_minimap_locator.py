@@ -0,0 +1,62 @@
+# test_minimap_locator.py
+"""미니맵 위치 추적: 녹화한 프레임을 다시 재생해 정답 위치와 비교 (정지한 노란 지형이 있어도)"""
+import cv2
+import numpy as np
+
+from capture_source import ImageCapture, SyntheticCapture
+from minimap_locator import MinimapLocator, run_locator
+
+YELLOW = (0, 255, 255)
+
+
+def _source_with_decoys():
+    """움직이는 표시보다 큰 노란 네모가 미니맵에 박혀 있는 가짜 화면"""
+    src = SyntheticCapture()
+    x, y, w, h = src.minimap
+    for k in range(5):   # 표시가 지나는 줄(h/6 ~ 5h/6)과 겹치지 않는 위/아래 가장자리
+        dx, dy = x + 20 + k * 40, (y + 6) if k % 2 else (y + h - 12)
+        src.base[dy:dy + 6, dx:dx + 6] = YELLOW
+    src.frame = src.base.copy()
+    return src
+
+
+def _truth(src):
+    x, y, w, h = src.minimap
+    return x + src._t * 3 % w, y + h // 2 + int(h / 3 * np.sin(src._t / 10))
+
+
+def _record(src, directory, frames):
+    """ROI 프레임을 PNG로 저장하고 프레임별 정답 (에디터 좌표) 반환"""
+    truth = []
+    for k in range(frames):
+        src.advance()
+        cv2.imwrite(str(directory / f"{k:04d}.png"), src.grab(src.minimap))
+        truth.append(_truth(src))
+    return truth
+
+
+def test_replay_ignores_static_yellow_features(tmp_path):
+    src = _source_with_decoys()
+    truth = _record(src, tmp_path, 150)
+    locator = MinimapLocator(src.base)
+    fixes = []
+    with ImageCapture(str(tmp_path)) as replay:
+        found, _ = run_locator(replay, locator, max_frames=len(truth), on_fix=lambda k, fix: fixes.append(fix))
+    assert found == len(truth)
+    assert tuple(locator.offset) == src.minimap[:2]
+    truth = truth[1:] + truth[:1]   # run_locator는 advance() 뒤에 잡으므로 두 번째 프레임부터 한 바퀴
+    for fix, (tx, ty) in zip(fixes, truth):
+        assert abs(fix['x'] - tx) <= 1 and abs(fix['y'] - ty) <= 1, (fix, tx, ty)
+
+
+def test_prefers_blob_nearest_last_position():
+    src = SyntheticCapture()
+    x, y, w, h = src.minimap
+    locator = MinimapLocator(src.base)
+    frame = src.base[y:y + h, x:x + w].copy()
+    cv2.circle(frame, (40, 75), 3, YELLOW, -1)   # 캐릭터
+    frame[70:78, 150:158] = YELLOW                # 기준 맵에 없는 더 큰 노란 점 (다른 표시)
+    assert locator.locate(frame) is not None
+    locator.last = (70, 75)   # 주변 검사 반경 밖이지만 캐릭터 쪽이 더 가까움
+    pos = locator.find_marker(frame)
+    assert abs(pos[0] - 40) <= 1 and abs(pos[1] - 75) <= 1
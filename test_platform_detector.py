@@ -0,0 +1,110 @@
+# test_platform_detector.py
+"""발판 감지: 띠 단위 감지가 이미지를 한 번에 처리한 결과와 같은지,
+merge_platforms가 후보를 하나씩 보는 느린 구현과 같은 결과를 내는지 (같은 배치 안의 중복 포함)"""
+import numpy as np
+import pytest
+
+from app_config import Config
+from image_store import MappedImage
+from platform_detector import DetectionCache, detect_image, detect_platforms, merge_platforms
+
+Y_TOL, X_TOL = 3, 4
+
+
+def _plat(rng):
+    x = int(rng.integers(0, 600))
+    return {'y': int(rng.integers(0, 300)), 'x_start': x, 'x_end': x + int(rng.integers(5, 90))}
+
+
+def _touches(p, e):
+    return abs(p['y'] - e['y']) <= Y_TOL and p['x_start'] <= e['x_end'] + X_TOL and p['x_end'] >= e['x_start'] - X_TOL
+
+
+def _best(p, pool):
+    """겹친 길이가 큰 순, 높이 차가 작은 순, 번호가 작은 순으로 첫 짝 (pool: [(번호, 원래 값)])"""
+    keys = [(-(min(p['x_end'], e['x_end']) - max(p['x_start'], e['x_start'])), abs(p['y'] - e['y']), i)
+            for i, e in pool if _touches(p, e)]
+    return min(keys)[2] if keys else None
+
+
+def _slow_merge(platforms, found):
+    """후보마다 기존 발판 → 앞서 추가된 후보 순으로 짝을 찾는 O(n²) 기준 구현 (짝 판정은 병합 전 값으로)"""
+    platforms = [dict(p) for p in platforms]
+    orig = [dict(p) for p in platforms]
+    added, root, skipped = [], {}, 0
+    for k, p in enumerate(found):
+        i = _best(p, list(enumerate(orig)))
+        if i is None:
+            j = _best(p, [(j, found[j]) for j in root if j < k])
+            if j is None:
+                root[k] = len(added)
+                added.append(dict(p))
+                continue
+            root[k] = root[j]
+            e = added[root[j]]
+        else:
+            e = platforms[i]
+        xs, xe = min(e['x_start'], p['x_start']), max(e['x_end'], p['x_end'])
+        if xs - e['x_start'] >= -X_TOL and xe - e['x_end'] <= X_TOL:
+            skipped += 1
+            continue
+        e['x_start'], e['x_end'] = xs, xe
+    return platforms + added, skipped
+
+
+def _scene(seed, h=300, w=400):
+    """띠 경계를 넘는 벽/블록과 두께가 제각각인 발판이 섞인 그림"""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 60, (h, w, 3), dtype=np.uint8)
+    for _ in range(60):
+        x, y = int(rng.integers(0, w - 20)), int(rng.integers(0, h - 5))
+        img[y:y + int(rng.integers(1, 12)), x:x + int(rng.integers(10, 120))] = 220
+    for _ in range(8):
+        x, y = int(rng.integers(0, w - 10)), int(rng.integers(0, h - 60))
+        img[y:y + int(rng.integers(20, 80)), x:x + int(rng.integers(3, 40))] = 200
+    return img
+
+
+def _single_pass(img, x0=0, y0=0):
+    return [{'y': y + y0, 'x_start': xs + x0, 'x_end': xe + x0} for y, xs, xe, _ in detect_platforms(img, 127, 15)]
+
+
+@pytest.mark.parametrize("band_rows", [1, 7, 64, 2048])
+@pytest.mark.parametrize("seed", range(3))
+def test_band_detection_matches_single_pass(monkeypatch, seed, band_rows):
+    monkeypatch.setattr(Config, "DETECT_BAND_ROWS", band_rows)
+    img = _scene(seed)
+    image = MappedImage(img)
+    want = _single_pass(img)
+    assert want and detect_image(image, 127, 15) == want
+    cache = DetectionCache()
+    cache.set_image(image)
+    assert cache.detect(127, 15) == want
+    x1, y1, x2, y2 = rect = (37, 51, 333, 260)
+    roi = _single_pass(img[y1:y2, x1:x2], x1, y1)
+    assert detect_image(image, 127, 15, rect=rect) == roi
+    assert cache.detect(127, 15, rect=rect) == roi
+
+
+def test_duplicates_in_one_batch_are_added_once():
+    found = [{'y': 100, 'x_start': 10, 'x_end': 80}, {'y': 101, 'x_start': 12, 'x_end': 79},
+             {'y': 99, 'x_start': 70, 'x_end': 140}, {'y': 200, 'x_start': 0, 'x_end': 50}]
+    platforms = []
+    report = merge_platforms(platforms, found, y_tol=Y_TOL, x_tol=X_TOL)
+    assert platforms == [{'y': 100, 'x_start': 10, 'x_end': 140}, {'y': 200, 'x_start': 0, 'x_end': 50}]
+    assert report['added'] == [0, 1] and report['skipped'] == 1 and report['merged'] == 1
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_merge_matches_slow_merge(seed):
+    rng = np.random.default_rng(seed)
+    platforms = [_plat(rng) for _ in range(150)]
+    found = [_plat(rng) for _ in range(200)]
+    found += [dict(p, y=p['y'] + int(rng.integers(-2, 3)), x_end=p['x_end'] + int(rng.integers(-6, 7)))
+              for p in (found + platforms)[::3]]   # 앞선 후보/기존 발판과 거의 같은 후보
+    want, skipped = _slow_merge(platforms, found)
+    before = [dict(p) for p in platforms]
+    report = merge_platforms(platforms, found, y_tol=Y_TOL, x_tol=X_TOL)
+    assert platforms == want and report['skipped'] == skipped
+    assert report['updated'] == [i for i, (a, b) in enumerate(zip(before, platforms)) if a != b]
+    assert all(report['before'][i] == (before[i]['x_start'], before[i]['x_end']) for i in report['updated'])
@@ -0,0 +1,48 @@
+# test_session_journal.py
+"""자동 저장 저널: 편집마다 복구 결과가 에디터 상태와 같은지 (스냅샷 경계 포함)"""
+import numpy as np
+import pytest
+
+from bench_editor import headless_editor
+from image_store import MappedImage
+from map_store import PlatformStore, PortalStore, RopeStore, SpawnStore
+from session_journal import SessionJournal
+
+
+def _editor(directory, compact_ops):
+    editor = headless_editor(MappedImage(np.zeros((200, 300, 3), np.uint8)))
+    editor.journal = SessionJournal(str(directory), compact_ops)
+    editor.history.listeners.extend((editor.journal.record, editor._schedule_compact))
+    editor.journal.start(editor.stores)
+    return editor
+
+
+def _recovered(directory):
+    stores = {"platforms": PlatformStore(), "portals": PortalStore(), "spawns": SpawnStore(), "ropes": RopeStore()}
+    SessionJournal(str(directory)).recover(stores)
+    return stores
+
+
+def _assert_recovers(editor, directory):
+    editor.journal.flush()
+    stores = _recovered(directory)
+    for kind, store in editor.stores.items():
+        assert stores[kind].to_records() == store.to_records(), kind
+
+
+@pytest.mark.parametrize("idle", [False, True])
+@pytest.mark.parametrize("compact_ops", [1, 2, 3, 4])
+def test_delete_at_compaction_boundary(tmp_path, compact_ops, idle):
+    """삭제가 스냅샷 경계에 걸려도 지운 항목이 복구되지 않아야 함"""
+    editor = _editor(tmp_path, compact_ops)
+    for i in range(9):
+        editor.add_item("platforms", {'y': 20 + i * 15, 'x_start': 10, 'x_end': 120})
+        if idle: editor.journal.compact_if_due()   # 에디터에서는 root.after(0, ...)로 호출됨
+    for idx in (0, 3, 3, 1, 0):
+        editor.remove_item("platforms", idx)
+        if idle: editor.journal.compact_if_due()
+        _assert_recovers(editor, tmp_path)
+    editor.undo_last()
+    _assert_recovers(editor, tmp_path)
+    assert len(editor.platforms) == 5
+    editor.journal.close()
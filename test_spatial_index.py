@@ -0,0 +1,71 @@
+# test_spatial_index.py
+"""공간 인덱스: 편집(set/insert/remove)을 섞은 뒤에도 클릭 판정과 사각형 조회가 선형 탐색과 같은지"""
+import numpy as np
+import pytest
+
+from spatial_index import PlatformIndex, PointIndex, RopeIndex
+
+
+def _platform(rng):
+    x = int(rng.integers(0, 900))
+    return {'y': int(rng.integers(0, 500)), 'x_start': x, 'x_end': x + int(rng.integers(5, 80))}
+
+
+def _rope(rng):
+    y = int(rng.integers(0, 450))
+    return {'x': int(rng.integers(0, 900)), 'y_top': y, 'y_bottom': y + int(rng.integers(10, 80))}
+
+
+def _point(rng):
+    return {'x': int(rng.integers(0, 900)), 'y': int(rng.integers(0, 500))}
+
+
+def _nearest(items, dist):
+    """거리 함수가 None이 아닌 항목 중 가장 가까운 것 (같으면 번호가 작은 것)"""
+    hits = [(d, i) for i, it in enumerate(items) if (d := dist(it)) is not None]
+    return min(hits)[1] if hits else None
+
+
+# 종류별: (인덱스, 항목 생성, 클릭 허용 거리, 선형 판정, 사각형 판정)
+CASES = {
+    "platforms": (PlatformIndex, _platform, 6,
+                  lambda p, rx, ry, t: abs(p['y'] - ry) if abs(p['y'] - ry) < t and p['x_start'] <= rx <= p['x_end'] else None,
+                  lambda p, x1, y1, x2, y2: y1 <= p['y'] <= y2 and p['x_start'] <= x2 and p['x_end'] >= x1),
+    "spawns": (lambda: PointIndex("x", "y"), _point, 10,
+               lambda p, rx, ry, t: d2 if (d2 := (p['x'] - rx) ** 2 + (p['y'] - ry) ** 2) < t * t else None,
+               lambda p, x1, y1, x2, y2: x1 <= p['x'] <= x2 and y1 <= p['y'] <= y2),
+    "ropes": (RopeIndex, _rope, 6,
+              lambda r, rx, ry, t: abs(r['x'] - rx) if abs(r['x'] - rx) < t and r['y_top'] <= ry <= r['y_bottom'] else None,
+              lambda r, x1, y1, x2, y2: x1 <= r['x'] <= x2 and r['y_top'] <= y2 and r['y_bottom'] >= y1),
+}
+
+
+@pytest.mark.parametrize("kind", list(CASES))
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_linear_search(kind, seed):
+    make_index, make_item, tol, hit, in_rect = CASES[kind]
+    rng = np.random.default_rng(seed)
+    items = [make_item(rng) for _ in range(300)]
+    index = make_index()
+    index.rebuild(items)
+    for step in range(800):
+        r, i = rng.random(), int(rng.integers(0, len(items)))
+        if r < 0.5:   # 드래그(제자리/정렬 위치 이동) 또는 새 값
+            item = {k: v + int(rng.choice([0, 1, -1, 30])) for k, v in items[i].items()} if r < 0.4 else make_item(rng)
+            items[i] = item
+            index.set(i, item)
+        elif r < 0.7:
+            item = make_item(rng)
+            items.insert(i, item)
+            index.insert(i, item)
+        elif r < 0.9 and len(items) > 50:
+            items.pop(i)
+            index.remove(i)
+        rx, ry = int(rng.integers(0, 950)), int(rng.integers(0, 520))
+        assert index.hit(rx, ry, tol) == _nearest(items, lambda it: hit(it, rx, ry, tol)), step
+        if step % 10 == 0:
+            x1, y1 = int(rng.integers(0, 900)), int(rng.integers(0, 500))
+            rect = (x1, y1, x1 + int(rng.integers(0, 200)), y1 + int(rng.integers(0, 150)))
+            want = [k for k, it in enumerate(items) if in_rect(it, *rect)]
+            assert index.query_rect(*rect).tolist() == want, step
+    assert len(index) == len(items)
@@ -0,0 +1,43 @@
+# test_stitch_maps.py
+"""캡처 잇기: 합성 월드에서 잘라 낸 캡처들이 정답 위치에 놓이는지"""
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from app_config import Config
+from stitch_maps import register_pair, stitch
+
+
+def _world(seed, width, height, blur=2, channels=3):
+    rng = np.random.default_rng(seed)
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    return cv2.GaussianBlur(rng.integers(0, 255, shape, dtype=np.uint8), (0, 0), blur)
+
+
+def test_raster_grid_places_every_capture(tmp_path):
+    """행 우선 3×4 격자: 행이 바뀌는 캡처끼리는 겹치지 않아 순서상 이웃만으로는 행끼리 이어지지 않음"""
+    world = _world(2, 760, 420)
+    paths, truth = [], []
+    for y in range(0, 360, 120):
+        for x in range(0, 680, 170):
+            path = str(tmp_path / f"cap_{len(paths):02d}.png")
+            cv2.imwrite(path, world[y:y + 160, x:x + 220])
+            paths.append(path)
+            truth.append((x, y))
+    summary = stitch(paths, str(tmp_path / "world.png"), workers=1)
+    assert summary["placed"] == len(paths)
+    with open(tmp_path / "world.stitch.json", encoding="utf-8") as f:
+        layout = json.load(f)
+    assert [(c["x"], c["y"]) for c in layout["captures"]] == truth
+
+
+@pytest.mark.parametrize("seed,blur", [(1, 12), (3, 18), (5, 12), (7, 18)])
+def test_rejects_peak_when_true_overlap_is_below_minimum(seed, blur):
+    """진짜 겹침(10%)이 하한보다 작으면 하한 경계의 매끈한 상관 봉우리를 정합으로 인정하지 않음"""
+    world = _world(seed, 600, 400, blur, channels=1)
+    a = world[0:150, 0:200]
+    assert register_pair(a, world[0:150, 180:380])[1] < Config.STITCH_MIN_SCORE
+    d, score = register_pair(a, world[40:190, 110:310])   # 같은 지형의 진짜 겹침은 그대로 인정
+    assert d == (110, 40) and score >= Config.STITCH_MIN_SCORE
@@ -52,13 +52,18 @@ class PortalEditor(tk.Toplevel):
             'out_x': tk.IntVar(value=portal['out_x']), 'out_y': tk.IntVar(value=portal['out_y'])
         }
 
-        for var in self.vars.values():
+        # [신규] 다른 맵으로 가는 포탈이면 대상 맵 이름 (비우면 같은 맵, 출구 좌표는 대상 맵 기준)
+        self.var_target = tk.StringVar(value=portal.get('target_map') or "")
+
+        for var in (*self.vars.values(), self.var_target):
             var.trace_add("write", lambda *a: on_update(idx, self.get_values()))
 
         self._build_ui(idx, img_h, img_w, on_delete)
 
     def get_values(self):
-        return {k: v.get() for k, v in self.vars.items()}
+        values = {k: v.get() for k, v in self.vars.items()}
+        values['target_map'] = self.var_target.get().strip() or None
+        return values
 
     def _build_ui(self, idx, img_h, img_w, on_delete):
         tk.Label(self, text=f"🌀 포탈 {idx} 좌표 편집", font=("Arial", 13, "bold")).pack(pady=10)
@@ -67,6 +72,8 @@ class PortalEditor(tk.Toplevel):
             tk.Label(self, text=label_text).pack(anchor="w")
             tk.Spinbox(self, from_=0, to=img_w if 'x' in key else img_h, 
                        textvariable=self.vars[key], font=("Arial", 12)).pack(fill="x", pady=2)
+        tk.Label(self, text="대상 맵 (비우면 같은 맵):").pack(anchor="w")
+        tk.Entry(self, textvariable=self.var_target, font=("Arial", 12)).pack(fill="x", pady=2)
         tk.Button(self, text="삭제", bg="#ff4444", fg="white", 
                   command=lambda: [on_delete(idx), self.destroy()]).pack(fill="x", pady=20)
 
@@ -104,4 +111,40 @@ class SpawnEditor(tk.Toplevel):
         tk.Entry(self, textvariable=self.var_desc, font=("Arial", 12)).pack(fill="x", pady=2)
 
         tk.Button(self, text="삭제", bg="#ff4444", fg="white", 
-                  command=lambda: [on_delete(idx), self.destroy()]).pack(fill="x", pady=20)
\ No newline at end of file
+                  command=lambda: [on_delete(idx), self.destroy()]).pack(fill="x", pady=20)
+
+class RopeEditor(tk.Toplevel):
+    """[신규] 밧줄/사다리 편집 창"""
+    def __init__(self, parent, idx, rope, img_h, img_w, on_update, on_delete):
+        super().__init__(parent)
+        self.title(f"밧줄 #{idx} 상세수정")
+        self.geometry("350x320")
+        self.attributes("-topmost", True)
+        self.config(padx=15, pady=15)
+
+        self.var_x = tk.IntVar(value=rope['x'])
+        self.var_y_top = tk.IntVar(value=rope['y_top'])
+        self.var_y_bottom = tk.IntVar(value=rope['y_bottom'])
+
+        for var in (self.var_x, self.var_y_top, self.var_y_bottom):
+            var.trace_add("write", lambda *a: on_update(idx, self.get_values()))
+
+        self._build_ui(idx, img_h, img_w, on_delete)
+
+    def get_values(self):
+        return {'x': self.var_x.get(), 'y_top': self.var_y_top.get(), 'y_bottom': self.var_y_bottom.get()}
+
+    def _build_ui(self, idx, img_h, img_w, on_delete):
+        tk.Label(self, text=f"🪢 밧줄 #{idx} 편집", font=("Arial", 13, "bold")).pack(pady=10)
+
+        tk.Label(self, text="X 좌표:").pack(anchor="w")
+        tk.Spinbox(self, from_=0, to=img_w, textvariable=self.var_x, font=("Arial", 12)).pack(fill="x", pady=2)
+
+        tk.Label(self, text="위쪽 Y:").pack(anchor="w")
+        tk.Spinbox(self, from_=0, to=img_h, textvariable=self.var_y_top, font=("Arial", 12)).pack(fill="x", pady=2)
+
+        tk.Label(self, text="아래쪽 Y:").pack(anchor="w")
+        tk.Spinbox(self, from_=0, to=img_h, textvariable=self.var_y_bottom, font=("Arial", 12)).pack(fill="x", pady=2)
+
+        tk.Button(self, text="삭제", bg="#ff4444", fg="white",
+                  command=lambda: [on_delete(idx), self.destroy()]).pack(fill="x", pady=20)
@@ -0,0 +1,136 @@
+# view_pyramid.py
+import math
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from app_config import Config
+from frame_profiler import no_stage
+
+
+class TileCache:
+    """[신규] 메모리 상한이 있는 LRU 타일 캐시"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tiles = OrderedDict()
+
+    def get(self, key):
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def put(self, key, tile):
+        self.discard(key)
+        self._tiles[key] = tile
+        self.nbytes += tile.nbytes
+        while self.nbytes > self.max_bytes and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    def discard(self, key):
+        tile = self._tiles.pop(key, None)
+        if tile is not None:
+            self.nbytes -= tile.nbytes
+
+    def clear(self):
+        self._tiles.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+
+class ViewPyramid:
+    """[신규] 합성 프레임의 다해상도 피라미드.
+    레벨 k는 원본을 2^k 배 축소한 이미지이며 TILE 크기 타일 단위로 필요할 때만 만들어 캐시합니다.
+    레벨 0은 합성 프레임 자체를 그대로 사용합니다."""
+    TILE = 256
+
+    def __init__(self, renderer, cache=None):
+        self.renderer = renderer
+        self.cache = cache or TileCache(Config.TILE_CACHE_MB * 1024 * 1024)
+        self.versions = []   # 레벨별 타일 버전 그리드 (레벨 0은 사용하지 않음)
+        self.profiler = None # [신규] 있으면 crop/resize 단계 시간 측정 (FrameProfiler)
+        renderer.listeners.append(self.on_frame_changed)
+        self.reset()
+
+    @property
+    def levels(self):
+        return len(self.versions)
+
+    def reset(self):
+        """베이스 이미지가 바뀌면 모든 레벨을 다시 구성"""
+        self.cache.clear()
+        self.versions = [None]
+        h, w = self.renderer.h, self.renderer.w
+        k = 1
+        while h and w and max(h, w) > self.TILE << (k - 1):
+            lh, lw = self.level_shape(k)
+            self.versions.append(np.zeros((math.ceil(lh / self.TILE), math.ceil(lw / self.TILE)), np.int64))
+            k += 1
+
+    def level_shape(self, level):
+        s = 1 << level
+        return -(-self.renderer.h // s), -(-self.renderer.w // s)
+
+    def on_frame_changed(self, rects):
+        """렌더러 콜백: None이면 베이스 교체, 아니면 갱신된 영역의 타일만 무효화"""
+        if rects is None:
+            self.reset()
+            return
+        for level in range(1, self.levels):
+            grid = self.versions[level]
+            span = self.TILE << level
+            for x1, y1, x2, y2 in rects:
+                tx1, ty1 = x1 // span, y1 // span
+                tx2, ty2 = (x2 - 1) // span + 1, (y2 - 1) // span + 1
+                for ty in range(ty1, min(ty2, grid.shape[0])):
+                    for tx in range(tx1, min(tx2, grid.shape[1])):
+                        self.cache.discard((level, tx, ty, grid[ty, tx]))
+                        grid[ty, tx] += 1
+
+    def tile(self, level, tx, ty):
+        key = (level, tx, ty, self.versions[level][ty, tx])
+        tile = self.cache.get(key)
+        if tile is None:
+            lh, lw = self.level_shape(level)
+            th, tw = min(self.TILE, lh - ty * self.TILE), min(self.TILE, lw - tx * self.TILE)
+            span = self.TILE << level
+            src = self.renderer.frame[ty * span:(ty + 1) * span, tx * span:(tx + 1) * span]
+            tile = cv2.resize(src, (tw, th), interpolation=cv2.INTER_AREA)
+            self.cache.put(key, tile)
+        return tile
+
+    def region(self, level, x1, y1, x2, y2):
+        """레벨 좌표계의 영역을 타일들로 조립 (레벨 0은 프레임 뷰를 그대로 반환)"""
+        if level == 0:
+            return self.renderer.frame[y1:y2, x1:x2]
+        T = self.TILE
+        out = np.empty((y2 - y1, x2 - x1, 3), np.uint8)
+        for ty in range(y1 // T, (y2 - 1) // T + 1):
+            for tx in range(x1 // T, (x2 - 1) // T + 1):
+                tile = self.tile(level, tx, ty)
+                ox, oy = tx * T, ty * T
+                sx1, sy1 = max(x1, ox), max(y1, oy)
+                sx2, sy2 = min(x2, ox + tile.shape[1]), min(y2, oy + tile.shape[0])
+                out[sy1 - y1:sy2 - y1, sx1 - x1:sx2 - x1] = tile[sy1 - oy:sy2 - oy, sx1 - ox:sx2 - ox]
+        return out
+
+    def viewport(self, x1, y1, x2, y2, out_w, out_h):
+        """원본 좌표 크롭 영역을 출력 크기에 맞는 레벨에서 조립한 뒤 최종 크기로 변환"""
+        ratio = min((x2 - x1) / out_w, (y2 - y1) / out_h)
+        level = max(0, min(self.levels - 1, int(math.floor(math.log2(ratio))) if ratio >= 1 else 0))
+        s = 1 << level
+        lh, lw = self.level_shape(level)
+        lx1, ly1 = x1 // s, y1 // s
+        lx2, ly2 = min(lw, -(-x2 // s)), min(lh, -(-y2 // s))
+        stage = self.profiler.stage if self.profiler is not None else no_stage
+        with stage("crop"):
+            src = self.region(level, lx1, ly1, lx2, ly2)
+        if src.shape[1] == out_w and src.shape[0] == out_h:
+            return src
+        with stage("resize"):
+            return cv2.resize(src, (out_w, out_h))